@@ -1,16 +1,38 @@
-from fastapi import APIRouter, Form, Depends, HTTPException
-from fastapi.responses import FileResponse
+from typing import List
+
+from fastapi import APIRouter, File, Form, Depends, HTTPException, Query, UploadFile
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from core.config import settings
 from database.db import get_db
+from services.result_store import queue_compliance_result, save_compliance_results
+from services.scoring_engine import analyze_many, encode_sentences
+from services.similarity import normalize_rows
+from services.model_cascade import cascade_stats
+from services.ingestion import UnsupportedFormat, UploadTooLarge, extract_upload_text
+from services.sentence_corpus import current_corpus_indexer, get_corpus, index_policy, search_policies
+from services.worker_pool import run_analysis_async
+from services.report_jobs import DONE, FAILED, QueueFull, get_report_queue
+from services.chart_renderer import attach_chart, current_chart_renderer, get_chart_renderer
+from services.clause_catalog import UnknownPack, available_packs, parse_packs, resolve_packs
 from models.compliance_model import ComplianceResult
-from services.scoring_engine import analyze_compliance
-from services.report_generator import generate_pdf_report
-from services.crawler import fetch_privacy_policy
+from services.crawler import fetch_privacy_policy_async, fetch_privacy_policies
+from services.result_cache import result_cache
+from services.embedding_cache import get_embedding_store
+from services.encoders import encoder_key
+from services.inference_scheduler import current_scheduler
+from services.write_behind import current_write_queue
+from services.model_loader import is_ready, model_status
+from services.monitor import current_monitor
+from services import analytics
 
-import json
 import os
+import json
+import time
 import logging
+from concurrent.futures import TimeoutError as FutureTimeout
 
 
 # ==============================
@@ -28,7 +50,23 @@ logging.basicConfig(
 
 router = APIRouter()
 
-LAST_REPORT_PATH = None
+
+def selected_packs(
+    packs: str = Query(None, description="Comma-separated clause packs, e.g. dpdp-act,dpdp-rules@2025")
+):
+    """Clause pack specs for a request, or None for the default DPDP clauses."""
+
+    specs = parse_packs(packs)
+
+    if specs is None:
+        return None
+
+    try:
+        resolve_packs(specs)
+    except UnknownPack as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return specs
 
 
 # ==============================
@@ -38,18 +76,17 @@ LAST_REPORT_PATH = None
 @router.post(
     "/check-compliance/",
     summary="Analyze website privacy policy",
-    description="Fetches a website privacy policy, analyzes it using AI, checks compliance with DPDP clauses, and generates a PDF report."
+    description="Fetches a website privacy policy, analyzes it using AI, checks compliance with DPDP clauses, and queues a PDF report."
 )
-def check_compliance(
+async def check_compliance(
     website_url: str = Form(...),
-    db: Session = Depends(get_db)
+    chart: bool = Query(True),
+    packs: list = Depends(selected_packs)
 ):
 
-    global LAST_REPORT_PATH
-
     logging.info(f"Starting compliance analysis for: {website_url}")
 
-    policy_text = fetch_privacy_policy(website_url)
+    policy_text = await fetch_privacy_policy_async(website_url)
 
     if not policy_text:
         logging.error("Failed to fetch privacy policy content")
@@ -61,7 +98,8 @@ def check_compliance(
     logging.info("Privacy policy fetched successfully")
 
     # Run AI compliance analysis
-    result = analyze_compliance(policy_text)
+    # Re-scores only what changed since this site's last analysis
+    result = await run_analysis_async(policy_text, website_url=website_url, packs=packs)
 
     logging.info(f"Compliance score calculated: {result['overall_score']}")
 
@@ -69,33 +107,27 @@ def check_compliance(
     recommendations = result.get("recommendations", [])
     
     # Save analysis to database
-    db_record = ComplianceResult(
-        website_url=website_url,
-        compliance_percentage=result["overall_score"],
-        risk_level=result["risk_level"],
-        section_analysis=json.dumps(result["section_analysis"]),
-        missing_clauses=json.dumps(result["missing_clauses"])
-    )
+    # Only enqueued when write-behind is on; otherwise a blocking insert
+    stored = await run_in_threadpool(queue_compliance_result, website_url, result)
 
-    db.add(db_record)
-    db.commit()
-    db.refresh(db_record)
+    logging.info("Compliance result queued for storage")
 
-    logging.info("Compliance result saved to database")
+    # Sentences join the search corpus once the row id is known
+    index_policy(stored, website_url, policy_text)
 
-    # Generate PDF report
-    pdf_path = generate_pdf_report(result, website_url)
+    # Chart renders in the background; chart=false skips it
+    if chart:
+        result = attach_chart(result)
 
-    if not os.path.exists(pdf_path):
-        logging.error("PDF generation failed")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF generation failed."
-        )
-
-    LAST_REPORT_PATH = pdf_path
+    # Queue the PDF report; the result doesn't wait for rendering
+    try:
+        job = get_report_queue().submit(result, website_url)
+        report_id, report_status = job.id, job.status
+        logging.info(f"PDF compliance report {report_id} queued")
 
-    logging.info("PDF compliance report generated")
+    except QueueFull as e:
+        report_id, report_status = None, "unavailable"
+        logging.warning(f"PDF report not queued: {e}")
 
     return {
         "website_url": website_url,
@@ -106,29 +138,94 @@ def check_compliance(
         "recommendations": recommendations,
         "section_analysis": result.get("section_analysis", {}),
         "graph_path": result.get("graph_path", ""),
-        "report_download_endpoint": "/download-report"
+        "chart_id": result.get("chart_id"),
+        "version_changes": result.get("version_changes"),
+        "packs": result.get("packs"),
+        "report_id": report_id,
+        "report_status": report_status,
+        "report_status_endpoint": f"/report-jobs/{report_id}" if report_id else None,
+        "report_download_endpoint": f"/download-report?report_id={report_id}" if report_id else None
     }
 
 
 # ==============================
-# Download PDF Report
+# PDF Report Jobs
 # ==============================
 
+def _report_file(report_id: str):
+
+    path = get_report_queue().path_for(report_id)
+
+    if path is None:
+        raise HTTPException(status_code=404, detail="Report not found.")
+
+    return path
+
+
+@router.get(
+    "/report-jobs/{report_id}",
+    summary="PDF report status",
+    description="Returns whether a queued PDF report is queued, running, done or failed."
+)
+def report_job_status(report_id: str):
+
+    path = _report_file(report_id)
+    job = get_report_queue().get(report_id)
+
+    if job:
+        return job.to_dict()
+
+    # Finished reports outlive the in-memory job list (and restarts)
+    if os.path.exists(path):
+        return {
+            "report_id": report_id,
+            "status": DONE,
+            "download_endpoint": f"/download-report?report_id={report_id}"
+        }
+
+    raise HTTPException(status_code=404, detail="Report not found.")
+
+
 @router.get(
     "/download-report",
     summary="Download compliance report",
-    description="Downloads the last generated DPDP compliance PDF report."
+    description="Downloads a DPDP compliance PDF report by id. Without an id, waits briefly for the most recently queued report."
 )
-def download_report():
+def download_report(report_id: str = Query(None)):
+
+    queue = get_report_queue()
+
+    if report_id:
+        path = _report_file(report_id)
+        job = queue.get(report_id)
+
+    else:
+        # Older clients download without an id right after analyzing
+        job = queue.latest()
+
+        if job is None:
+            logging.error("Report not found")
+            raise HTTPException(status_code=404, detail="Report not found.")
+
+        try:
+            job.future.result(timeout=settings.REPORT_WAIT_SECONDS)
+        except (FutureTimeout, TimeoutError):
+            pass
+
+        path = job.path
 
-    global LAST_REPORT_PATH
+    if job and job.status == FAILED:
+        raise HTTPException(status_code=500, detail="PDF generation failed.")
 
-    if LAST_REPORT_PATH and os.path.exists(LAST_REPORT_PATH):
+    if job and job.status != DONE:
+        return JSONResponse(status_code=202, content=job.to_dict())
+
+    if os.path.exists(path):
 
         logging.info("PDF report downloaded")
 
         return FileResponse(
-            LAST_REPORT_PATH,
+            path,
             media_type="application/pdf",
             filename="dpdp_compliance_report.pdf"
         )
@@ -138,4 +235,328 @@ def download_report():
     raise HTTPException(
         status_code=404,
         detail="Report not found."
-    )
\ No newline at end of file
+    )
+
+
+# ==============================
+# Clause Charts
+# ==============================
+
+def _chart_response(path):
+
+    if not path:
+        raise HTTPException(status_code=404, detail="Chart not found.")
+
+    return FileResponse(path, media_type="image/png")
+
+
+@router.get(
+    "/charts/{chart_key}.png",
+    summary="Clause chart",
+    description="Serves a clause chart by the chart_id returned with an analysis, waiting briefly if it is still rendering."
+)
+def get_chart(chart_key: str):
+
+    try:
+        path = get_chart_renderer().wait(chart_key, timeout=settings.CHART_WAIT_SECONDS)
+    except (FutureTimeout, TimeoutError):
+        raise HTTPException(status_code=503, detail="Chart is still rendering.")
+    except Exception:
+        logging.exception("Chart %s failed to render", chart_key)
+        raise HTTPException(status_code=500, detail="Chart rendering failed.")
+
+    return _chart_response(path)
+
+
+@router.get(
+    "/results/{result_id}/chart",
+    summary="Clause chart for a stored result",
+    description="Renders (once) and serves the clause chart of a stored compliance result."
+)
+def get_result_chart(result_id: int, db: Session = Depends(get_db)):
+
+    record = db.get(ComplianceResult, result_id)
+
+    if record is None:
+        raise HTTPException(status_code=404, detail="Result not found.")
+
+    section_analysis = json.loads(record.section_analysis or "{}")
+
+    if not section_analysis:
+        raise HTTPException(status_code=404, detail="Chart not found.")
+
+    return _chart_response(get_chart_renderer().ensure(section_analysis))
+
+
+# ==============================
+# Batch Analysis
+# ==============================
+
+@router.post(
+    "/batch/analyze",
+    summary="Analyze many policies in one call",
+    description="Accepts uploaded policy files and/or website URLs, fetches URLs concurrently, encodes all policies together and stores every result in one transaction."
+)
+async def batch_analyze(
+    files: List[UploadFile] = File([]),
+    urls: List[str] = Form([]),
+    chart: bool = Query(False),
+    packs: list = Depends(selected_packs),
+    db: Session = Depends(get_db)
+):
+
+    urls = [url.strip() for url in urls if url.strip()]
+
+    if not files and not urls:
+        raise HTTPException(status_code=400, detail="Provide at least one file or URL.")
+
+    if len(files) + len(urls) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {settings.BATCH_MAX_ITEMS} items."
+        )
+
+    logging.info(f"Starting batch analysis: {len(files)} files, {len(urls)} URLs")
+
+    items = []
+
+    for upload in files:
+        try:
+            items.append({"source": upload.filename, "text": await extract_upload_text(upload)})
+        except (UploadTooLarge, UnsupportedFormat) as e:
+            items.append({"source": upload.filename, "error": str(e)})
+        except Exception:
+            logging.exception(f"Reading {upload.filename} failed")
+            items.append({"source": upload.filename, "error": "Unable to read the uploaded file."})
+
+    # Fetch URLs concurrently over the shared keep-alive pool
+    fetched = await fetch_privacy_policies(urls, settings.BATCH_FETCH_CONCURRENCY)
+
+    for url, text in zip(urls, fetched):
+        if text:
+            items.append({"source": url, "text": text})
+        else:
+            items.append({"source": url, "error": "Unable to fetch privacy content."})
+
+    ready = [item for item in items if "error" not in item]
+
+    try:
+        results = await run_in_threadpool(analyze_many, [item["text"] for item in ready], None, packs)
+    except Exception as e:
+        logging.exception("Batch analysis failed")
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {e}")
+
+    for item, result in zip(ready, results):
+        item["result"] = attach_chart(result) if chart else result
+
+    ids = await run_in_threadpool(
+        save_compliance_results,
+        db,
+        [(item["source"], item["result"]) for item in ready]
+    )
+
+    for item, result_id in zip(ready, ids):
+        item["result_id"] = result_id
+        index_policy(result_id, item["source"], item["text"])
+
+    logging.info(f"Batch analysis finished: {len(ready)} analyzed, {len(items) - len(ready)} failed")
+
+    return {
+        "total": len(items),
+        "succeeded": len(ready),
+        "failed": len(items) - len(ready),
+        "items": [
+            {
+                "source": item["source"],
+                "status": "error" if "error" in item else "ok",
+                "error": item.get("error"),
+                "result_id": item.get("result_id"),
+                "result": item.get("result")
+            }
+            for item in items
+        ]
+    }
+
+
+# ==============================
+# Clause Packs
+# ==============================
+
+@router.get(
+    "/clause-packs",
+    summary="Installed clause packs",
+    description="Lists the clause packs (regulations, rules, internal controls) and versions that can be selected with ?packs=."
+)
+def list_clause_packs():
+
+    return {
+        "packs": [pack.info() for pack in available_packs().values()]
+    }
+
+
+# ==============================
+# Corpus Search
+# ==============================
+
+@router.get(
+    "/search",
+    summary="Search every analyzed policy",
+    description="Semantic search over the sentences of all stored analyses, e.g. 'we retain your data indefinitely'. Returns the best-matching sentence per website."
+)
+def search_corpus(
+    q: str = Query(..., min_length=3, max_length=500),
+    limit: int = Query(20, ge=1),
+    nprobe: int = Query(None, ge=1, le=1024),
+    db: Session = Depends(get_db)
+):
+
+    corpus = get_corpus()
+
+    if corpus is None:
+        raise HTTPException(status_code=404, detail="Corpus search is disabled.")
+
+    started = time.perf_counter()
+
+    query = normalize_rows(encode_sentences([q]))[0]
+    matches, searched = search_policies(db, corpus, query, min(limit, settings.SEARCH_MAX_RESULTS), nprobe)
+
+    return {
+        "query": q,
+        "results": matches,
+        "searched_sentences": searched,
+        "corpus_sentences": corpus.rows,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+# ==============================
+# Cache Statistics
+# ==============================
+
+@router.get(
+    "/cache-stats",
+    summary="Analysis cache statistics",
+    description="Returns hit/miss counters and size of the analysis caches, plus inference batching statistics."
+)
+def cache_stats():
+
+    store = get_embedding_store(encoder_key())
+    scheduler = current_scheduler()
+    write_queue = current_write_queue()
+    chart_renderer = current_chart_renderer()
+    corpus_indexer = current_corpus_indexer()
+
+    return {
+        "result_cache": result_cache.stats(),
+        "embedding_cache": store.stats() if store else None,
+        "inference_scheduler": scheduler.stats() if scheduler else None,
+        "db_write_behind": write_queue.stats() if write_queue else None,
+        "charts": chart_renderer.stats() if chart_renderer else None,
+        "corpus": corpus_indexer.corpus.stats() if corpus_indexer else None,
+        "model_cascade": cascade_stats.stats() if settings.MODEL_CASCADE else None
+    }
+
+
+# ==============================
+# Monitored URLs
+# ==============================
+
+@router.get(
+    "/monitor/status",
+    summary="Monitored URL status",
+    description="Lists the monitored policy URLs with their last check, last change and next scheduled re-scan."
+)
+def monitor_status():
+
+    monitor = current_monitor()
+
+    if monitor is None:
+        return {"enabled": False, "urls": []}
+
+    return {"enabled": True, **monitor.status()}
+
+
+# ==============================
+# Compliance Analytics
+# ==============================
+
+@router.get(
+    "/analytics/clauses",
+    summary="Per-clause failure rates",
+    description="Failure rate and average score of every clause across all stored analyses, optionally filtered by section or category."
+)
+def clause_analytics(section: str = None, category: str = None, db: Session = Depends(get_db)):
+
+    return analytics.clause_failure_rates(db, section, category)
+
+
+@router.get(
+    "/analytics/clauses/{clause_title}/failing-sites",
+    summary="Websites failing a clause",
+    description="Websites with analyses that failed the given clause, most recent failure first."
+)
+def clause_failing_sites(clause_title: str, limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)):
+
+    return analytics.failing_sites(db, clause_title, limit)
+
+
+@router.get(
+    "/analytics/url-trend",
+    summary="Score trend for one website",
+    description="Daily average compliance score for a website URL."
+)
+def url_trend(url: str, db: Session = Depends(get_db)):
+
+    return analytics.url_score_trend(db, url)
+
+
+@router.get(
+    "/analytics/category-trend",
+    summary="Score trend per category",
+    description="Daily failure rate and average clause score per clause category."
+)
+def category_trend(category: str = None, db: Session = Depends(get_db)):
+
+    return analytics.category_trend(db, category)
+
+
+@router.get(
+    "/analytics/risk-distribution",
+    summary="Risk level distribution",
+    description="Number and share of stored analyses per risk level."
+)
+def risk_distribution(db: Session = Depends(get_db)):
+
+    return analytics.risk_distribution(db)
+
+
+# ==============================
+# Liveness / Readiness Probes
+# ==============================
+
+@router.get(
+    "/health/live",
+    summary="Liveness probe",
+    description="Answers as soon as the API process is up, without touching the model."
+)
+def liveness():
+
+    return {"status": "alive"}
+
+
+@router.get(
+    "/health/ready",
+    summary="Readiness probe",
+    description="Returns 200 once the model and clause index are loaded, 503 until then."
+)
+def readiness():
+
+    status = model_status()
+
+    if not is_ready():
+        return JSONResponse(
+            status_code=503,
+            content={"status": "not_ready", "model": status}
+        )
+
+    return {"status": "ready", "model": status}
@@ -0,0 +1,118 @@
+"""Model cascade: latency, escalations and agreement with the strong model.
+
+Run from dpdp-backend/:
+
+    python benchmarks/bench_cascade.py --bands 5,10,15 --runs 3
+
+For each fixture in benchmarks/fixtures the policy is scored three ways:
+with the fast model alone (MODEL_NAME / ENCODER_BACKEND), with the strong
+model alone (CASCADE_MODEL_NAME / CASCADE_BACKEND) and with the cascade at
+each ``--bands`` width. The report shows latency, how many clauses each
+tier decided and how many Matched/Missing decisions differ from the
+strong model's. Both models must be available locally.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+os.environ.setdefault("EMBEDDING_CACHE_MAX_BYTES", "0")
+os.environ.setdefault("INFERENCE_SCHEDULER", "false")
+
+from core.config import settings  # noqa: E402
+from services import scoring_engine  # noqa: E402
+from services.clause_index import ClauseIndex  # noqa: E402
+from services.html_extractor import extract_text  # noqa: E402
+from services.model_cascade import encode_strong, strong_clause_embeddings  # noqa: E402
+from services.similarity import normalize_rows  # noqa: E402
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def best_time(fn, runs):
+
+    timings = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        value = fn()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), value
+
+
+def statuses(result):
+    return {title: details["status"] for title, details in result["section_analysis"].items()}
+
+
+def disagreements(result, reference):
+    return sum(1 for title, status in statuses(result).items() if reference[title] != status)
+
+
+def strong_only(text):
+    """The strong model on every sentence, as if it were the only tier."""
+
+    clause_index = scoring_engine.load_clause_index()
+    strong_index = ClauseIndex(
+        "strong", clause_index.clauses_hash, clause_index.clauses, strong_clause_embeddings(clause_index)
+    )
+    sentences = scoring_engine.split_sentences(text)
+
+    return scoring_engine.score_sentences(
+        strong_index, sentences, normalize_rows(encode_strong(sentences)), settings.EVIDENCE_TOP_K
+    )
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bands", default="5,10,15")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    bands = [float(band) for band in args.bands.split(",")]
+
+    print(f"fast model:   {settings.MODEL_NAME} ({settings.ENCODER_BACKEND})")
+    print(f"strong model: {settings.CASCADE_MODEL_NAME} ({settings.CASCADE_BACKEND})")
+    print()
+    print(f"{'fixture':30} {'mode':>12} {'ms':>8} {'fast':>5} {'strong':>6} {'differs':>8}")
+
+    for name in sorted(os.listdir(FIXTURES)):
+
+        if not name.endswith(".html"):
+            continue
+
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            text = extract_text(f.read())
+
+        # Load both models and clause embeddings before timing anything
+        strong_only(text)
+        scoring_engine.analyze_compliance(text, cascade=True)
+
+        strong_time, strong = best_time(lambda: strong_only(text), args.runs)
+        reference = statuses(strong)
+
+        fast_time, fast = best_time(lambda: scoring_engine.analyze_compliance(text, cascade=False), args.runs)
+        clauses = len(reference)
+
+        print(f"{name:30} {'fast':>12} {fast_time * 1000:8.1f} {clauses:5} {0:6} {disagreements(fast, reference):8}")
+        print(f"{'':30} {'strong':>12} {strong_time * 1000:8.1f} {0:5} {clauses:6} {0:8}")
+
+        for band in bands:
+            settings.CASCADE_BAND = band
+
+            cascade_time, result = best_time(lambda: scoring_engine.analyze_compliance(text, cascade=True), args.runs)
+            tiers = result["cascade"]
+
+            print(
+                f"{'':30} {f'band {band:g}':>12} {cascade_time * 1000:8.1f} "
+                f"{tiers['decided_fast']:5} {tiers['decided_strong']:6} {disagreements(result, reference):8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
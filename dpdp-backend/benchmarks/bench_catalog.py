@@ -0,0 +1,111 @@
+"""Scoring latency as the clause catalog grows.
+
+Run from dpdp-backend/:
+
+    python benchmarks/bench_catalog.py --sizes 5,50,500,5000
+
+Builds synthetic packs of the given sizes (one parent per four
+sub-requirements) and times one analysis against each: sentence encoding,
+the single clause x sentence matrix product, roll-ups and assembling the
+response. Clause embeddings are precomputed per pack, so only the policy
+is encoded per request. ``--no-model`` replaces the encoder with fixed
+random unit vectors to time everything except encoding.
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+os.environ.setdefault("EMBEDDING_CACHE_MAX_BYTES", "0")
+
+from services import scoring_engine  # noqa: E402
+from services.clause_catalog import ClauseCatalog, ClausePack, flatten  # noqa: E402
+from services.similarity import normalize_rows  # noqa: E402
+
+
+SAMPLE = (
+    "We collect your name, email address and phone number when you register. "
+    "We provide notice before collecting any personal data from you. "
+    "By using the service you consent to processing for the purposes described. "
+    "You may access, correct or erase your personal data at any time. "
+    "We implement reasonable security safeguards such as encryption. "
+    "Complaints can be sent to our grievance officer at grievance@example.com. "
+)
+
+
+def synthetic_pack(size, children=4):
+
+    clauses = []
+
+    for i in range(max(1, size // (children + 1))):
+        clauses.append({
+            "clause_id": f"C{i}",
+            "title": f"Clause {i}",
+            "section": f"Section {i % 20}",
+            "category": f"Category {i % 6}",
+            "description": f"Requirement {i} about personal data",
+            "requirements": [
+                {"clause_id": f"C{i}.{j}", "title": f"Clause {i}.{j}", "description": f"Sub-requirement {i}.{j}"}
+                for j in range(children)
+            ]
+        })
+
+    return ClausePack(f"synthetic-{size}", "1", f"Synthetic {size}", flatten(f"synthetic-{size}", clauses), str(size))
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="5,50,500,5000")
+    parser.add_argument("--sentences", type=int, default=140)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-model", action="store_true")
+    args = parser.parse_args()
+
+    policy = " ".join(f"Clause {j}. {SAMPLE}" for j in range(args.sentences // 7))
+
+    if args.no_model:
+        dim = 384
+        rng = np.random.default_rng(0)
+        table = {}
+
+        def encode(sentences):
+            return np.stack([
+                table.setdefault(s, rng.normal(size=dim).astype(np.float32)) for s in sentences
+            ])
+
+        scoring_engine.encode_sentences = encode
+        scoring_engine.encoder_key = lambda: "random-vectors"
+        embed = lambda pack: normalize_rows(encode([n["description"] for n in pack.nodes]))  # noqa: E731
+    else:
+        model = scoring_engine.get_model()
+        embed = lambda pack: normalize_rows(model.encode([n["description"] for n in pack.nodes]))  # noqa: E731
+
+    print(f"{'clauses':>8} {'ms / analysis':>14} {'us / clause':>12}")
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+
+        pack = synthetic_pack(size)
+        catalog = ClauseCatalog([pack], [embed(pack)])
+        scoring_engine.load_catalog = lambda packs, catalog=catalog: catalog
+
+        scoring_engine.analyze_compliance(policy, packs=["synthetic"])
+
+        timings = []
+
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            scoring_engine.analyze_compliance(policy, packs=["synthetic"])
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        print(f"{len(pack.nodes):8} {best * 1000:14.1f} {best * 1e6 / len(pack.nodes):12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Analysis latency with and without the clause chart.
+
+Run from dpdp-backend/:
+
+    python benchmarks/bench_chart.py --runs 20
+
+Compares scoring alone, scoring plus a background chart (what the API does
+now) and scoring plus the inline pyplot chart the engine used to draw on
+every call. Caches are disabled so every run pays for a full encode;
+``--chart-only`` skips the model and times just the chart drawing.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+os.environ.setdefault("EMBEDDING_CACHE_MAX_BYTES", "0")
+
+from services.chart_renderer import ChartRenderer, attach_chart, chart_data, draw_chart  # noqa: E402
+
+
+SAMPLE = (
+    "We collect your name, email address and phone number when you register. "
+    "We provide notice before collecting any personal data from you. "
+    "By using the service you consent to processing for the purposes described. "
+    "You may access, correct or erase your personal data at any time. "
+    "We implement reasonable security safeguards such as encryption. "
+    "Complaints can be sent to our grievance officer at grievance@example.com. "
+)
+
+SECTION_ANALYSIS = {
+    f"Clause {i}": {"similarity_score": 40.0 + i * 7.5, "status": "Matched"}
+    for i in range(5)
+}
+
+
+def inline_pyplot_chart(section_analysis, path):
+    """The chart previously drawn inside build_result on every analysis."""
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    names, scores = chart_data(section_analysis)
+
+    plt.figure(figsize=(10, 5))
+    plt.bar(names, scores)
+    plt.xlabel("DPDP Clauses")
+    plt.ylabel("Similarity Score (%)")
+    plt.title("DPDP Compliance Clause Analysis")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def measure(label, run, runs):
+
+    run(0)
+
+    timings = []
+
+    for i in range(1, runs + 1):
+        start = time.perf_counter()
+        run(i)
+        timings.append(time.perf_counter() - start)
+
+    print(
+        f"{label:<36} p50 {statistics.median(timings) * 1000:8.1f} ms   "
+        f"max {max(timings) * 1000:8.1f} ms"
+    )
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--sentences", type=int, default=140)
+    parser.add_argument("--chart-only", action="store_true")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench-chart-")
+    path = os.path.join(directory, "inline.png")
+
+    def scored(i):
+        # Vary the scores so every background chart is a cache miss
+        return {name: {**details, "similarity_score": details["similarity_score"] + i / 1000}
+                for name, details in SECTION_ANALYSIS.items()}
+
+    try:
+        measure("pyplot chart (previous, inline)", lambda i: inline_pyplot_chart(scored(i), path), args.runs)
+        measure(
+            "Figure chart (renderer thread)",
+            lambda i: draw_chart(*chart_data(scored(i)), os.path.join(directory, f"{i}.png")),
+            args.runs
+        )
+
+        if args.chart_only:
+            return
+
+        from services.scoring_engine import analyze_compliance
+
+        policy = " ".join(f"Clause {j}. {SAMPLE}" for j in range(args.sentences // 7))
+        renderer = ChartRenderer(directory)
+
+        measure("analysis, no chart", lambda i: analyze_compliance(policy), args.runs)
+        measure(
+            "analysis + background chart",
+            lambda i: attach_chart(dict(analyze_compliance(policy), section_analysis=scored(i)), renderer),
+            args.runs
+        )
+        measure(
+            "analysis + inline chart (previous)",
+            lambda i: inline_pyplot_chart(analyze_compliance(policy)["section_analysis"], path),
+            args.runs
+        )
+
+        renderer.shutdown()
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
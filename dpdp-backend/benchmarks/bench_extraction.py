@@ -0,0 +1,97 @@
+"""Compare the single-pass lxml extractor with the previous BeautifulSoup one.
+
+Run from dpdp-backend/:
+
+    python benchmarks/bench_extraction.py --runs 5
+
+Each saved fixture in benchmarks/fixtures is extracted by both functions;
+the report shows the best extraction time and the size of the text that
+would be sent to the embedder. ``--repeat`` also builds a large document
+by repeating the page-builder fixture's content.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from services.html_extractor import extract_text
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def legacy_extract(html):
+    """The extraction previously used by services.crawler."""
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    for tag in soup(["script", "style", "nav", "footer", "header"]):
+        tag.decompose()
+
+    text_chunks = []
+
+    for tag in soup.find_all(["p", "div"]):
+        content = tag.get_text(strip=True)
+        if len(content) > 50:
+            text_chunks.append(content)
+
+    return " ".join(text_chunks)
+
+
+def best_time(fn, html, runs):
+
+    timings = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        text = fn(html)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), text
+
+
+def load_documents(repeat):
+
+    documents = {}
+
+    for name in sorted(os.listdir(FIXTURES)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+                documents[name] = f.read()
+
+    base = documents.get("policy_page_builder.html")
+
+    if base and repeat > 1:
+        head, _, rest = base.partition("<body>")
+        content, _, tail = rest.partition("</body>")
+        documents[f"policy_page_builder.html x{repeat}"] = (
+            head + "<body>" + content * repeat + "</body>" + tail
+        )
+
+    return documents
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'fixture':36} {'html KB':>8} {'extractor':>10} {'ms':>9} {'text KB':>9}")
+
+    for name, html in load_documents(args.repeat).items():
+        for label, fn in (("legacy", legacy_extract), ("lxml", extract_text)):
+            seconds, text = best_time(fn, html, args.runs)
+            print(
+                f"{name:36} {len(html) / 1024:8.1f} {label:>10} "
+                f"{seconds * 1000:9.1f} {len(text) / 1024:9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Peak memory of concurrent large uploads.
+
+Run from dpdp-backend/:
+
+    python benchmarks/bench_ingest.py --uploads 10 --size-mb 50
+    python benchmarks/bench_ingest.py --uploads 10 --size-mb 50 --read-all
+
+Scores ``--uploads`` plain-text policies of ``--size-mb`` each at the same
+time through ``ingestion.analyze_upload`` and reports wall time and the
+process's peak RSS. ``--read-all`` does what /analyze-policy used to do
+(read the whole upload, decode it, score the string) for comparison. Run
+each mode in its own process: peak RSS never goes down. The encoder is
+replaced with fixed random vectors so the numbers show ingestion and
+scoring memory only.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+os.environ.setdefault("EMBEDDING_CACHE_MAX_BYTES", "0")
+os.environ.setdefault("POLICY_VERSION_DIR", "")
+
+from services import ingestion, scoring_engine  # noqa: E402
+from services.clause_index import CLAUSES_PATH, ClauseIndex, _clauses_hash  # noqa: E402
+from services.similarity import normalize_rows  # noqa: E402
+
+
+SENTENCE = (
+    "We may retain the personal data you provide to us, including your name, email address, "
+    "phone number and payment details, for as long as your account remains active or as needed. "
+)
+
+
+class GeneratedUpload:
+    """An upload whose bytes are produced on demand, never all at once."""
+
+    def __init__(self, size):
+        self.filename = "policy.txt"
+        self.content_type = "text/plain"
+        self._remaining = size
+        self._position = 0
+        self._block = SENTENCE.encode("utf-8") * 4096
+
+    async def read(self, size=-1):
+
+        size = self._remaining if size < 0 else min(size, self._remaining)
+        start = self._position % len(self._block)
+
+        self._remaining -= size
+        self._position += size
+
+        return (self._block[start:] + self._block * (size // len(self._block) + 1))[:size]
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def read_all(upload):
+
+    content = await upload.read()
+    text = content.decode("utf-8", errors="ignore")
+
+    return await asyncio.get_running_loop().run_in_executor(None, scoring_engine.analyze_compliance, text)
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=10)
+    parser.add_argument("--size-mb", type=float, default=50)
+    parser.add_argument("--read-all", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    table = rng.normal(size=(64, 384)).astype(np.float32)
+
+    with open(CLAUSES_PATH, encoding="utf-8") as f:
+        clauses = json.load(f)
+
+    clause_index = ClauseIndex(
+        "random-vectors", _clauses_hash(CLAUSES_PATH), clauses,
+        normalize_rows(rng.normal(size=(len(clauses), 384)).astype(np.float32))
+    )
+
+    scoring_engine.load_clause_index = lambda: clause_index
+    scoring_engine.encode_sentences = lambda sentences: table[[len(s) % 64 for s in sentences]]
+    scoring_engine.encoder_key = lambda: "random-vectors"
+
+    size = int(args.size_mb * 1024 * 1024)
+    baseline = peak_rss_mb()
+
+    async def run():
+        uploads = [GeneratedUpload(size) for _ in range(args.uploads)]
+        analyze = read_all if args.read_all else ingestion.analyze_upload
+        return await asyncio.gather(*(analyze(upload) for upload in uploads))
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    print(f"mode:          {'read whole upload' if args.read_all else 'streaming ingestion'}")
+    print(f"uploads:       {args.uploads} x {args.size_mb:g} MB")
+    print(f"wall time:     {elapsed:.1f} s")
+    print(f"peak RSS:      {peak_rss_mb():.0f} MB (before uploads: {baseline:.0f} MB)")
+    print(f"scores:        {sorted({r['overall_score'] for r in results})}")
+
+
+if __name__ == "__main__":
+    main()
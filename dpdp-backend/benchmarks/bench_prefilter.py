@@ -0,0 +1,116 @@
+"""Keyword prefilter: matcher speed, sentences pruned and score drift.
+
+Run from dpdp-backend/:
+
+    python benchmarks/bench_prefilter.py --runs 5
+
+For each fixture in benchmarks/fixtures the policy text is extracted and
+segmented, then every sentence is run through the Aho-Corasick matcher.
+The report shows the matching time next to the previous per-keyword
+substring scan and how many sentences the cascade would skip. Unless
+``--no-model`` is given, each policy is also scored with and without the
+cascade to show encode time and how far clause scores moved.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+os.environ.setdefault("EMBEDDING_CACHE_MAX_BYTES", "0")
+
+from services.clause_index import CLAUSES_PATH  # noqa: E402
+from services.html_extractor import extract_text  # noqa: E402
+from services.nlp_analyzer import candidate_sentences, load_keyword_matcher  # noqa: E402
+from services.scoring_engine import split_sentences  # noqa: E402
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def substring_candidates(sentences, keywords):
+    """Repeated substring checks, as the previous analyze_text did."""
+
+    keep = []
+
+    for i, sentence in enumerate(sentences):
+        text = sentence.lower()
+        if any(word in text for words in keywords.values() for word in words):
+            keep.append(i)
+
+    return keep
+
+
+def best_time(fn, runs):
+
+    timings = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        value = fn()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), value
+
+
+def load_policies():
+
+    policies = {}
+
+    for name in sorted(os.listdir(FIXTURES)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+                policies[name] = extract_text(f.read())
+
+    return policies
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-model", action="store_true")
+    args = parser.parse_args()
+
+    matcher = load_keyword_matcher()
+
+    with open(CLAUSES_PATH, encoding="utf-8") as f:
+        keywords = {clause["title"]: clause.get("keywords", []) for clause in json.load(f)}
+
+    print(f"{'fixture':30} {'sentences':>9} {'kept':>6} {'aho ms':>8} {'substr ms':>10}")
+
+    policies = load_policies()
+
+    for name, text in policies.items():
+        sentences = split_sentences(text)
+
+        aho, keep = best_time(lambda: candidate_sentences(sentences, matcher), args.runs)
+        substr, _ = best_time(lambda: substring_candidates(sentences, keywords), args.runs)
+
+        print(f"{name:30} {len(sentences):9} {len(keep):6} {aho * 1000:8.2f} {substr * 1000:10.2f}")
+
+    if args.no_model:
+        return
+
+    from services.scoring_engine import analyze_compliance, prefilter_drift
+
+    print()
+    print(f"{'fixture':30} {'full ms':>8} {'cascade ms':>10} {'max drift':>10} {'status changed'}")
+
+    for name, text in policies.items():
+        full_time, full = best_time(lambda: analyze_compliance(text, prefilter=False), args.runs)
+        cascade_time, pruned = best_time(lambda: analyze_compliance(text, prefilter=True), args.runs)
+
+        drift = prefilter_drift(full, pruned)
+
+        print(
+            f"{name:30} {full_time * 1000:8.1f} {cascade_time * 1000:10.1f} "
+            f"{drift['max_clause']:10.2f} {', '.join(drift['status_changed']) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
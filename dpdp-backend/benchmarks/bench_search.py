@@ -0,0 +1,106 @@
+"""Corpus search: append rate, IVF build time, query latency and recall.
+
+Run from dpdp-backend/:
+
+    python benchmarks/bench_search.py --rows 1000000 --queries 50
+
+Fills a temporary corpus with synthetic clustered unit vectors (``--rows``
+sentences in batches of ``--per-policy``, one batch per policy), builds
+the IVF index and times queries at several ``nprobe`` values. Recall@10 is
+measured against an exact scan of the same rows, so it reflects only the
+index, not the encoder.
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.sentence_corpus import SentenceCorpus, score_rows  # noqa: E402
+from services.similarity import normalize_rows  # noqa: E402
+
+
+def clustered(rng, centers, n, noise=0.8):
+    picks = rng.integers(len(centers), size=n)
+    return normalize_rows((centers[picks] + noise * rng.normal(size=(n, centers.shape[1]))).astype(np.float32))
+
+
+def exact_top(corpus, query, k, chunk_size=262144):
+
+    scores = np.concatenate([
+        score_rows(corpus._vectors[start:min(start + chunk_size, corpus.rows)], query, corpus.dtype)
+        for start in range(0, corpus.rows, chunk_size)
+    ])
+
+    return set(np.argpartition(-scores, k - 1)[:k].tolist())
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--per-policy", type=int, default=150)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--dtype", default="int8", choices=["int8", "float16"])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--nprobe", default="4,16,64")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(2000, args.dim))
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        corpus = SentenceCorpus(directory, "synthetic", args.dtype)
+
+        start = time.perf_counter()
+        for policy, first in enumerate(range(0, args.rows, args.per_policy)):
+            n = min(args.per_policy, args.rows - first)
+            corpus.append(policy, [f"sentence {first + i}" for i in range(n)], clustered(rng, centers, n))
+        append_time = time.perf_counter() - start
+
+        print(f"rows:          {corpus.rows} ({corpus.results} policies, {args.dtype})")
+        print(f"corpus size:   {corpus.stats()['bytes'] / 2 ** 20:.1f} MiB")
+        print(f"append:        {append_time:.1f} s ({corpus.rows / append_time:,.0f} rows/s)")
+
+        queries = clustered(rng, centers, args.queries)
+
+        timings = []
+        for query in queries[:5]:
+            start = time.perf_counter()
+            corpus.search(query, k=10)
+            timings.append(time.perf_counter() - start)
+        print(f"full scan:     {np.median(timings) * 1000:.1f} ms / query")
+
+        start = time.perf_counter()
+        index = corpus.rebuild_index()
+        print(f"ivf build:     {time.perf_counter() - start:.1f} s ({len(index.centroids)} lists)")
+
+        exact = [exact_top(corpus, query, 10) for query in queries]
+
+        print()
+        print(f"{'nprobe':>6} {'ms / query':>11} {'p95 ms':>8} {'rows scored':>12} {'recall@10':>10}")
+
+        for nprobe in [int(n) for n in args.nprobe.split(",")]:
+
+            timings, scored, hits = [], [], 0
+
+            for query, truth in zip(queries, exact):
+                start = time.perf_counter()
+                rows, _, searched = corpus.search(query, k=10, nprobe=nprobe)
+                timings.append(time.perf_counter() - start)
+                scored.append(searched)
+                hits += len(truth & set(rows.tolist()))
+
+            print(
+                f"{nprobe:6} {np.median(timings) * 1000:11.1f} {np.percentile(timings, 95) * 1000:8.1f} "
+                f"{int(np.mean(scored)):12,} {hits / (10 * len(queries)):10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
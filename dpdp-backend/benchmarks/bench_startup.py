@@ -0,0 +1,61 @@
+"""Time from process start until the API can answer a request.
+
+Run from dpdp-backend/ (or point --app-dir at another checkout):
+
+    python benchmarks/bench_startup.py --runs 5
+
+Each run starts a fresh interpreter, imports ``main`` and issues one
+request through FastAPI's TestClient.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+
+PROBE = r"""
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+client.get("{path}")
+answered = time.perf_counter()
+print(json.dumps({{"import": imported - start, "first_response": answered - start}}))
+"""
+
+
+def run_once(app_dir, path):
+
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE.format(path=path)],
+        cwd=app_dir,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app-dir", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument("--path", default="/health/live")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [run_once(args.app_dir, args.path) for _ in range(args.runs)]
+
+    for key in ("import", "first_response"):
+        values = [run[key] for run in runs]
+        print(f"{key:<16} median {statistics.median(values):6.2f}s  "
+              f"min {min(values):6.2f}s  max {max(values):6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Throughput of the single-process path vs the forked analysis pool.
+
+Run from dpdp-backend/:
+
+    python benchmarks/bench_worker_pool.py --requests 64 --workers 4
+
+Caches are disabled so every request pays for a full encode.
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+os.environ.setdefault("EMBEDDING_CACHE_MAX_BYTES", "0")
+
+from core.config import settings  # noqa: E402
+
+
+SAMPLE = (
+    "We collect your name, email address and phone number when you register. "
+    "We provide notice before collecting any personal data from you. "
+    "By using the service you consent to processing for the purposes described. "
+    "You may access, correct or erase your personal data at any time. "
+    "We implement reasonable security safeguards such as encryption. "
+    "Complaints can be sent to our grievance officer at grievance@example.com. "
+)
+
+
+def make_policies(count, sentences):
+    return [
+        " ".join(f"Request {i} clause {j}. {SAMPLE}" for j in range(sentences // 7))
+        for i in range(count)
+    ]
+
+
+def measure(label, run, policies, concurrency):
+
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        start = time.perf_counter()
+        list(threads.map(run, policies))
+        elapsed = time.perf_counter() - start
+
+    print(f"{label:<34} {len(policies) / elapsed:8.2f} req/s  ({elapsed:.2f}s)")
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--sentences", type=int, default=140)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    policies = make_policies(args.requests, args.sentences)
+
+    from services import worker_pool
+
+    print(f"cpus={os.cpu_count()} requests={args.requests} "
+          f"sentences/request~{args.sentences} concurrency={args.concurrency}")
+
+    worker_pool.run_analysis(policies[0])
+    measure("single process (threadpool)", worker_pool.run_analysis, policies, args.concurrency)
+
+    settings.ANALYSIS_WORKERS = args.workers
+    worker_pool.start_worker_pool()
+    measure(f"process pool ({args.workers} workers)", worker_pool.run_analysis, policies, args.concurrency)
+    worker_pool.stop_worker_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Per-clause score drift and encode speed of each encoder backend.
+
+Run from dpdp-backend/:
+
+    python benchmarks/encoder_parity.py policy.txt --backends torch torch-int8 onnx onnx-int8
+
+Drift is reported in score points (0-100 scale) against the float32
+PyTorch model.
+"""
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.encoders import BACKENDS, parity_report  # noqa: E402
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("policy_file")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--json", action="store_true", help="print the raw report")
+    args = parser.parse_args()
+
+    with open(args.policy_file, "r", encoding="utf-8", errors="ignore") as f:
+        report = parity_report(f.read(), backends=args.backends)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{report['sentences']} sentences, reference backend: {report['reference']}\n")
+    print(f"{'backend':<12} {'sent/s':>9} {'max drift':>10} {'mean drift':>11}")
+
+    for backend, row in report["backends"].items():
+        print(f"{backend:<12} {row['sentences_per_second']:>9} "
+              f"{row['max_abs_drift']:>10} {row['mean_abs_drift']:>11}")
+
+    for backend, row in report["backends"].items():
+        if backend == report["reference"]:
+            continue
+
+        print(f"\n{backend}")
+        for clause in row["clauses"]:
+            print(f"  {clause['clause_title']:<28} {clause['reference_score']:>7} -> "
+                  f"{clause['score']:>7}  ({clause['drift']:+.4f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+"""Offline bulk compliance scanning.
+
+Run from dpdp-backend/:
+
+    python bulk_scan.py urls.txt --output scan.jsonl
+    python bulk_scan.py policies/ --output scan.parquet --workers 4
+    python bulk_scan.py sites.jsonl --output scan.jsonl --concurrency 32
+
+The input is a text file with one URL per line, a directory of policy files
+(text, HTML, PDF, DOCX) or a JSONL file whose objects carry a ``url``,
+``path`` or text field (``text``, ``policy_text`` or ``body``); unreadable
+JSONL lines become error rows rather than stopping the run. Policies are
+fetched or read by ``--concurrency`` threads and scored with
+``analyze_compliance``, on ``--workers`` forked processes when given.
+URLs share one keep-alive crawler and bypass the service's HTTP cache.
+Nothing touches the database, PDF reports or charts.
+
+Results are appended to the output every ``--flush-every`` policies (JSONL,
+or Parquet part files in a directory when the output ends in
+``.parquet``), and each flushed id is added to a checkpoint file. Running
+the same command again skips everything already in the checkpoint, or
+already in the output if a crash came between the two writes.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from core.config import settings
+from services.clause_catalog import parse_packs
+from services.ingestion import EXTENSIONS, SNIFF_BYTES, detect_format, iter_document_text
+
+
+URL = "url"
+FILE = "file"
+TEXT = "text"
+INVALID = "invalid"
+
+TEXT_FIELDS = ("text", "policy_text", "body")
+ID_FIELDS = ("id", "request_id")
+
+
+# ==============================
+# Inputs
+# ==============================
+def read_jobs(source: str, text_field: str = None, id_field: str = None):
+    """Yield ``(job_id, kind, value)`` for a URL list, directory or JSONL file.
+
+    A JSONL line that cannot be used yields an ``INVALID`` job whose value
+    is the reason, so it is reported in the output instead of ending the scan.
+    """
+
+    if os.path.isdir(source):
+        for root, _, names in os.walk(source):
+            for name in sorted(names):
+                if os.path.splitext(name)[1].lower() in EXTENSIONS:
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, source), FILE, path
+        return
+
+    with open(source, "r", encoding="utf-8") as f:
+
+        if source.endswith(".jsonl"):
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        job = _jsonl_job(line, number, text_field, id_field)
+                    except ValueError as e:
+                        job = f"line-{number}", INVALID, str(e)
+                    yield job
+            return
+
+        for line in f:
+            url = line.strip()
+            if url and not url.startswith("#"):
+                yield url, URL, url
+
+
+def _jsonl_job(line, number, text_field, id_field):
+
+    try:
+        item = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"Line {number} is not valid JSON: {e}")
+
+    if not isinstance(item, dict):
+        raise ValueError(f"Line {number} is not a JSON object")
+
+    job_id = next((item[field] for field in ((id_field,) if id_field else ID_FIELDS) if item.get(field)), None)
+
+    for field, kind in (("url", URL), ("website_url", URL), ("path", FILE)):
+        if item.get(field):
+            return str(job_id or item[field]), kind, item[field]
+
+    for field in (text_field,) if text_field else TEXT_FIELDS:
+        if item.get(field):
+            return str(job_id or f"line-{number}"), TEXT, item[field]
+
+    raise ValueError(f"Line {number} has no url, path or text field")
+
+
+class PolicyFetcher:
+    """One crawler on a background event loop, shared by every scanning
+    thread so connections are kept alive across the whole run.
+
+    Started on the first URL. Pages are fetched without the HTTP cache:
+    a one-off audit should not fill the service's conditional-fetch cache.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._crawler = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+
+        from services.crawler import AsyncCrawler
+
+        async def open_crawler():
+            # The client's pool belongs to the loop it is created on
+            return AsyncCrawler()
+
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="bulk-scan-fetch", daemon=True)
+                thread.start()
+
+                self._crawler = asyncio.run_coroutine_threadsafe(open_crawler(), loop).result()
+                self._loop, self._thread = loop, thread
+
+            return self._loop
+
+    def fetch(self, url: str):
+
+        from services.crawler import fetch_privacy_policy_async
+
+        loop = self._start()
+        coroutine = fetch_privacy_policy_async(url, self._crawler, cache=False)
+
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def close(self):
+
+        with self._lock:
+            if self._loop is None:
+                return
+
+            asyncio.run_coroutine_threadsafe(self._crawler.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+            self._loop = self._thread = self._crawler = None
+
+
+def load_text(kind: str, value: str, fetcher: PolicyFetcher = None):
+
+    if kind == TEXT:
+        return value
+
+    if kind == FILE:
+        with open(value, "rb") as f:
+            fmt = detect_format(f.read(SNIFF_BYTES), value)
+            f.seek(0)
+            return "".join(iter_document_text(f, fmt))
+
+    if fetcher is None:
+        raise ValueError("URL jobs need a PolicyFetcher")
+
+    return fetcher.fetch(value)
+
+
+# ==============================
+# Outputs
+# ==============================
+class JsonlOutput:
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, rows):
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def written(self):
+        """``(id, status)`` of every row already in the file, in order."""
+
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    # A line torn by a crash mid-write
+                    continue
+                yield row["id"], row["status"]
+
+
+class ParquetOutput:
+    """One Parquet part file per flush, so a resumed scan only adds files."""
+
+    def __init__(self, directory):
+
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+
+        self.pa, self.pq = pa, pq
+        self.directory = directory
+        self.schema = pa.schema([
+            ("id", pa.string()),
+            ("source", pa.string()),
+            ("kind", pa.string()),
+            ("status", pa.string()),
+            ("error", pa.string()),
+            ("overall_score", pa.float64()),
+            ("risk_level", pa.string()),
+            ("missing_clauses", pa.list_(pa.string())),
+            ("section_analysis", pa.string()),
+            ("fetch_ms", pa.float64()),
+            ("analyze_ms", pa.float64()),
+            ("scanned_at", pa.string())
+        ])
+
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, rows):
+
+        name = f"part-{datetime.utcnow():%Y%m%dT%H%M%S%f}.parquet"
+        path = os.path.join(self.directory, name)
+
+        # Readers of the directory never see a half-written part
+        self.pq.write_table(self.pa.Table.from_pylist(rows, schema=self.schema), path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    def written(self):
+        """``(id, status)`` of every row already in the part files, in order."""
+
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(".parquet"):
+                table = self.pq.read_table(os.path.join(self.directory, name), columns=["id", "status"])
+                yield from zip(table.column("id").to_pylist(), table.column("status").to_pylist())
+
+
+def open_output(path: str):
+    return ParquetOutput(path) if path.endswith(".parquet") else JsonlOutput(path)
+
+
+class Checkpoint:
+    """Ids already written to the output, one ``status<TAB>id`` per line."""
+
+    def __init__(self, path):
+
+        self.path = path
+        self.done = {}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    status, _, job_id = line.rstrip("\n").partition("\t")
+                    if job_id:
+                        self.done[job_id] = status
+
+    def record(self, rows):
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(f"{row['status']}\t{row['id']}\n")
+                self.done[row["id"]] = row["status"]
+            f.flush()
+            os.fsync(f.fileno())
+
+    def recover(self, output):
+        """Record rows that reached ``output`` but not the checkpoint.
+
+        The output is written before the checkpoint, so a crash between
+        the two would otherwise scan, and write, those rows again.
+        """
+
+        latest = dict(output.written())
+        missing = [
+            {"id": job_id, "status": status}
+            for job_id, status in latest.items() if self.done.get(job_id) != status
+        ]
+
+        if missing:
+            self.record(missing)
+
+        return len(missing)
+
+
+# ==============================
+# Scanning
+# ==============================
+def scan_one(job, packs=None, fetcher=None):
+    """Fetch or read one policy and score it; never raises."""
+
+    from services.worker_pool import run_analysis
+
+    job_id, kind, value = job
+
+    row = {
+        "id": job_id,
+        "source": value if kind in (URL, FILE) else None,
+        "kind": kind,
+        "status": "error",
+        "error": None,
+        "overall_score": None,
+        "risk_level": None,
+        "missing_clauses": None,
+        "section_analysis": None,
+        "fetch_ms": None,
+        "analyze_ms": None,
+        "scanned_at": datetime.utcnow().isoformat()
+    }
+
+    if kind == INVALID:
+        row["error"] = value
+        return row
+
+    try:
+        start = time.perf_counter()
+        text = load_text(kind, value, fetcher)
+        row["fetch_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+        if not text:
+            row["error"] = "Unable to fetch privacy content."
+            return row
+
+        start = time.perf_counter()
+        result = run_analysis(text, packs=packs)
+        row["analyze_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+        row.update(
+            status="ok",
+            overall_score=result["overall_score"],
+            risk_level=result["risk_level"],
+            missing_clauses=result["missing_clauses"],
+            section_analysis=json.dumps(result["section_analysis"])
+        )
+
+    except (OSError, ValueError) as e:
+        row["error"] = str(e)
+
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+
+    return row
+
+
+class ScanStats:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.ok = 0
+        self.failed = 0
+        self.skipped = 0
+        self.fetch_ms = []
+        self.analyze_ms = []
+
+    def add(self, row):
+
+        if row["status"] == "ok":
+            self.ok += 1
+            self.analyze_ms.append(row["analyze_ms"])
+        else:
+            self.failed += 1
+
+        if row["fetch_ms"] is not None:
+            self.fetch_ms.append(row["fetch_ms"])
+
+    def summary(self):
+
+        elapsed = time.perf_counter() - self.started
+        scanned = self.ok + self.failed
+
+        def percentiles(values):
+            if not values:
+                return None
+            return {
+                "p50": round(float(np.percentile(values, 50)), 1),
+                "p95": round(float(np.percentile(values, 95)), 1)
+            }
+
+        return {
+            "scanned": scanned,
+            "ok": self.ok,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed_seconds": round(elapsed, 2),
+            "policies_per_second": round(scanned / elapsed, 2) if elapsed else 0.0,
+            "fetch_ms": percentiles(self.fetch_ms),
+            "analyze_ms": percentiles(self.analyze_ms)
+        }
+
+
+def run_scan(jobs, output, checkpoint, concurrency=8, flush_every=50, packs=None, retry_failed=False, log=None,
+             fetcher=None):
+    """Scan ``jobs`` not yet in ``checkpoint``; returns the throughput summary.
+
+    At most ``2 * concurrency`` jobs are in flight, so inputs of any size
+    stream through. Rows reach the output (then the checkpoint) in batches
+    of ``flush_every``; whatever is pending is flushed on interrupt. URLs
+    go through ``fetcher`` (a ``PolicyFetcher`` for this run by default).
+    """
+
+    own_fetcher = fetcher is None
+    fetcher = fetcher or PolicyFetcher()
+
+    stats = ScanStats()
+    pending_rows = []
+    seen = set()
+
+    def flush():
+
+        if pending_rows:
+            output.write(pending_rows)
+            checkpoint.record(pending_rows)
+            del pending_rows[:]
+
+    def collect(futures):
+        for future in futures:
+            row = future.result()
+            stats.add(row)
+
+            pending_rows.append(row)
+
+            if len(pending_rows) >= flush_every:
+                flush()
+
+            if log and (stats.ok + stats.failed) % 100 == 0:
+                log(f"{stats.ok + stats.failed} scanned ({stats.failed} failed)")
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bulk-scan")
+    in_flight = set()
+
+    try:
+        for job in jobs:
+
+            job_id = job[0]
+            status = checkpoint.done.get(job_id)
+
+            if job_id in seen or status == "ok" or (status and not retry_failed):
+                stats.skipped += 1
+                continue
+
+            seen.add(job_id)
+            in_flight.add(executor.submit(scan_one, job, packs, fetcher))
+
+            if len(in_flight) >= 2 * concurrency:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        finished, in_flight = in_flight, set()
+        collect(finished)
+
+    finally:
+        # On Ctrl-C, queued jobs are dropped (rescanned next run) but the
+        # running ones finish and are written with everything else
+        for future in in_flight:
+            future.cancel()
+
+        executor.shutdown(wait=True)
+
+        try:
+            collect(future for future in in_flight if not future.cancelled())
+            flush()
+
+        finally:
+            if own_fetcher:
+                fetcher.close()
+
+    return stats.summary()
+
+
+# ==============================
+# Command Line
+# ==============================
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Scan many privacy policies without the API.")
+    parser.add_argument("source", help="URL list, directory of policy files, or JSONL file")
+    parser.add_argument("--output", required=True, help="results file (.jsonl) or Parquet directory (.parquet)")
+    parser.add_argument("--checkpoint", help="defaults to <output>.checkpoint")
+    parser.add_argument("--workers", type=int, default=0, help="analysis processes (0 scores in this process)")
+    parser.add_argument("--concurrency", type=int, default=8, help="policies fetched or read at once")
+    parser.add_argument("--flush-every", type=int, default=50)
+    parser.add_argument("--packs", help="clause packs, e.g. dpdp-act,dpdp-rules@2025")
+    parser.add_argument("--text-field", help="JSONL field holding policy text")
+    parser.add_argument("--id-field", help="JSONL field holding the row id")
+    parser.add_argument("--retry-failed", action="store_true", help="rescan ids that failed last time")
+    args = parser.parse_args(argv)
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    packs = parse_packs(args.packs)
+
+    # Parquet without pyarrow is a usage error, reported before any scanning
+    try:
+        output = open_output(args.output)
+    except RuntimeError as e:
+        parser.error(str(e))
+    checkpoint = Checkpoint(args.checkpoint or args.output.rstrip("/") + ".checkpoint")
+
+    recovered = checkpoint.recover(output)
+    if recovered:
+        log(f"Recovered {recovered} ids written to {args.output} but missing from {checkpoint.path}")
+
+    if checkpoint.done:
+        log(f"Resuming: {len(checkpoint.done)} ids already in {checkpoint.path}")
+
+    # Fail before scanning anything if the model or packs cannot load
+    from services.scoring_engine import _index_for
+
+    _index_for(packs)
+
+    if args.workers > 0:
+        from services.worker_pool import start_worker_pool, stop_worker_pool
+
+        settings.ANALYSIS_WORKERS = args.workers
+        start_worker_pool()
+
+    try:
+        summary = run_scan(
+            read_jobs(args.source, args.text_field, args.id_field),
+            output,
+            checkpoint,
+            concurrency=args.concurrency,
+            flush_every=args.flush_every,
+            packs=packs,
+            retry_failed=args.retry_failed,
+            log=log
+        )
+    finally:
+        if args.workers > 0:
+            stop_worker_pool()
+
+    print(json.dumps(summary, indent=2))
+
+    return summary
+
+
+if __name__ == "__main__":
+    main()
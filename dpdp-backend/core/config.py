@@ -5,7 +5,124 @@ load_dotenv()
 
 class Settings:
     MODEL_NAME = os.getenv("MODEL_NAME", "all-MiniLM-L6-v2")
+    # torch | torch-int8 | onnx | onnx-int8 (onnx backends need onnxruntime)
+    ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
     SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", 35))
+    EVIDENCE_TOP_K = int(os.getenv("EVIDENCE_TOP_K", 3))
+    MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() == "true"
+
+    # Keyword cascade: embed only sentences that mention a clause keyword,
+    # re-running a full scan on a sample of requests to measure score drift
+    KEYWORD_PREFILTER = os.getenv("KEYWORD_PREFILTER", "false").lower() == "true"
+    KEYWORD_PREFILTER_AUDIT_RATE = float(os.getenv("KEYWORD_PREFILTER_AUDIT_RATE", 0))
+
+    # Model cascade: MODEL_NAME scores first; clauses within CASCADE_BAND
+    # points of the threshold are re-scored by the cascade model against
+    # their CASCADE_CANDIDATES best sentences
+    MODEL_CASCADE = os.getenv("MODEL_CASCADE", "false").lower() == "true"
+    CASCADE_MODEL_NAME = os.getenv("CASCADE_MODEL_NAME", "all-mpnet-base-v2")
+    CASCADE_BACKEND = os.getenv("CASCADE_BACKEND", "torch")
+    CASCADE_BAND = float(os.getenv("CASCADE_BAND", 10))
+    CASCADE_CANDIDATES = int(os.getenv("CASCADE_CANDIDATES", 10))
+
+    # Documents longer than this are segmented and encoded in chunks
+    STREAM_THRESHOLD_CHARS = int(os.getenv("STREAM_THRESHOLD_CHARS", 200_000))
+    STREAM_CHUNK_SENTENCES = int(os.getenv("STREAM_CHUNK_SENTENCES", 256))
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dpdp_compliance.db")
+    # Async driver URL for async sessions ("" derives it from DATABASE_URL)
+    DATABASE_ASYNC_URL = os.getenv("DATABASE_ASYNC_URL", "")
+
+    # Connection pool (PostgreSQL); SQLite runs in WAL mode instead
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+    # Write-behind batching of result inserts, off the request path
+    DB_WRITE_BEHIND = os.getenv("DB_WRITE_BEHIND", "true").lower() == "true"
+    DB_WRITE_MAX_BATCH = int(os.getenv("DB_WRITE_MAX_BATCH", 100))
+    DB_WRITE_MAX_WAIT_MS = float(os.getenv("DB_WRITE_MAX_WAIT_MS", 20))
+
+    # Background PDF reports (one file per report under REPORT_DIR)
+    REPORT_DIR = os.getenv("REPORT_DIR", os.path.join("reports", "pdf"))
+    REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", 2))
+    REPORT_MAX_PENDING = int(os.getenv("REPORT_MAX_PENDING", 100))
+    REPORT_JOB_HISTORY = int(os.getenv("REPORT_JOB_HISTORY", 1000))
+    REPORT_WAIT_SECONDS = float(os.getenv("REPORT_WAIT_SECONDS", 30))
+
+    # Clause charts, rendered off the analysis path and cached by chart id
+    CHART_DIR = os.getenv("CHART_DIR", os.path.join("reports", "charts"))
+    CHART_WORKERS = int(os.getenv("CHART_WORKERS", 1))
+    CHART_WAIT_SECONDS = float(os.getenv("CHART_WAIT_SECONDS", 10))
+
+    # Report history pagination (only when the client sends a limit)
+    HISTORY_MAX_PAGE_SIZE = int(os.getenv("HISTORY_MAX_PAGE_SIZE", 1000))
+
+    # Cross-request micro-batching of sentence encodes
+    INFERENCE_SCHEDULER = os.getenv("INFERENCE_SCHEDULER", "true").lower() == "true"
+    INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", 64))
+    INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", 5))
+
+    # Uploaded documents (text, HTML, PDF, DOCX): read in chunks into a temp
+    # file that spills to disk past UPLOAD_SPOOL_BYTES
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 64 * 1024 * 1024))
+    UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", 1024 * 1024))
+    UPLOAD_READ_CHUNK = int(os.getenv("UPLOAD_READ_CHUNK", 256 * 1024))
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 2))
+
+    # Batch analysis endpoint
+    BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 500))
+    BATCH_FETCH_CONCURRENCY = int(os.getenv("BATCH_FETCH_CONCURRENCY", 16))
+
+    # Async crawler (shared keep-alive pool, timeouts in seconds)
+    CRAWLER_MAX_CONNECTIONS = int(os.getenv("CRAWLER_MAX_CONNECTIONS", 100))
+    CRAWLER_MAX_PER_HOST = int(os.getenv("CRAWLER_MAX_PER_HOST", 4))
+    CRAWLER_CONNECT_TIMEOUT = float(os.getenv("CRAWLER_CONNECT_TIMEOUT", 5))
+    CRAWLER_READ_TIMEOUT = float(os.getenv("CRAWLER_READ_TIMEOUT", 15))
+    CRAWLER_MAX_BYTES = int(os.getenv("CRAWLER_MAX_BYTES", 5 * 1024 * 1024))
+    CRAWLER_USER_AGENT = os.getenv("CRAWLER_USER_AGENT", "Mozilla/5.0 (compatible; DPDPComplianceChecker)")
+
+    # Process-pool analysis (0 keeps analysis in the API process)
+    ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", 0))
+    TORCH_THREADS_PER_WORKER = int(os.getenv("TORCH_THREADS_PER_WORKER", 0))
+    # "fork" shares the parent's model copy-on-write but can deadlock on
+    # torch/OpenMP state inherited from the parent; "forkserver" and "spawn"
+    # load the model once per worker instead
+    ANALYSIS_START_METHOD = os.getenv("ANALYSIS_START_METHOD", "forkserver")
+
+    CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+    CLAUSE_INDEX_DIR = os.getenv("CLAUSE_INDEX_DIR", os.path.join(CACHE_DIR, "clause_index"))
+
+    # Analysis result cache (disk tier is disabled when RESULT_CACHE_DIR is empty)
+    RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", 256))
+    RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", "")
+    RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+    RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", 7 * 24 * 3600))
+
+    # Sentence embedding cache (float16 memory-mapped, 0 disables)
+    EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join(CACHE_DIR, "embeddings"))
+    EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+    # Last analyzed version per website URL, for incremental re-scoring ("" disables)
+    POLICY_VERSION_DIR = os.getenv("POLICY_VERSION_DIR", os.path.join(CACHE_DIR, "versions"))
+
+    # Corpus-wide sentence search ("" disables); int8 or float16 rows
+    CORPUS_DIR = os.getenv("CORPUS_DIR", os.path.join(CACHE_DIR, "corpus"))
+    CORPUS_DTYPE = os.getenv("CORPUS_DTYPE", "int8")
+    # The IVF index is (re)built once this many rows are unindexed, or the
+    # unindexed tail reaches this fraction of the indexed rows
+    CORPUS_IVF_MIN_ROWS = int(os.getenv("CORPUS_IVF_MIN_ROWS", 50_000))
+    CORPUS_IVF_REBUILD_FRACTION = float(os.getenv("CORPUS_IVF_REBUILD_FRACTION", 0.25))
+    CORPUS_IVF_NPROBE = int(os.getenv("CORPUS_IVF_NPROBE", 16))
+    SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", 100))
+
+    # Validators and extracted text for conditional re-fetches ("" disables)
+    HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(CACHE_DIR, "http"))
+
+    # Monitored policy URLs (comma-separated), re-scanned every interval +/- jitter
+    MONITOR_URLS = [url.strip() for url in os.getenv("MONITOR_URLS", "").split(",") if url.strip()]
+    MONITOR_INTERVAL_SECONDS = float(os.getenv("MONITOR_INTERVAL_SECONDS", 24 * 3600))
+    MONITOR_JITTER = float(os.getenv("MONITOR_JITTER", 0.1))
 
 settings = Settings()
\ No newline at end of file
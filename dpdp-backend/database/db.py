@@ -1,12 +1,62 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-DATABASE_URL = "sqlite:///./dpdp_compliance.db"
+from core.config import settings
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+DATABASE_URL = settings.DATABASE_URL
+
+# Async drivers used when DATABASE_ASYNC_URL is not set
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg"
+}
+
+
+# ==============================
+# Engine Configuration
+# ==============================
+def _is_sqlite(url):
+    return url.get_backend_name() == "sqlite"
+
+
+def engine_options(url):
+
+    if _is_sqlite(url):
+        return {"connect_args": {"check_same_thread": False}}
+
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        # Drop connections the server closed while they sat in the pool
+        "pool_pre_ping": True
+    }
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+
+    # WAL lets readers run alongside the writer; NORMAL syncs only at checkpoints
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def create_db_engine(database_url: str = None):
+
+    url = make_url(database_url or DATABASE_URL)
+    db_engine = create_engine(url, **engine_options(url))
+
+    if _is_sqlite(url):
+        event.listen(db_engine, "connect", _sqlite_pragmas)
+
+    return db_engine
+
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -23,3 +73,57 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ==============================
+# Async Sessions (optional)
+# ==============================
+_async_sessionmaker = None
+
+
+def async_database_url():
+
+    if settings.DATABASE_ASYNC_URL:
+        return settings.DATABASE_ASYNC_URL
+
+    url = make_url(DATABASE_URL)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+
+    if driver is None:
+        raise RuntimeError(f"No async driver known for '{url.drivername}'; set DATABASE_ASYNC_URL")
+
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def get_async_sessionmaker():
+    """Async session factory. Needs aiosqlite (SQLite) or asyncpg
+    (PostgreSQL) installed."""
+
+    global _async_sessionmaker
+
+    if _async_sessionmaker is not None:
+        return _async_sessionmaker
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    url = make_url(async_database_url())
+
+    try:
+        async_engine = create_async_engine(url, **engine_options(url))
+    except ImportError as e:
+        raise RuntimeError(
+            f"Async database sessions require the '{url.drivername}' driver "
+            f"(pip install aiosqlite or asyncpg): {e}"
+        )
+
+    if _is_sqlite(url):
+        event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+
+    _async_sessionmaker = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    return _async_sessionmaker
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -1,20 +1,37 @@
-from fastapi import FastAPI, UploadFile, File
+from fastapi import FastAPI, UploadFile, File, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 
 import os
-import json
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 
-import requests
-from bs4 import BeautifulSoup
 from pydantic import BaseModel
-
-from services.scoring_engine import analyze_compliance
-from api.routes import router as compliance_router
-from database.db import engine
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from services.model_loader import start_warmup
+from services.worker_pool import run_analysis_async, start_worker_pool, stop_worker_pool
+from services.crawler import close_crawler, get_crawler
+from services.html_extractor import extract_text
+from services.ingestion import UnsupportedFormat, UploadTooLarge, analyze_upload, current_ingest_pool
+from services.monitor import start_monitor, stop_monitor
+from services.embedding_cache import flush_embedding_stores
+from services.inference_scheduler import current_scheduler
+from api.routes import router as compliance_router, selected_packs
+from services import report_history
+from services.result_store import queue_record
+from services.write_behind import current_write_queue
+from services.report_jobs import current_report_queue
+from services.chart_renderer import attach_chart, current_chart_renderer
+from services.sentence_corpus import current_corpus_indexer
+from database.db import SessionLocal, engine, get_db
 from models.compliance_model import Base as ComplianceBase
+from models.report_history_model import ReportHistory  # noqa: F401 (registers the table)
+from models.analytics_model import ClauseResult  # noqa: F401 (registers the tables)
+from services.analytics import backfill_analytics
 
 # Create database tables
 ComplianceBase.metadata.create_all(bind=engine)
@@ -22,6 +39,76 @@ ComplianceBase.metadata.create_all(bind=engine)
 app = FastAPI(title="DPDP Compliance Checker API")
 
 
+# Load the model and clause index without delaying startup
+@app.on_event("startup")
+def load_clause_embeddings():
+
+    # Workers start before the app's own threads, so this one blocks
+    if settings.ANALYSIS_WORKERS > 0:
+        start_worker_pool()
+
+    if settings.MODEL_WARMUP:
+        start_warmup()
+
+
+@app.on_event("shutdown")
+def shutdown_analysis():
+
+    stop_worker_pool()
+
+    scheduler = current_scheduler()
+    if scheduler:
+        scheduler.stop()
+
+    flush_embedding_stores()
+
+    # Write every queued result before exiting
+    write_queue = current_write_queue()
+    if write_queue:
+        write_queue.stop()
+
+    # Index stored results still waiting (their ids are resolved by now)
+    corpus_indexer = current_corpus_indexer()
+    if corpus_indexer:
+        corpus_indexer.shutdown()
+
+    # Let reports already queued finish rendering
+    report_queue = current_report_queue()
+    if report_queue:
+        report_queue.shutdown()
+
+    chart_renderer = current_chart_renderer()
+    if chart_renderer:
+        chart_renderer.shutdown()
+
+    ingest_pool = current_ingest_pool()
+    if ingest_pool:
+        ingest_pool.shutdown()
+
+
+@app.on_event("startup")
+def migrate_stored_data():
+
+    db = SessionLocal()
+    try:
+        report_history.import_legacy_history(db)
+        backfill_analytics(db)
+    finally:
+        db.close()
+
+
+# Re-scan monitored URLs on the app's event loop
+@app.on_event("startup")
+async def start_policy_monitor():
+    start_monitor()
+
+
+@app.on_event("shutdown")
+async def close_http_pool():
+    await stop_monitor()
+    await close_crawler()
+
+
 # Allow React frontend
 app.add_middleware(
     CORSMiddleware,
@@ -38,6 +125,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -61,19 +149,27 @@ if os.path.exists("static"):
 # Analyze Privacy Policy (File Upload)
 # ==========================
 @app.post("/analyze-policy")
-async def analyze_policy(file: UploadFile = File(...)):
+async def analyze_policy(
+    file: UploadFile = File(...),
+    chart: bool = Query(True),
+    packs: list = Depends(selected_packs)
+):
+
+    # Text, HTML, PDF or DOCX; read in chunks and scored off the event loop
+    try:
+        result = await analyze_upload(file, packs=packs)
 
-    # Read uploaded file
-    content = await file.read()
-    text = content.decode("utf-8", errors="ignore")
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
-    # Run AI compliance analysis
-    result = analyze_compliance(text)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
 
     # Save Report History
-    save_report(file.filename, result)
+    await run_in_threadpool(save_report, file.filename, result)
 
-    return result
+    # Chart renders in the background; chart=false skips it
+    return attach_chart(result) if chart else result
 
 
 # ==========================
@@ -87,27 +183,27 @@ class URLRequest(BaseModel):
 # Analyze Privacy Policy from URL
 # ==========================
 @app.post("/analyze-url")
-def analyze_url(data: URLRequest):
+async def analyze_url(
+    data: URLRequest,
+    chart: bool = Query(True),
+    packs: list = Depends(selected_packs)
+):
 
     try:
-        response = requests.get(data.url)
+        page = await get_crawler().fetch(data.url)
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        if page.error:
+            return {"error": page.error}
 
         # Extract main policy content
-        policy_section = soup.find("main") or soup.find("article") or soup.find("div")
-
-        if policy_section:
-            text = policy_section.get_text(separator=" ")
-        else:
-            text = soup.get_text(separator=" ")
+        text = await run_in_threadpool(extract_text, page.text)
 
         # Run AI analysis
-        result = analyze_compliance(text)
+        result = await run_analysis_async(text, website_url=data.url, packs=packs)
 
-        save_report(data.url, result)
+        await run_in_threadpool(save_report, data.url, result)
 
-        return result
+        return attach_chart(result) if chart else result
 
     except Exception as e:
         return {"error": str(e)}
@@ -117,42 +213,55 @@ def analyze_url(data: URLRequest):
 # ==========================
 def save_report(source, result):
 
-    report = {
-        "filename": source,
-        "score": result["overall_score"],
-        "risk": result["risk_level"],
-        "date": datetime.now().strftime("%Y-%m-%d %H:%M")
-    }
-
-    reports_file = "reports/report_history.json"
-
-    if os.path.exists(reports_file):
-        with open(reports_file, "r") as f:
-            history = json.load(f)
-    else:
-        history = []
-
-    history.append(report)
-
-    with open(reports_file, "w") as f:
-        json.dump(history, f, indent=2)
+    # Only enqueued when write-behind is on; otherwise a blocking insert
+    return queue_record(report_history.build_report(source, result))
 
 
 # ==========================
 # Get Report History
 # ==========================
-@app.get("/reports-history")
-def get_reports():
+def history_filters(
+    url: str = None,
+    risk: str = None,
+    date_from: date = None,
+    date_to: date = None
+):
+    """Query filters shared by the history and export endpoints
+    (``date_to`` is inclusive)."""
+
+    return {
+        "url": url,
+        "risk": risk,
+        "date_from": datetime.combine(date_from, time.min) if date_from else None,
+        "date_to": datetime.combine(date_to, time.min) + timedelta(days=1) if date_to else None
+    }
 
-    reports_file = "reports/report_history.json"
 
-    if not os.path.exists(reports_file):
-        return []
+def history_page(
+    response: Response,
+    filters: dict = Depends(history_filters),
+    limit: int = Query(
+        None, ge=1, le=settings.HISTORY_MAX_PAGE_SIZE,
+        description="Page size; without it the full history is returned, as before pagination"
+    ),
+    cursor: int = Query(None, description="X-Next-Cursor value from the previous page"),
+    db: Session = Depends(get_db)
+):
 
-    with open(reports_file, "r") as f:
-        history = json.load(f)
+    items, next_cursor = report_history.get_history_page(
+        db, limit, before_id=cursor, **filters
+    )
 
-    return history
+    # The body stays a plain list; the next page is requested with ?cursor=
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+
+    return items
+
+
+@app.get("/reports-history")
+def get_reports(items: list = Depends(history_page)):
+    return items
 
 
 if __name__ == "__main__":
@@ -163,53 +272,23 @@ if __name__ == "__main__":
 # Alias for history endpoint
 # ==========================
 @app.get("/history/")
-def get_history():
+def get_history(items: list = Depends(history_page)):
     """Alias endpoint for /reports-history for frontend compatibility"""
-    reports_file = "reports/report_history.json"
-    
-    if not os.path.exists(reports_file):
-        return []
-    
-    try:
-        with open(reports_file, "r") as f:
-            history = json.load(f)
-        return history
-    except Exception as e:
-        print(f"Error reading history: {e}")
-        return []
+    return items
 
 
 # ==========================
 # Export compliance history to CSV
 # ==========================
 @app.get("/export-csv/")
-def export_csv():
+def export_csv(filters: dict = Depends(history_filters)):
     """Export compliance history as CSV file"""
-    import csv
-    from io import StringIO
-    
-    reports_file = "reports/report_history.json"
-    
-    if not os.path.exists(reports_file):
-        return {"error": "No history to export"}
-    
-    try:
-        with open(reports_file, "r") as f:
-            history = json.load(f)
-        
-        # Create CSV content
-        output = StringIO()
-        if history:
-            writer = csv.DictWriter(output, fieldnames=history[0].keys())
-            writer.writeheader()
-            for record in history:
-                writer.writerow(record)
-        
-        csv_content = output.getvalue()
-        
-        return {
-            "filename": f"compliance-history-{datetime.now().strftime('%Y-%m-%d')}.csv",
-            "content": csv_content
-        }
-    except Exception as e:
-        return {"error": f"Failed to export CSV: {str(e)}"}
+
+    filename = f"compliance-history-{datetime.now().strftime('%Y-%m-%d')}.csv"
+
+    # Rows are read in batches from a DB cursor while the response streams
+    return StreamingResponse(
+        report_history.iter_history_csv(SessionLocal, **filters),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,71 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, Float, Boolean, ForeignKey, Index
+from database.db import Base
+
+
+class ClauseResult(Base):
+    """One clause's outcome within a ComplianceResult."""
+
+    __tablename__ = "clause_results"
+
+    id = Column(Integer, primary_key=True)
+    result_id = Column(Integer, ForeignKey("compliance_results.id"), nullable=False, index=True)
+    website_url = Column(String, nullable=False)
+
+    clause_title = Column(String, nullable=False)
+    section = Column(String)
+    category = Column(String)
+
+    similarity_score = Column(Float)
+    matched = Column(Boolean, nullable=False)
+
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_clause_results_clause", "clause_title", "matched", "created_at"),
+        Index("ix_clause_results_section", "section"),
+        Index("ix_clause_results_category", "category"),
+    )
+
+
+# ==============================
+# Rollups (updated on every insert)
+# ==============================
+class ClauseRollup(Base):
+    __tablename__ = "clause_rollups"
+
+    clause_title = Column(String, primary_key=True)
+    section = Column(String)
+    category = Column(String)
+
+    analyses = Column(Integer, nullable=False, default=0)
+    failures = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+
+
+class CategoryDailyRollup(Base):
+    __tablename__ = "category_daily_rollups"
+
+    category = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    analyses = Column(Integer, nullable=False, default=0)
+    failures = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+
+
+class UrlDailyRollup(Base):
+    __tablename__ = "url_daily_rollups"
+
+    website_url = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    analyses = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+
+
+class RiskRollup(Base):
+    __tablename__ = "risk_rollups"
+
+    risk_level = Column(String, primary_key=True)
+
+    analyses = Column(Integer, nullable=False, default=0)
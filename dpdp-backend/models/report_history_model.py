@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index
+from datetime import datetime
+from database.db import Base
+
+
+class ReportHistory(Base):
+    __tablename__ = "report_history"
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String, nullable=False)
+
+    score = Column(Float)
+    risk = Column(String)
+
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    # Keyset pages walk id descending, optionally within one source or risk
+    __table_args__ = (
+        Index("ix_report_history_source_id", "source", "id"),
+        Index("ix_report_history_risk_id", "risk", "id"),
+        Index("ix_report_history_created_at", "created_at"),
+    )
@@ -0,0 +1,279 @@
+import json
+import logging
+from collections import defaultdict
+
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from models.analytics_model import (
+    CategoryDailyRollup, ClauseResult, ClauseRollup, RiskRollup, UrlDailyRollup
+)
+from models.compliance_model import ComplianceResult
+
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================
+# Per-clause Rows and Rollups
+# ==============================
+def _clause_rows(record):
+
+    rows = []
+
+    for clause_title, details in json.loads(record.section_analysis or "{}").items():
+        rows.append({
+            "result_id": record.id,
+            "website_url": record.website_url,
+            "clause_title": clause_title,
+            "section": details.get("section"),
+            "category": details.get("category"),
+            "similarity_score": details.get("similarity_score"),
+            "matched": details.get("status") == "Matched",
+            "created_at": record.created_at
+        })
+
+    return rows
+
+
+def _upsert(connection, model, rows, keys, counters):
+    """Insert rollup rows, adding ``counters`` onto rows that already exist."""
+
+    if not rows:
+        return
+
+    table = model.__table__
+    dialect = connection.dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        statement = dialect_insert(table).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=keys,
+            set_={name: table.c[name] + statement.excluded[name] for name in counters}
+        )
+        connection.execute(statement)
+        return
+
+    # Portable fallback: update, then insert the keys that didn't exist yet
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(*(table.c[key] == row[key] for key in keys))
+            .values({name: table.c[name] + row[name] for name in counters})
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(row))
+
+
+def apply_analytics(connection, records):
+    """Write clause rows for ``records`` and fold them into the rollups,
+    inside the caller's transaction."""
+
+    clause_rows = []
+    clauses = defaultdict(lambda: {"analyses": 0, "failures": 0, "score_sum": 0.0})
+    categories = defaultdict(lambda: {"analyses": 0, "failures": 0, "score_sum": 0.0})
+    urls = defaultdict(lambda: {"analyses": 0, "score_sum": 0.0})
+    risks = defaultdict(int)
+
+    for record in records:
+
+        day = record.created_at.date()
+
+        urls[(record.website_url, day)]["analyses"] += 1
+        urls[(record.website_url, day)]["score_sum"] += record.compliance_percentage or 0.0
+        risks[record.risk_level] += 1
+
+        for row in _clause_rows(record):
+            clause_rows.append(row)
+
+            for totals in (
+                clauses[(row["clause_title"], row["section"], row["category"])],
+                categories[(row["category"], day)]
+            ):
+                totals["analyses"] += 1
+                totals["failures"] += 0 if row["matched"] else 1
+                totals["score_sum"] += row["similarity_score"] or 0.0
+
+    if clause_rows:
+        connection.execute(insert(ClauseResult), clause_rows)
+
+    _upsert(
+        connection, ClauseRollup,
+        [
+            {"clause_title": title, "section": section, "category": category, **totals}
+            for (title, section, category), totals in clauses.items()
+        ],
+        ["clause_title"], ["analyses", "failures", "score_sum"]
+    )
+    _upsert(
+        connection, CategoryDailyRollup,
+        [{"category": category, "day": day, **totals} for (category, day), totals in categories.items()],
+        ["category", "day"], ["analyses", "failures", "score_sum"]
+    )
+    _upsert(
+        connection, UrlDailyRollup,
+        [{"website_url": url, "day": day, **totals} for (url, day), totals in urls.items()],
+        ["website_url", "day"], ["analyses", "score_sum"]
+    )
+    _upsert(
+        connection, RiskRollup,
+        [{"risk_level": risk, "analyses": count} for risk, count in risks.items()],
+        ["risk_level"], ["analyses"]
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _record_analytics(session, flush_context):
+
+    # Every insert path (direct, batch, write-behind) goes through a flush
+    records = [obj for obj in session.new if isinstance(obj, ComplianceResult)]
+
+    if records:
+        apply_analytics(session.connection(), records)
+
+
+def backfill_analytics(db, batch_size: int = 500):
+    """Build clause rows and rollups for results stored before they existed."""
+
+    if db.scalar(select(func.count()).select_from(ClauseResult)):
+        return 0
+
+    total = 0
+    last_id = 0
+
+    while True:
+        records = db.scalars(
+            select(ComplianceResult)
+            .where(ComplianceResult.id > last_id)
+            .order_by(ComplianceResult.id)
+            .limit(batch_size)
+        ).all()
+
+        if not records:
+            break
+
+        apply_analytics(db.connection(), records)
+        db.commit()
+
+        total += len(records)
+        last_id = records[-1].id
+
+    if total:
+        logger.info("Backfilled analytics for %d stored results", total)
+
+    return total
+
+
+# ==============================
+# Analytics Queries
+# ==============================
+def _rate(failures, analyses):
+    return round(failures / analyses, 4) if analyses else 0.0
+
+
+def _average(score_sum, analyses):
+    return round(score_sum / analyses, 2) if analyses else 0.0
+
+
+def clause_failure_rates(db, section: str = None, category: str = None):
+
+    query = select(ClauseRollup).order_by(ClauseRollup.clause_title)
+
+    if section:
+        query = query.where(ClauseRollup.section == section)
+
+    if category:
+        query = query.where(ClauseRollup.category == category)
+
+    return [
+        {
+            "clause_title": row.clause_title,
+            "section": row.section,
+            "category": row.category,
+            "analyses": row.analyses,
+            "failures": row.failures,
+            "failure_rate": _rate(row.failures, row.analyses),
+            "average_score": _average(row.score_sum, row.analyses)
+        }
+        for row in db.scalars(query)
+    ]
+
+
+def failing_sites(db, clause_title: str, limit: int = 100):
+    """Websites whose analyses failed ``clause_title``, most recent first."""
+
+    last_failed = func.max(ClauseResult.created_at)
+
+    query = (
+        select(ClauseResult.website_url, last_failed.label("last_failed"), func.count().label("failures"))
+        .where(ClauseResult.clause_title == clause_title, ClauseResult.matched.is_(False))
+        .group_by(ClauseResult.website_url)
+        .order_by(last_failed.desc())
+        .limit(limit)
+    )
+
+    return [
+        {"website_url": url, "last_failed": last.isoformat(), "failures": failures}
+        for url, last, failures in db.execute(query)
+    ]
+
+
+def url_score_trend(db, website_url: str):
+
+    query = (
+        select(UrlDailyRollup)
+        .where(UrlDailyRollup.website_url == website_url)
+        .order_by(UrlDailyRollup.day)
+    )
+
+    return [
+        {
+            "day": row.day.isoformat(),
+            "analyses": row.analyses,
+            "average_score": _average(row.score_sum, row.analyses)
+        }
+        for row in db.scalars(query)
+    ]
+
+
+def category_trend(db, category: str = None):
+
+    query = select(CategoryDailyRollup).order_by(CategoryDailyRollup.category, CategoryDailyRollup.day)
+
+    if category:
+        query = query.where(CategoryDailyRollup.category == category)
+
+    return [
+        {
+            "category": row.category,
+            "day": row.day.isoformat(),
+            "analyses": row.analyses,
+            "failure_rate": _rate(row.failures, row.analyses),
+            "average_score": _average(row.score_sum, row.analyses)
+        }
+        for row in db.scalars(query)
+    ]
+
+
+def risk_distribution(db):
+
+    rows = db.scalars(select(RiskRollup).order_by(RiskRollup.risk_level)).all()
+    total = sum(row.analyses for row in rows)
+
+    return {
+        "total": total,
+        "levels": [
+            {
+                "risk_level": row.risk_level,
+                "analyses": row.analyses,
+                "share": _rate(row.analyses, total)
+            }
+            for row in rows
+        ]
+    }
@@ -0,0 +1,198 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+CHART_ID = re.compile(r"[0-9a-f]{40}")
+
+
+# ==============================
+# Chart Data
+# ==============================
+def chart_data(section_analysis: dict):
+    """Clause names and similarity scores, in clause order."""
+
+    names = list(section_analysis)
+    scores = [details.get("similarity_score") or 0.0 for details in section_analysis.values()]
+
+    return names, scores
+
+
+def chart_id(names, scores):
+
+    # Same scores, same picture: identical results share one file
+    payload = json.dumps([names, scores], separators=(",", ":"))
+
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def draw_chart(names, scores, path):
+
+    # Figure + Agg canvas instead of pyplot: no global state, safe off the main thread
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(10, 5))
+    FigureCanvasAgg(figure)
+
+    axes = figure.add_subplot()
+    axes.bar(names, scores)
+    axes.set_xlabel("DPDP Clauses")
+    axes.set_ylabel("Similarity Score (%)")
+    axes.set_title("DPDP Compliance Clause Analysis")
+    axes.tick_params(axis="x", labelrotation=45)
+    figure.tight_layout()
+
+    figure.savefig(path, format="png")
+
+
+# ==============================
+# Chart Renderer
+# ==============================
+class ChartRenderer:
+    """Renders clause charts to ``<directory>/<chart_id>.png``, once each.
+
+    ``submit`` queues a render on a background thread and returns at once;
+    ``ensure`` returns the file path, waiting for (or doing) the render.
+    Charts already on disk are never drawn again.
+    """
+
+    def __init__(self, directory, max_workers=1, draw_fn=draw_chart):
+        self.directory = directory
+        self.draw_fn = draw_fn
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chart")
+        self._futures = {}
+        self._lock = threading.Lock()
+
+        self.rendered = 0
+        self.hits = 0
+
+    def path_for(self, chart_key: str):
+
+        if not CHART_ID.fullmatch(chart_key or ""):
+            return None
+
+        return os.path.join(self.directory, f"{chart_key}.png")
+
+    def _render(self, chart_key, names, scores):
+
+        path = self.path_for(chart_key)
+
+        try:
+            if os.path.exists(path):
+                return path
+
+            os.makedirs(self.directory, exist_ok=True)
+
+            # Write then rename so readers never see a partial image
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            self.draw_fn(names, scores, tmp_path)
+            os.replace(tmp_path, path)
+
+            self.rendered += 1
+
+            return path
+
+        finally:
+            with self._lock:
+                self._futures.pop(chart_key, None)
+
+    def submit(self, section_analysis: dict):
+        """Queue the chart for ``section_analysis`` and return its id."""
+
+        names, scores = chart_data(section_analysis)
+        chart_key = chart_id(names, scores)
+
+        with self._lock:
+            if chart_key in self._futures:
+                return chart_key
+
+            if os.path.exists(self.path_for(chart_key)):
+                self.hits += 1
+                return chart_key
+
+            self._futures[chart_key] = self._executor.submit(self._render, chart_key, names, scores)
+
+        return chart_key
+
+    def ensure(self, section_analysis: dict):
+        """Path of the chart for ``section_analysis``, rendering it if needed."""
+
+        return self.wait(self.submit(section_analysis))
+
+    def wait(self, chart_key: str, timeout: float = None):
+        """Path of a submitted or cached chart, or None if it is unknown."""
+
+        path = self.path_for(chart_key)
+
+        if path is None:
+            return None
+
+        with self._lock:
+            future = self._futures.get(chart_key)
+
+        if future is not None:
+            return future.result(timeout)
+
+        return path if os.path.exists(path) else None
+
+    def stats(self):
+
+        with self._lock:
+            pending = len(self._futures)
+
+        return {"rendered": self.rendered, "cache_hits": self.hits, "pending": pending}
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+def attach_chart(result: dict, renderer=None):
+    """Copy of ``result`` whose ``graph_path`` points at its chart.
+
+    The chart is rendered in the background; ``/charts/{chart_id}.png``
+    waits for it if a client asks before it is done.
+    """
+
+    if not result.get("section_analysis"):
+        return result
+
+    renderer = renderer or get_chart_renderer()
+    chart_key = renderer.submit(result["section_analysis"])
+
+    return {**result, "chart_id": chart_key, "graph_path": f"charts/{chart_key}.png"}
+
+
+# ==============================
+# Process-wide Renderer
+# ==============================
+_renderer = None
+_renderer_pid = None
+_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer():
+
+    global _renderer, _renderer_pid
+
+    with _renderer_lock:
+
+        # Threads don't survive fork, so each process gets its own pool
+        if _renderer is None or _renderer_pid != os.getpid():
+            _renderer = ChartRenderer(settings.CHART_DIR, max_workers=settings.CHART_WORKERS)
+            _renderer_pid = os.getpid()
+
+        return _renderer
+
+
+def current_chart_renderer():
+    return _renderer if _renderer_pid == os.getpid() else None
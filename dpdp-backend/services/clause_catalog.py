@@ -0,0 +1,286 @@
+import os
+import re
+import json
+import hashlib
+import threading
+
+import numpy as np
+
+from services.clause_index import BASE_DIR, CLAUSES_PATH, _clauses_hash, get_pack_index
+
+
+PACKS_DIR = os.path.join(BASE_DIR, "data", "clause_packs")
+
+# The original flat clauses file is the DPDP Act pack
+DEFAULT_PACK_ID = "dpdp-act"
+DEFAULT_PACK_VERSION = "2023"
+DEFAULT_PACK_TITLE = "Digital Personal Data Protection Act, 2023"
+DEFAULT_PACK_REGULATION = "DPDP Act 2023"
+
+
+class UnknownPack(ValueError):
+    pass
+
+
+def _version_key(version: str):
+
+    # "2025.10" sorts after "2025.9"
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in re.split(r"[.\-]", version)]
+
+
+# ==============================
+# Clause Packs
+# ==============================
+class ClausePack:
+    """One versioned set of clauses, flattened parent-first.
+
+    Each node is the clause as written in the pack plus ``key``
+    (``pack_id:clause_id``), ``parent`` (position of the parent node in
+    the pack, or None) and ``depth``. Sub-clauses listed under
+    ``requirements`` inherit their parent's section and category.
+    """
+
+    def __init__(self, pack_id, version, title, nodes, pack_hash, path=None, regulation=None):
+        self.pack_id = pack_id
+        self.version = version
+        self.title = title
+        self.regulation = regulation or title
+        self.nodes = nodes
+        self.pack_hash = pack_hash
+        self.path = path
+
+    @classmethod
+    def load(cls, path):
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        pack_hash = _clauses_hash(path)
+
+        if isinstance(data, list):
+            return cls(
+                DEFAULT_PACK_ID, DEFAULT_PACK_VERSION, DEFAULT_PACK_TITLE,
+                flatten(DEFAULT_PACK_ID, data), pack_hash, path, DEFAULT_PACK_REGULATION
+            )
+
+        return cls(
+            data["pack_id"],
+            str(data["version"]),
+            data.get("title", data["pack_id"]),
+            flatten(data["pack_id"], data["clauses"]),
+            pack_hash,
+            path,
+            data.get("regulation")
+        )
+
+    @property
+    def spec(self):
+        return f"{self.pack_id}@{self.version}"
+
+    def info(self):
+
+        return {
+            "pack_id": self.pack_id,
+            "version": self.version,
+            "title": self.title,
+            "regulation": self.regulation,
+            "clauses": sum(1 for node in self.nodes if node["parent"] is None),
+            "requirements": len(self.nodes)
+        }
+
+
+def flatten(pack_id, clauses):
+
+    nodes = []
+
+    def visit(clause, parent, depth):
+
+        node = {key: value for key, value in clause.items() if key != "requirements"}
+
+        if parent is not None:
+            node.setdefault("section", nodes[parent]["section"])
+            node.setdefault("category", nodes[parent]["category"])
+
+        node.setdefault("section", "")
+        node.setdefault("category", "")
+        node["key"] = f"{pack_id}:{clause.get('clause_id', len(nodes))}"
+        node["parent"] = parent
+        node["depth"] = depth
+
+        position = len(nodes)
+        nodes.append(node)
+
+        for child in clause.get("requirements", []):
+            visit(child, position, depth + 1)
+
+    for clause in clauses:
+        visit(clause, None, 0)
+
+    return nodes
+
+
+_lock = threading.Lock()
+_packs = {}
+
+
+def _load_pack(path):
+
+    pack_hash = _clauses_hash(path)
+
+    with _lock:
+        cached = _packs.get(path)
+        if cached and cached.pack_hash == pack_hash:
+            return cached
+
+    pack = ClausePack.load(path)
+
+    with _lock:
+        _packs[path] = pack
+
+    return pack
+
+
+def available_packs(packs_dir: str = None):
+    """Every installed pack version, keyed by ``pack_id@version``."""
+
+    packs_dir = packs_dir or PACKS_DIR
+    paths = [CLAUSES_PATH]
+
+    if os.path.isdir(packs_dir):
+        paths += [
+            os.path.join(packs_dir, name)
+            for name in sorted(os.listdir(packs_dir))
+            if name.endswith(".json")
+        ]
+
+    packs = {}
+
+    for path in paths:
+        pack = _load_pack(path)
+        packs[pack.spec] = pack
+
+    return packs
+
+
+def resolve_packs(specs, packs_dir: str = None):
+    """Packs for ``["pack_id", "pack_id@version", ...]``; a bare id picks the
+    newest installed version."""
+
+    installed = available_packs(packs_dir)
+    selected = []
+
+    for spec in specs:
+        spec = spec.strip()
+
+        if not spec:
+            continue
+
+        if "@" in spec:
+            pack = installed.get(spec)
+        else:
+            versions = [pack for pack in installed.values() if pack.pack_id == spec]
+            pack = max(versions, key=lambda p: _version_key(p.version)) if versions else None
+
+        if pack is None:
+            raise UnknownPack(f"Unknown clause pack '{spec}'")
+
+        if pack not in selected:
+            selected.append(pack)
+
+    if not selected:
+        raise UnknownPack("No clause pack selected")
+
+    return selected
+
+
+def parse_packs(value: str):
+    """``"dpdp-act,dpdp-rules@2025"`` -> list of specs, or None when empty."""
+
+    specs = [spec.strip() for spec in (value or "").split(",") if spec.strip()]
+
+    return specs or None
+
+
+# ==============================
+# Clause Catalog (selected packs)
+# ==============================
+class ClauseCatalog:
+    """Several packs scored as one matrix.
+
+    Exposes ``clauses``, ``embeddings`` and ``clauses_hash`` like a
+    ``ClauseIndex``, so every scoring path works unchanged, plus the
+    parent links needed to roll sub-clause scores up the hierarchy.
+    """
+
+    def __init__(self, packs, embeddings):
+
+        self.packs = packs
+        self.clauses = [node for pack in packs for node in pack.nodes]
+        self.embeddings = np.ascontiguousarray(np.vstack(embeddings), dtype=np.float32)
+
+        self.clauses_hash = hashlib.sha256(
+            "\n".join(f"{pack.spec}:{pack.pack_hash}" for pack in packs).encode("utf-8")
+        ).hexdigest()
+
+        self.pack_of = np.concatenate([np.full(len(pack.nodes), i) for i, pack in enumerate(packs)])
+
+        offsets = np.cumsum([0] + [len(pack.nodes) for pack in packs])
+        self.parents = np.array([
+            offsets[p] + node["parent"] if node["parent"] is not None else -1
+            for p, pack in enumerate(packs)
+            for node in pack.nodes
+        ], dtype=np.int64)
+        self.depths = np.array([node["depth"] for node in self.clauses], dtype=np.int64)
+        self.roots = np.flatnonzero(self.parents < 0)
+
+    def rollup(self, scores):
+        """Scores with every parent replaced by the mean of its children,
+        deepest level first."""
+
+        scores = np.asarray(scores, dtype=np.float64).copy()
+        n = len(scores)
+
+        for depth in range(int(self.depths.max(initial=0)), 0, -1):
+
+            children = np.flatnonzero(self.depths == depth)
+            parents = self.parents[children]
+
+            sums = np.bincount(parents, weights=scores[children], minlength=n)
+            counts = np.bincount(parents, minlength=n)
+
+            has_children = counts > 0
+            scores[has_children] = sums[has_children] / counts[has_children]
+
+        return scores
+
+    def children(self):
+
+        children = [[] for _ in self.clauses]
+
+        for child, parent in enumerate(self.parents):
+            if parent >= 0:
+                children[parent].append(child)
+
+        return children
+
+
+_catalogs = {}
+
+
+def get_catalog(model, specs, model_name: str = None):
+    """Catalog over the packs named by ``specs``, using each pack's stored
+    embeddings (built on first use)."""
+
+    packs = resolve_packs(specs)
+    key = (model_name,) + tuple(f"{pack.spec}:{pack.pack_hash}" for pack in packs)
+
+    with _lock:
+        catalog = _catalogs.get(key)
+
+    if catalog is None:
+        catalog = ClauseCatalog(packs, [get_pack_index(model, pack, model_name).embeddings for pack in packs])
+
+        with _lock:
+            _catalogs[key] = catalog
+
+    return catalog
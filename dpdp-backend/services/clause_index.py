@@ -0,0 +1,188 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+
+import numpy as np
+
+from core.config import settings
+from services.similarity import normalize_rows
+
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+CLAUSES_PATH = os.path.join(BASE_DIR, "data", "dpdp_clauses.json")
+
+
+# ==============================
+# Helpers
+# ==============================
+def file_hash(path: str):
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _index_path(model_name: str, clauses_hash: str, prefix: str = ""):
+
+    slug = "".join(c if c.isalnum() else "_" for c in prefix + model_name)
+
+    return os.path.join(
+        settings.CLAUSE_INDEX_DIR,
+        f"{slug}-{clauses_hash[:16]}.npz"
+    )
+
+
+# ==============================
+# Clause Embedding Index
+# ==============================
+class ClauseIndex:
+    """Normalized clause embeddings for one model and one clauses file."""
+
+    def __init__(self, model_name, clauses_hash, clauses, embeddings):
+        self.model_name = model_name
+        self.clauses_hash = clauses_hash
+        self.clauses = clauses
+        self.embeddings = embeddings
+
+    @classmethod
+    def build(cls, model, model_name, clauses_hash, clauses):
+
+        texts = [clause["description"] for clause in clauses]
+        embeddings = normalize_rows(model.encode(texts))
+
+        return cls(model_name, clauses_hash, clauses, embeddings)
+
+    @classmethod
+    def load(cls, path, model_name, clauses_hash):
+
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+
+            if meta["model_name"] != model_name or meta["clauses_hash"] != clauses_hash:
+                return None
+
+            embeddings = np.ascontiguousarray(data["embeddings"], dtype=np.float32)
+
+        return cls(model_name, clauses_hash, meta["clauses"], embeddings)
+
+    def save(self, path):
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        meta = json.dumps({
+            "model_name": self.model_name,
+            "clauses_hash": self.clauses_hash,
+            "clauses": self.clauses
+        })
+
+        # Write to a temp file first so a crash never leaves a torn index
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, embeddings=self.embeddings, meta=np.array(meta))
+        os.replace(tmp_path, path)
+
+
+# ==============================
+# Index Registry
+# ==============================
+_lock = threading.Lock()
+_indexes = {}
+_file_state = {}
+
+
+def _clauses_hash(path: str):
+
+    # Only rehash the file when its size or mtime changed
+    stat = os.stat(path)
+    state = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _file_state.get(path)
+    if cached and cached[0] == state:
+        return cached[1]
+
+    digest = file_hash(path)
+    _file_state[path] = (state, digest)
+
+    return digest
+
+
+def _load_or_build(model, model_name, path, clauses_hash, read_clauses):
+
+    index = None
+
+    if os.path.exists(path):
+        try:
+            index = ClauseIndex.load(path, model_name, clauses_hash)
+        except Exception as e:
+            logger.warning("Discarding unreadable clause index %s: %s", path, e)
+
+    if index is None:
+        clauses = read_clauses()
+
+        logger.info("Building clause index %s (%d clauses)", os.path.basename(path), len(clauses))
+        index = ClauseIndex.build(model, model_name, clauses_hash, clauses)
+        index.save(path)
+
+    return index
+
+
+def get_clause_index(model, model_name: str = None, clauses_path: str = CLAUSES_PATH):
+
+    model_name = model_name or settings.MODEL_NAME
+
+    with _lock:
+
+        clauses_hash = _clauses_hash(clauses_path)
+        key = (model_name, clauses_path)
+
+        index = _indexes.get(key)
+        if index and index.clauses_hash == clauses_hash:
+            return index
+
+        def read_clauses():
+            with open(clauses_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        index = _load_or_build(
+            model, model_name, _index_path(model_name, clauses_hash), clauses_hash, read_clauses
+        )
+
+        _indexes[key] = index
+
+        return index
+
+
+def get_pack_index(model, pack, model_name: str = None):
+    """Embeddings of a clause pack's flattened clauses, built once per pack
+    version and model and stored next to the default index."""
+
+    model_name = model_name or settings.MODEL_NAME
+
+    with _lock:
+
+        key = (model_name, "pack", pack.pack_id, pack.version)
+
+        index = _indexes.get(key)
+        if index and index.clauses_hash == pack.pack_hash:
+            return index
+
+        index = _load_or_build(
+            model, model_name,
+            _index_path(model_name, pack.pack_hash, prefix=f"pack-{pack.pack_id}-"),
+            pack.pack_hash,
+            lambda: pack.nodes
+        )
+
+        # The pack owns the hierarchy; the stored copy only guards the embeddings
+        index.clauses = pack.nodes
+
+        _indexes[key] = index
+
+        return index
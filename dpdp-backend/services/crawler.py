@@ -1,44 +1,267 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import logging
+import weakref
+from collections import defaultdict
+from urllib.parse import urlsplit
 
+import httpx
 
-def fetch_privacy_policy(url: str):
+from core.config import settings
+from services.html_extractor import extract_text
+from services.http_cache import conditional_headers, content_hash, get_http_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================
+# Fetch Result
+# ==============================
+class FetchResult:
+
+    def __init__(self, url, status_code=None, text=None, headers=None, error=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None and self.status_code == 200
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+def _decode(body: bytes, encoding: str = None):
 
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0"
-        }
+        return body.decode(encoding or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+# ==============================
+# Async Pooled Crawler
+# ==============================
+class AsyncCrawler:
+    """Keep-alive HTTP client with global and per-host concurrency caps,
+    separate connect/read timeouts and a response size limit."""
+
+    def __init__(
+        self,
+        max_connections=None,
+        max_per_host=None,
+        connect_timeout=None,
+        read_timeout=None,
+        max_bytes=None
+    ):
+        max_connections = max_connections or settings.CRAWLER_MAX_CONNECTIONS
+        read_timeout = read_timeout or settings.CRAWLER_READ_TIMEOUT
+
+        self.max_per_host = max_per_host or settings.CRAWLER_MAX_PER_HOST
+        self.max_bytes = max_bytes or settings.CRAWLER_MAX_BYTES
+
+        self._client = httpx.AsyncClient(
+            headers={"User-Agent": settings.CRAWLER_USER_AGENT},
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            timeout=httpx.Timeout(
+                read_timeout,
+                connect=connect_timeout or settings.CRAWLER_CONNECT_TIMEOUT,
+                read=read_timeout
+            )
+        )
+        self._hosts = defaultdict(lambda: asyncio.Semaphore(self.max_per_host))
+
+    async def fetch(self, url: str, headers=None):
+
+        try:
+            host = urlsplit(url).netloc.lower()
+        except ValueError as e:
+            return FetchResult(url, error=str(e))
+
+        try:
+            async with self._hosts[host]:
+                async with self._client.stream("GET", url, headers=headers) as response:
+
+                    body = bytearray()
+
+                    async for block in response.aiter_bytes():
+                        body.extend(block)
+
+                        if len(body) > self.max_bytes:
+                            raise ResponseTooLarge(
+                                f"Response exceeds {self.max_bytes} bytes"
+                            )
+
+                    text = _decode(bytes(body), response.encoding)
+
+                    return FetchResult(
+                        str(response.url),
+                        status_code=response.status_code,
+                        text=text,
+                        headers=dict(response.headers)
+                    )
+
+        except (httpx.HTTPError, httpx.InvalidURL, ResponseTooLarge) as e:
+            logger.warning("Fetch failed for %s: %s", url, e)
+            return FetchResult(url, error=str(e) or type(e).__name__)
+
+    async def fetch_many(self, urls):
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+# One client per event loop: httpx connection pools can't cross loops
+_crawlers = weakref.WeakKeyDictionary()
+
+
+def get_crawler():
+
+    loop = asyncio.get_running_loop()
+    crawler = _crawlers.get(loop)
+
+    if crawler is None:
+        crawler = AsyncCrawler()
+        _crawlers[loop] = crawler
 
-        response = requests.get(url, headers=headers, timeout=15)
+    return crawler
 
-        if response.status_code != 200:
-            return None
 
-        soup = BeautifulSoup(response.text, "html.parser")
+async def close_crawler():
 
-        # Remove junk elements
-        for tag in soup(["script", "style", "nav", "footer", "header"]):
-            tag.decompose()
+    crawler = _crawlers.pop(asyncio.get_running_loop(), None)
 
-        # Extract text from paragraphs AND divs
-        paragraphs = soup.find_all(["p", "div"])
+    if crawler:
+        await crawler.aclose()
 
-        text_chunks = []
 
-        for tag in paragraphs:
-            content = tag.get_text(strip=True)
-            if len(content) > 50:
-                text_chunks.append(content)
+# ==============================
+# Conditional Fetching
+# ==============================
+MODIFIED = "modified"
+NOT_MODIFIED = "not_modified"
+UNCHANGED = "unchanged"
+FAILED = "failed"
 
-        cleaned_text = " ".join(text_chunks)
 
-        print("Extracted length:", len(cleaned_text))
+class PolicyFetch:
 
-        if len(cleaned_text) < 500:
-            return None
+    def __init__(self, url, status, text=None, entry=None, error=None):
+        self.url = url
+        self.status = status
+        self.text = text
+        self.entry = entry
+        self.error = error
 
-        return cleaned_text
+    @property
+    def changed(self):
+        return self.status == MODIFIED
 
+
+async def fetch_policy_conditional(url: str, crawler: AsyncCrawler = None, cache=None):
+    """Fetch with the cached validators and reuse the cached text when the
+    server answers 304 or returns a byte-identical body.
+
+    The returned ``entry`` is what should be cached for the URL; storing it
+    is left to the caller. ``cache=False`` fetches without the HTTP cache.
+    """
+
+    crawler = crawler or get_crawler()
+
+    if cache is None:
+        cache = get_http_cache()
+
+    cached = cache.get(url) if cache else None
+    page = await crawler.fetch(url, headers=conditional_headers(cached))
+
+    if page.status_code == 304 and cached:
+        return PolicyFetch(url, NOT_MODIFIED, cached["text"], cached)
+
+    if not page.ok:
+        return PolicyFetch(url, FAILED, error=page.error or f"HTTP {page.status_code}")
+
+    entry = {
+        "etag": page.headers.get("etag"),
+        "last_modified": page.headers.get("last-modified"),
+        "content_hash": content_hash(page.text)
+    }
+
+    if cached and cached.get("content_hash") == entry["content_hash"]:
+        return PolicyFetch(url, UNCHANGED, cached["text"], dict(entry, text=cached["text"]))
+
+    # HTML parsing is CPU-bound, keep it off the event loop
+    text = await asyncio.to_thread(extract_text, page.text)
+
+    return PolicyFetch(url, MODIFIED, text, dict(entry, text=text))
+
+
+# ==============================
+# Privacy Policy Fetching
+# ==============================
+async def fetch_privacy_policy_async(url: str, crawler: AsyncCrawler = None, cache=None):
+
+    if cache is None:
+        cache = get_http_cache()
+    fetched = await fetch_policy_conditional(url, crawler, cache)
+
+    if fetched.status == FAILED:
+        return None
+
+    if cache and fetched.status != NOT_MODIFIED:
+        cache.put(url, fetched.entry)
+
+    cleaned_text = fetched.text
+
+    logger.debug("Extracted %d characters from %s", len(cleaned_text), url)
+
+    if len(cleaned_text) < 500:
+        return None
+
+    return cleaned_text
+
+
+async def fetch_privacy_policies(urls, concurrency: int = None):
+    """Fetch and extract many policies concurrently (None for failures).
+
+    The crawler already caps connections; ``concurrency`` also bounds how
+    many pages are parsed at once. One URL failing never fails the others.
+    """
+
+    crawler = get_crawler()
+    limit = asyncio.Semaphore(concurrency or len(urls) or 1)
+
+    async def fetch(url):
+        async with limit:
+            try:
+                return await fetch_privacy_policy_async(url, crawler)
+            except Exception:
+                logger.exception("Fetching %s failed", url)
+                return None
+
+    return await asyncio.gather(*(fetch(url) for url in urls))
+
+
+def fetch_privacy_policy(url: str):
+    """Blocking wrapper for callers outside the event loop."""
+
+    async def fetch_once():
+        crawler = AsyncCrawler()
+        try:
+            return await fetch_privacy_policy_async(url, crawler)
+        finally:
+            await crawler.aclose()
+
+    try:
+        return asyncio.run(fetch_once())
     except Exception as e:
-        print("Crawler Error:", e)
-        return None
\ No newline at end of file
+        logger.warning("Fetching %s failed: %s", url, e)
+        return None
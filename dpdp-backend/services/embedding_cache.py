@@ -0,0 +1,278 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+KEY_BYTES = 20
+
+
+def sentence_key(sentence: str):
+    return hashlib.sha1(sentence.encode("utf-8")).digest()
+
+
+def stored_precision(embeddings):
+    """Embeddings rounded through float16, as the store keeps them.
+
+    Applied with or without a store, so scores do not depend on
+    EMBEDDING_CACHE_MAX_BYTES.
+    """
+
+    return np.asarray(embeddings, dtype=np.float16).astype(np.float32)
+
+
+# ==============================
+# Sentence Embedding Store
+# ==============================
+class SentenceEmbeddingStore:
+    """LRU of sentence embeddings kept in float16 memory-mapped files.
+
+    Every slot holds one vector plus the hash of its sentence and a
+    last-used stamp, so the LRU index is rebuilt from disk on restart and a
+    crash can never leave a key pointing at another sentence's vector.
+    """
+
+    def __init__(self, model_name, directory, max_bytes):
+        self.model_name = model_name
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self.dim = None
+        self.capacity = 0
+
+        self._lock = threading.Lock()
+        self._index = OrderedDict()
+        self._free = []
+        self._clock = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        self._open_existing()
+
+    # ---------- storage ----------
+
+    def _meta_path(self):
+        return os.path.join(self.directory, "meta.json")
+
+    def _open(self, dim, capacity, mode):
+
+        self.dim = dim
+        self.capacity = capacity
+
+        self._vectors = np.memmap(
+            os.path.join(self.directory, "vectors.f16"),
+            dtype=np.float16, mode=mode, shape=(capacity, dim)
+        )
+        self._keys = np.memmap(
+            os.path.join(self.directory, "keys.bin"),
+            dtype=f"S{KEY_BYTES}", mode=mode, shape=(capacity,)
+        )
+        self._stamps = np.memmap(
+            os.path.join(self.directory, "stamps.bin"),
+            dtype=np.int64, mode=mode, shape=(capacity,)
+        )
+
+    def _open_existing(self):
+
+        try:
+            with open(self._meta_path(), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        capacity = self._capacity_for(meta["dim"])
+
+        if meta["model_name"] != self.model_name or meta["capacity"] != capacity:
+            logger.info("Embedding cache settings changed, starting a new cache")
+            return
+
+        try:
+            self._open(meta["dim"], capacity, "r+")
+        except (OSError, ValueError) as e:
+            logger.warning("Discarding unreadable embedding cache: %s", e)
+            self.dim = None
+            return
+
+        used = np.flatnonzero(self._keys != b"")
+        order = used[np.argsort(self._stamps[used], kind="stable")]
+
+        for slot in order:
+            self._index[bytes(self._keys[slot])] = int(slot)
+
+        self._free = sorted(set(range(capacity)) - set(self._index.values()), reverse=True)
+        self._clock = int(self._stamps.max()) if len(used) else 0
+
+    def _capacity_for(self, dim):
+        return max(1, self.max_bytes // (dim * 2))
+
+    def _create(self, dim):
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._open(dim, self._capacity_for(dim), "w+")
+        self._free = list(range(self.capacity - 1, -1, -1))
+
+        with open(self._meta_path(), "w", encoding="utf-8") as f:
+            json.dump({
+                "model_name": self.model_name,
+                "dim": dim,
+                "capacity": self.capacity
+            }, f)
+
+    # ---------- lookups ----------
+
+    def _touch(self, key):
+
+        slot = self._index[key]
+        self._index.move_to_end(key)
+
+        self._clock += 1
+        self._stamps[slot] = self._clock
+
+        return slot
+
+    def _insert(self, key, vector):
+
+        if key in self._index:
+            return
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            _, slot = self._index.popitem(last=False)
+
+        # Vector first, key second: a torn write leaves an empty slot
+        self._keys[slot] = b""
+        self._vectors[slot] = vector
+        self._keys[slot] = key
+
+        self._index[key] = slot
+        self._touch(key)
+
+    def encode(self, sentences, encode_fn):
+        """Return float32 embeddings for ``sentences``, encoding only misses.
+
+        Fresh embeddings are rounded through float16 too, so a sentence
+        scores the same whether or not it was cached.
+        """
+
+        keys = [sentence_key(s) for s in sentences]
+        rows = [None] * len(sentences)
+        pending = OrderedDict()
+
+        with self._lock:
+            for i, key in enumerate(keys):
+
+                if key in self._index:
+                    rows[i] = np.array(self._vectors[self._touch(key)])
+                    self.hits += 1
+                else:
+                    pending.setdefault(key, []).append(i)
+                    self.misses += 1
+
+        if pending:
+            miss_sentences = [sentences[positions[0]] for positions in pending.values()]
+            fresh = np.asarray(encode_fn(miss_sentences), dtype=np.float16)
+
+            with self._lock:
+                if self.dim is None:
+                    self._create(fresh.shape[1])
+
+                for (key, positions), vector in zip(pending.items(), fresh):
+
+                    self._insert(key, vector)
+
+                    for i in positions:
+                        rows[i] = vector
+
+        return np.asarray(rows, dtype=np.float32).reshape(len(sentences), -1)
+
+    def flush(self):
+
+        with self._lock:
+            if self.dim is not None:
+                self._vectors.flush()
+                self._keys.flush()
+                self._stamps.flush()
+
+    def stats(self):
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            row_bytes = (self.dim or 0) * 2
+
+            return {
+                "model_name": self.model_name,
+                "entries": len(self._index),
+                "capacity": self.capacity,
+                "bytes_used": len(self._index) * row_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# ==============================
+# Store Registry
+# ==============================
+_stores = {}
+_stores_lock = threading.Lock()
+_partition = None
+
+
+def use_worker_partition(worker_id: int):
+    """Point this process at its own cache files (for forked workers)."""
+
+    global _partition
+
+    with _stores_lock:
+        _partition = f"worker-{worker_id}"
+        _stores.clear()
+
+
+def get_embedding_store(model_name: str = None):
+
+    # A zero budget disables the cache entirely
+    if settings.EMBEDDING_CACHE_MAX_BYTES <= 0:
+        return None
+
+    model_name = model_name or settings.MODEL_NAME
+
+    with _stores_lock:
+
+        store = _stores.get(model_name)
+
+        if store is None:
+            slug = "".join(c if c.isalnum() else "_" for c in model_name)
+            directory = os.path.join(settings.EMBEDDING_CACHE_DIR, slug)
+
+            if _partition:
+                directory = os.path.join(directory, _partition)
+
+            store = SentenceEmbeddingStore(
+                model_name,
+                directory,
+                settings.EMBEDDING_CACHE_MAX_BYTES
+            )
+            _stores[model_name] = store
+
+        return store
+
+
+def flush_embedding_stores():
+
+    with _stores_lock:
+        stores = list(_stores.values())
+
+    for store in stores:
+        store.flush()
@@ -0,0 +1,342 @@
+import os
+import time
+import inspect
+import logging
+import functools
+import importlib.util
+
+import numpy as np
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+# Used when onnxruntime is not installed
+FALLBACKS = {"onnx": "torch", "onnx-int8": "torch-int8"}
+
+
+@functools.lru_cache(maxsize=None)
+def _has_onnxruntime():
+    return importlib.util.find_spec("onnxruntime") is not None
+
+
+def available_backend(backend: str = None):
+    """The backend that will actually run: ONNX backends fall back to
+    their PyTorch counterpart when onnxruntime is missing."""
+
+    backend = backend or settings.ENCODER_BACKEND
+
+    if backend in FALLBACKS and not _has_onnxruntime():
+        return FALLBACKS[backend]
+
+    return backend
+
+
+def encoder_key(backend: str = None, model_name: str = None):
+    """Cache namespace for embeddings from one model + backend pair.
+
+    The plain PyTorch backend keeps the bare model name, so caches built
+    before backends existed stay valid. Keys name the backend that really
+    runs, so a fallback never files torch vectors under an ONNX key.
+    """
+
+    backend = available_backend(backend)
+    model_name = model_name or settings.MODEL_NAME
+
+    if backend == "torch":
+        return model_name
+
+    return f"{model_name}@{backend}"
+
+
+def _slug(name: str):
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+# ==============================
+# PyTorch Backends
+# ==============================
+class TorchEncoder:
+    """The SentenceTransformer as-is (float32 PyTorch)."""
+
+    backend = "torch"
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    def encode(self, sentences, batch_size=32):
+        return self.model.encode(sentences, batch_size=batch_size)
+
+
+class QuantizedTorchEncoder(TorchEncoder):
+    """Linear layers dynamically quantized to int8 (weights int8,
+    activations quantized on the fly)."""
+
+    backend = "torch-int8"
+
+    def __init__(self, model_name):
+        import torch
+
+        super().__init__(model_name)
+
+        self.model = torch.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+
+# ==============================
+# ONNX Runtime Backends
+# ==============================
+class OnnxEncoder:
+    """Transformer exported to ONNX; pooling and normalization done in
+    numpy. Requires the optional ``onnxruntime`` package."""
+
+    backend = "onnx"
+
+    def __init__(self, model_name):
+        try:
+            import onnxruntime
+        except ImportError:
+            raise RuntimeError(
+                "ENCODER_BACKEND=onnx requires onnxruntime (pip install onnxruntime)"
+            )
+
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+
+        st_model = SentenceTransformer(model_name, device="cpu")
+        transformer = st_model[0]
+
+        self.tokenizer = transformer.tokenizer
+        self.max_seq_length = transformer.max_seq_length
+        self.pooling = self._pooling_mode(st_model)
+        self.normalize = any(type(m).__name__ == "Normalize" for m in st_model)
+
+        path = self._model_path(st_model)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = onnxruntime.InferenceSession(
+            path, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    @staticmethod
+    def _pooling_mode(st_model):
+
+        pooling = st_model[1].get_pooling_mode_str()
+
+        if pooling not in ("mean", "cls"):
+            raise RuntimeError(f"ONNX backend does not support '{pooling}' pooling")
+
+        return pooling
+
+    def _export_dir(self):
+        return os.path.join(settings.CACHE_DIR, "onnx", _slug(self.model_name))
+
+    def _model_path(self, st_model):
+
+        path = os.path.join(self._export_dir(), "model.onnx")
+
+        if not os.path.exists(path):
+            self._export(st_model, path)
+
+        return path
+
+    def _export(self, st_model, path):
+
+        import torch
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        logger.info("Exporting %s to ONNX at %s", self.model_name, path)
+
+        auto_model = st_model[0].auto_model.eval()
+        sample = self.tokenizer(["export sample"], return_tensors="pt")
+        names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+
+        dynamic_axes = {n: {0: "batch", 1: "tokens"} for n in names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "tokens"}
+
+        tmp_path = path + ".tmp"
+
+        export_options = {}
+
+        # Newer torch defaults to the dynamo exporter; keep the TorchScript one
+        if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+            export_options["dynamo"] = False
+
+        with torch.no_grad():
+            torch.onnx.export(
+                auto_model,
+                tuple(sample[n] for n in names),
+                tmp_path,
+                input_names=names,
+                output_names=["last_hidden_state"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14,
+                **export_options
+            )
+
+        os.replace(tmp_path, path)
+
+    def encode(self, sentences, batch_size=32):
+
+        batches = []
+
+        for start in range(0, len(sentences), batch_size):
+
+            tokens = self.tokenizer(
+                list(sentences[start:start + batch_size]),
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+
+            feeds = {
+                name: tokens[name].astype(np.int64)
+                for name in self.input_names
+            }
+
+            hidden = self.session.run(None, feeds)[0]
+
+            if self.pooling == "cls":
+                pooled = hidden[:, 0]
+            else:
+                mask = tokens["attention_mask"][..., None].astype(np.float32)
+                pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+            if self.normalize:
+                pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+            batches.append(pooled.astype(np.float32))
+
+        if not batches:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        return np.concatenate(batches)
+
+
+class QuantizedOnnxEncoder(OnnxEncoder):
+    """ONNX export with weights dynamically quantized to int8."""
+
+    backend = "onnx-int8"
+
+    def _model_path(self, st_model):
+
+        float_path = super()._model_path(st_model)
+        path = os.path.join(self._export_dir(), "model.int8.onnx")
+
+        if not os.path.exists(path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            tmp_path = path + ".tmp"
+            quantize_dynamic(float_path, tmp_path, weight_type=QuantType.QInt8)
+            os.replace(tmp_path, path)
+
+        return path
+
+
+# ==============================
+# Backend Factory
+# ==============================
+_ENCODERS = {
+    "torch": TorchEncoder,
+    "torch-int8": QuantizedTorchEncoder,
+    "onnx": OnnxEncoder,
+    "onnx-int8": QuantizedOnnxEncoder
+}
+
+
+def create_encoder(backend: str = None, model_name: str = None, fallback: bool = True):
+
+    backend = backend or settings.ENCODER_BACKEND
+    model_name = model_name or settings.MODEL_NAME
+
+    if backend not in _ENCODERS:
+        raise ValueError(f"Unknown ENCODER_BACKEND '{backend}', expected one of {BACKENDS}")
+
+    if fallback and available_backend(backend) != backend:
+        logger.warning(
+            "ENCODER_BACKEND=%s requires onnxruntime (pip install onnxruntime); using %s instead",
+            backend, available_backend(backend)
+        )
+        backend = available_backend(backend)
+
+    return _ENCODERS[backend](model_name)
+
+
+# ==============================
+# Parity Check
+# ==============================
+def parity_report(policy_text: str, backends=BACKENDS, reference: str = "torch", repeats: int = 3):
+    """Score ``policy_text`` with every backend and report per-clause drift
+    (in score points) against the reference backend, plus encode latency."""
+
+    from services.clause_index import CLAUSES_PATH
+    from services.scoring_engine import load_clauses, split_sentences
+    from services.similarity import normalize_rows, top_k_matches
+
+    clauses = load_clauses()
+    clause_texts = [clause["description"] for clause in clauses]
+    sentences = split_sentences(policy_text)
+
+    report = {
+        "clauses_file": CLAUSES_PATH,
+        "sentences": len(sentences),
+        "reference": reference,
+        "backends": {}
+    }
+
+    scores = {}
+
+    for backend in [reference] + [b for b in backends if b != reference]:
+
+        # A silent fallback would report zero drift for the ONNX backends
+        encoder = create_encoder(backend, fallback=False)
+        encoder.encode(sentences[:8])
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            sentence_embeddings = encoder.encode(sentences)
+            timings.append(time.perf_counter() - start)
+
+        clause_embeddings = normalize_rows(encoder.encode(clause_texts))
+        _, best = top_k_matches(clause_embeddings, normalize_rows(sentence_embeddings), 1)
+        scores[backend] = best[:, 0] * 100
+
+        report["backends"][backend] = {
+            "encode_seconds": round(min(timings), 4),
+            "sentences_per_second": round(len(sentences) / min(timings), 1)
+        }
+
+    for backend, backend_scores in scores.items():
+
+        drift = backend_scores - scores[reference]
+
+        report["backends"][backend].update({
+            "max_abs_drift": round(float(np.abs(drift).max()), 4),
+            "mean_abs_drift": round(float(np.abs(drift).mean()), 4),
+            "clauses": [
+                {
+                    "clause_title": clause["title"],
+                    "reference_score": round(float(ref), 2),
+                    "score": round(float(score), 2),
+                    "drift": round(float(delta), 4)
+                }
+                for clause, ref, score, delta in zip(
+                    clauses, scores[reference], backend_scores, drift
+                )
+            ]
+        })
+
+    return report
@@ -0,0 +1,299 @@
+import re
+import codecs
+
+from lxml import etree
+
+
+# Elements whose text is never policy content
+SKIP_TAGS = frozenset({
+    "head", "script", "style", "noscript", "template", "svg", "iframe",
+    "nav", "footer", "header", "aside", "form", "button", "select"
+})
+
+# Elements that start a new block of text; everything else is inline
+BLOCK_TAGS = frozenset({
+    "html", "body", "main", "article", "section", "div", "p",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "dl", "dt", "dd",
+    "table", "thead", "tbody", "tfoot", "tr", "td", "th", "caption",
+    "blockquote", "pre", "address", "figure", "figcaption", "details", "summary",
+    "br", "hr"
+})
+
+MAIN_TAGS = frozenset({"main", "article"})
+MAIN_HINTS = ("policy", "privacy", "content", "article", "main", "terms")
+
+MIN_BLOCK_CHARS = 30
+MAX_LINK_DENSITY = 0.5
+
+# Below this the detected main region is too small to trust
+MIN_MAIN_CHARS = 500
+
+FEED_SIZE = 64 * 1024
+
+# Flush buffered input even without a tag boundary past this size
+MAX_PENDING = 1024 * 1024
+
+# Bytes are decoded with the <meta> charset when one is declared up front,
+# otherwise as UTF-8 (libxml2 alone would assume latin-1)
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+CHARSET_SNIFF_BYTES = 4096
+
+
+def sniff_encoding(head: bytes, default: str = "utf-8"):
+
+    match = META_CHARSET.search(head[:CHARSET_SNIFF_BYTES])
+
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+
+    return default
+
+
+class TextBlock:
+
+    __slots__ = ("text", "link_chars", "in_main")
+
+    def __init__(self, text, link_chars, in_main):
+        self.text = text
+        self.link_chars = link_chars
+        self.in_main = in_main
+
+    @property
+    def link_density(self):
+        return self.link_chars / len(self.text) if self.text else 0.0
+
+
+def _is_main(element):
+
+    if element.tag in MAIN_TAGS or element.get("role") == "main":
+        return True
+
+    hints = f"{element.get('id', '')} {element.get('class', '')}".lower()
+
+    return element.tag in ("div", "section") and any(h in hints for h in MAIN_HINTS)
+
+
+def _normalize(parts):
+    return " ".join(" ".join(part for part in parts if part).split())
+
+
+# ==============================
+# Single-pass Block Extraction
+# ==============================
+class BlockExtractor:
+    """Streaming HTML to text blocks in one pass over the document.
+
+    Each element's own text is attached to its nearest block ancestor when
+    the element closes, so nested containers never repeat their children's
+    text. Processed subtrees are cleared as the parser goes, so memory
+    stays bounded by the open elements rather than the whole document.
+
+    Input is handed to libxml2 cut at tag boundaries: its push parser
+    loses the rest of the document when a ``</script>`` is split across
+    two feeds. Bytes are decoded with ``encoding`` (e.g. the HTTP
+    charset) or else the ``<meta>`` charset, defaulting to UTF-8.
+    """
+
+    def __init__(self, encoding: str = None):
+        self.encoding = encoding
+        self._parser = None
+        self._has_content = False
+        self._pending = None
+        self._slots = []
+        self._open_blocks = {}
+        self._tail_slots = {}
+        self._inline = {}
+        self._main_elements = set()
+        self._skip_depth = 0
+        self._main_depth = 0
+
+    def _open(self, data):
+
+        encoding = None
+        if isinstance(data, bytes):
+            encoding = self.encoding or sniff_encoding(data)
+
+        self._parser = etree.HTMLPullParser(
+            events=("start", "end"), remove_comments=True, no_network=True, encoding=encoding
+        )
+
+    def feed(self, data):
+
+        if not data:
+            return
+
+        if self._parser is None:
+            self._open(data)
+
+        self._has_content = self._has_content or bool(data.strip())
+
+        pending = data if self._pending is None else self._pending + data
+        cut = pending.rfind(b">" if isinstance(pending, bytes) else ">") + 1
+
+        if not cut and len(pending) > MAX_PENDING:
+            cut = len(pending)
+
+        self._pending = pending[cut:]
+
+        if cut:
+            self._parser.feed(pending[:cut])
+            self._drain()
+
+    def close(self):
+
+        # libxml2 rejects a document without any element
+        if not self._has_content:
+            return []
+
+        if self._pending:
+            self._parser.feed(self._pending)
+
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            # Text without markup: keep whatever the parser produced
+            pass
+
+        self._drain()
+
+        return [block for block in self._slots if block is not None]
+
+    def _drain(self):
+
+        for event, element in self._parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+
+            if event == "start":
+                self._start(element)
+            else:
+                self._end(element)
+
+    def _start(self, element):
+
+        if element.tag in SKIP_TAGS:
+            self._skip_depth += 1
+            return
+
+        if self._skip_depth:
+            return
+
+        if _is_main(element):
+            self._main_elements.add(element)
+            self._main_depth += 1
+
+        if element.tag in BLOCK_TAGS:
+            # Reserve the output position now to keep document order
+            self._open_blocks[element] = len(self._slots)
+            self._slots.append(None)
+
+    def _end(self, element):
+
+        if element.tag in SKIP_TAGS:
+            self._skip_depth -= 1
+            element.clear(keep_tail=True)
+            return
+
+        if self._skip_depth:
+            element.clear(keep_tail=True)
+            return
+
+        is_block = element in self._open_blocks
+
+        # Text between block children becomes its own segment, written to
+        # the slot reserved when the preceding child closed
+        segments = []
+        slot = self._open_blocks.pop(element, None)
+        parts = [element.text]
+        link_chars = 0
+
+        for child in element:
+            inline = self._inline.pop(child, None)
+
+            if inline is not None:
+                parts.append(inline[0])
+                link_chars += inline[1]
+            elif is_block and child in self._tail_slots:
+                segments.append((slot, parts, link_chars))
+                slot = self._tail_slots.pop(child)
+                parts, link_chars = [], 0
+            else:
+                # Block inside an inline element: text continues after it
+                self._tail_slots.pop(child, None)
+                parts.append(" ")
+
+            parts.append(child.tail)
+
+        segments.append((slot, parts, link_chars))
+
+        if is_block:
+            in_main = self._main_depth > 0
+
+            for slot, parts, link_chars in segments:
+                text = _normalize(parts)
+                if text:
+                    self._slots[slot] = TextBlock(text, link_chars, in_main)
+
+            # Room for the parent's text that follows this element
+            self._tail_slots[element] = len(self._slots)
+            self._slots.append(None)
+        else:
+            text = _normalize(parts)
+            self._inline[element] = (text, len(text) if element.tag == "a" else link_chars)
+
+        if element in self._main_elements:
+            self._main_elements.discard(element)
+            self._main_depth -= 1
+
+        element.clear(keep_tail=True)
+
+
+def extract_blocks(html, chunk_size: int = FEED_SIZE):
+    """All text blocks of ``html`` (str/bytes, or an iterable of chunks)."""
+
+    extractor = BlockExtractor()
+
+    if isinstance(html, (str, bytes)):
+        for start in range(0, len(html), chunk_size):
+            extractor.feed(html[start:start + chunk_size])
+    else:
+        for chunk in html:
+            extractor.feed(chunk)
+
+    return extractor.close()
+
+
+def select_content(blocks, min_chars: int = MIN_BLOCK_CHARS):
+    """Drop boilerplate blocks and keep the main region when one is found."""
+
+    seen = set()
+    content = []
+
+    for block in blocks:
+        if len(block.text) < min_chars or block.link_density > MAX_LINK_DENSITY:
+            continue
+
+        # Cookie banners and repeated notices appear more than once
+        if block.text in seen:
+            continue
+
+        seen.add(block.text)
+        content.append(block)
+
+    main = [block for block in content if block.in_main]
+
+    if sum(len(block.text) for block in main) >= MIN_MAIN_CHARS:
+        return main
+
+    return content
+
+
+def extract_text(html, min_chars: int = MIN_BLOCK_CHARS):
+    """Main policy text of an HTML document, each block exactly once."""
+
+    blocks = select_content(extract_blocks(html), min_chars)
+
+    return " ".join(block.text for block in blocks)
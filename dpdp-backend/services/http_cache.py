@@ -0,0 +1,88 @@
+import os
+import json
+import time
+import hashlib
+import logging
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(body: str):
+    return hashlib.sha256(body.encode("utf-8", errors="replace")).hexdigest()
+
+
+def conditional_headers(entry):
+    """Validators from a cached response, for a conditional GET."""
+
+    headers = {}
+
+    if not entry:
+        return headers
+
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    return headers
+
+
+# ==============================
+# On-disk HTTP Cache
+# ==============================
+class HttpCache:
+    """Last response validators and extracted policy text per URL.
+
+    One JSON file per URL holds the ETag, Last-Modified, a hash of the
+    raw body and the text extracted from it, so a 304 or an identical
+    body can reuse the text without parsing the page again.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, url: str):
+
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        return entry if entry.get("url") == url else None
+
+    def put(self, url: str, entry: dict):
+
+        entry = dict(entry, url=url, stored_at=time.time())
+        path = self._path(url)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write HTTP cache entry for %s: %s", url, e)
+
+
+_http_cache = None
+
+
+def get_http_cache():
+    """The shared cache, or None when HTTP_CACHE_DIR is empty."""
+
+    global _http_cache
+
+    if _http_cache is None and settings.HTTP_CACHE_DIR:
+        _http_cache = HttpCache(settings.HTTP_CACHE_DIR)
+
+    return _http_cache
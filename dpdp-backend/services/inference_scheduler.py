@@ -0,0 +1,241 @@
+import os
+import time
+import queue
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================
+# Pending Work
+# ==============================
+class _Request:
+    """One caller's sentences, possibly split across several batches."""
+
+    def __init__(self, sentences, max_batch_size):
+        self.future = Future()
+        self.chunks = [
+            sentences[i:i + max_batch_size]
+            for i in range(0, len(sentences), max_batch_size)
+        ]
+        self.results = [None] * len(self.chunks)
+        self.remaining = len(self.chunks)
+        self.lock = threading.Lock()
+
+    def chunk_done(self, position, embeddings):
+
+        with self.lock:
+            self.results[position] = embeddings
+            self.remaining -= 1
+            done = self.remaining == 0
+
+        if done and not self.future.done():
+            self.future.set_result(np.concatenate(self.results))
+
+    def fail(self, error):
+
+        if not self.future.done():
+            self.future.set_exception(error)
+
+
+# ==============================
+# Micro-batching Scheduler
+# ==============================
+class InferenceScheduler:
+    """Runs the encoder on a dedicated thread and merges the sentences of
+    concurrent callers into shared batches.
+
+    A batch is sent to the model once it holds ``max_batch_size`` sentences
+    or ``max_wait_ms`` has passed since its first sentence arrived.
+    """
+
+    def __init__(self, encode_fn, max_batch_size=64, max_wait_ms=5):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # Worker-thread state: an item that opens the next batch
+        self._carry = None
+        self._stopping = False
+
+        self.batches = 0
+        self.sentences = 0
+
+    def start(self):
+
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run,
+                name="inference-scheduler",
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+
+        with self._lock:
+            if not self._thread:
+                return
+
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    # ---------- caller API ----------
+
+    def submit(self, sentences):
+
+        request = _Request(list(sentences), self.max_batch_size)
+
+        if not request.chunks:
+            request.future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return request.future
+
+        self.start()
+
+        for position, chunk in enumerate(request.chunks):
+            self._queue.put((request, position, chunk))
+
+        return request.future
+
+    def encode(self, sentences):
+        return self.submit(sentences).result()
+
+    async def encode_async(self, sentences):
+        return await asyncio.wrap_future(self.submit(sentences))
+
+    def stats(self):
+
+        return {
+            "batches": self.batches,
+            "sentences": self.sentences,
+            "average_batch_size": round(self.sentences / self.batches, 2) if self.batches else 0.0,
+            "queued_chunks": self._queue.qsize()
+        }
+
+    # ---------- worker thread ----------
+
+    def _collect(self, first):
+
+        batch = [first]
+        size = len(first[2])
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch_size:
+
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+
+            if item is None:
+                # Finish this batch, then stop
+                self._stopping = True
+                break
+
+            if size + len(item[2]) > self.max_batch_size:
+                # Doesn't fit, so it opens the next batch
+                self._carry = item
+                break
+
+            batch.append(item)
+            size += len(item[2])
+
+        return batch
+
+    def _drain(self):
+
+        # Callers that raced with stop() must not wait forever
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+            if item is not None:
+                item[0].fail(RuntimeError("Inference scheduler stopped"))
+
+    def _run(self):
+
+        self._carry = None
+        self._stopping = False
+
+        while True:
+
+            if self._carry is not None:
+                first, self._carry = self._carry, None
+            elif self._stopping:
+                return self._drain()
+            else:
+                first = self._queue.get()
+
+            if first is None:
+                return self._drain()
+
+            batch = self._collect(first)
+            sentences = [s for _, _, chunk in batch for s in chunk]
+
+            try:
+                embeddings = np.asarray(self.encode_fn(sentences))
+            except Exception as e:
+                logger.exception("Batch encode failed")
+                for request, _, _ in batch:
+                    request.fail(e)
+                continue
+
+            self.batches += 1
+            self.sentences += len(sentences)
+
+            offset = 0
+            for request, position, chunk in batch:
+                request.chunk_done(position, embeddings[offset:offset + len(chunk)])
+                offset += len(chunk)
+
+
+# ==============================
+# Process-wide Scheduler
+# ==============================
+_scheduler = None
+_scheduler_pid = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(encode_fn):
+
+    global _scheduler, _scheduler_pid
+
+    with _scheduler_lock:
+
+        # Threads don't survive fork, so each process gets its own scheduler
+        if _scheduler is None or _scheduler_pid != os.getpid():
+            _scheduler = InferenceScheduler(
+                encode_fn,
+                max_batch_size=settings.INFERENCE_MAX_BATCH,
+                max_wait_ms=settings.INFERENCE_MAX_WAIT_MS
+            )
+            _scheduler_pid = os.getpid()
+
+        return _scheduler
+
+
+def current_scheduler():
+    return _scheduler if _scheduler_pid == os.getpid() else None
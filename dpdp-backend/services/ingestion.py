@@ -0,0 +1,343 @@
+import os
+import codecs
+import asyncio
+import zipfile
+import logging
+import itertools
+import threading
+from tempfile import SpooledTemporaryFile
+from concurrent.futures import ThreadPoolExecutor
+
+from lxml import etree
+
+from core.config import settings
+from services.html_extractor import BlockExtractor, select_content
+
+
+logger = logging.getLogger(__name__)
+
+TEXT = "text"
+HTML = "html"
+PDF = "pdf"
+DOCX = "docx"
+
+EXTENSIONS = {
+    ".txt": TEXT, ".text": TEXT, ".md": TEXT,
+    ".html": HTML, ".htm": HTML, ".xhtml": HTML,
+    ".pdf": PDF,
+    ".docx": DOCX
+}
+
+SNIFF_BYTES = 2048
+HTML_HINTS = (b"<!doctype html", b"<html", b"<head", b"<body", b"<div", b"<p>", b"<p ")
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class UnsupportedFormat(ValueError):
+    pass
+
+
+# ==============================
+# Spooling
+# ==============================
+async def spool_upload(upload, max_bytes: int = None, chunk_size: int = None):
+    """Copy an upload into a temp file in fixed-size reads.
+
+    At most ``UPLOAD_SPOOL_BYTES`` stay in memory; the rest goes to disk.
+    Raises ``UploadTooLarge`` as soon as ``max_bytes`` is exceeded.
+    """
+
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    chunk_size = chunk_size or settings.UPLOAD_READ_CHUNK
+
+    spooled = SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_BYTES)
+    size = 0
+
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"Upload exceeds the {max_bytes} byte limit")
+
+            spooled.write(chunk)
+
+    except BaseException:
+        spooled.close()
+        raise
+
+    spooled.seek(0)
+
+    return spooled
+
+
+# ==============================
+# Format Detection
+# ==============================
+def detect_format(head: bytes, filename: str = None, content_type: str = None):
+    """Format of a document from its first bytes, falling back to the name."""
+
+    if head.startswith(b"%PDF-"):
+        return PDF
+
+    if head.startswith(b"PK\x03\x04"):
+        # Any other zip container (xlsx, odt, ...) is rejected when opened
+        return DOCX
+
+    if head.startswith(b"\xd0\xcf\x11\xe0"):
+        raise UnsupportedFormat("Legacy .doc files are not supported; save the policy as .docx or PDF")
+
+    lowered = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+
+    if lowered.startswith(b"<") and any(hint in lowered for hint in HTML_HINTS):
+        return HTML
+
+    extension = os.path.splitext(filename or "")[1].lower()
+
+    if extension in EXTENSIONS and EXTENSIONS[extension] in (TEXT, HTML):
+        return EXTENSIONS[extension]
+
+    if content_type and content_type.split(";")[0].strip() == "text/html":
+        return HTML
+
+    if b"\x00" in head:
+        raise UnsupportedFormat("Binary files other than PDF and DOCX are not supported")
+
+    return TEXT
+
+
+# ==============================
+# Text Extraction
+# ==============================
+def iter_plain_text(stream, chunk_size: int):
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="ignore")
+
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+
+        text = decoder.decode(data)
+        if text:
+            yield text
+
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_html_text(stream, chunk_size: int):
+
+    extractor = BlockExtractor()
+
+    try:
+        while True:
+            data = stream.read(chunk_size)
+            if not data:
+                break
+            extractor.feed(data)
+
+        # The main region is only known once the whole page has been seen,
+        # so the page's text blocks (not its markup) are held until then
+        blocks = extractor.close()
+
+    except etree.LxmlError as e:
+        raise UnsupportedFormat(f"Unreadable HTML document: {e}")
+
+    for block in select_content(blocks):
+        yield block.text + " "
+
+
+def iter_docx_text(stream):
+
+    try:
+        archive = zipfile.ZipFile(stream)
+        document = archive.open("word/document.xml")
+    except (zipfile.BadZipFile, KeyError, NotImplementedError, RuntimeError):
+        # RuntimeError: encrypted; NotImplementedError: unknown compression
+        raise UnsupportedFormat("Zip upload is not a Word (.docx) document")
+
+    with archive, document:
+        try:
+            for _, paragraph in etree.iterparse(document, events=("end",), tag=WORD_NS + "p"):
+
+                text = "".join(node.text or "" for node in paragraph.iter(WORD_NS + "t"))
+                if text.strip():
+                    yield text + " "
+
+                # Drop parsed paragraphs so memory stays flat on long documents
+                paragraph.clear()
+                while paragraph.getprevious() is not None:
+                    del paragraph.getparent()[0]
+
+        except (etree.XMLSyntaxError, zipfile.BadZipFile) as e:
+            raise UnsupportedFormat(f"Unreadable Word document: {e}")
+
+
+def iter_pdf_text(stream):
+
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise UnsupportedFormat("PDF uploads require pypdf (pip install pypdf)")
+
+    # Malformed files fail in many ways inside pypdf (PdfReadError, but
+    # also KeyError, ValueError, struct errors...): all of them are a bad upload
+    try:
+        reader = PdfReader(stream)
+        page_count = len(reader.pages)
+    except Exception as e:
+        raise UnsupportedFormat(f"Unreadable PDF: {e}")
+
+    # Pages are parsed one at a time as the scorer asks for more text
+    for number in range(page_count):
+
+        try:
+            text = reader.pages[number].extract_text() or ""
+        except Exception as e:
+            raise UnsupportedFormat(f"Unreadable PDF page {number + 1}: {e}")
+
+        if text.strip():
+            yield " ".join(text.split()) + " "
+
+
+def iter_document_text(stream, fmt: str, chunk_size: int = None):
+    """Text of a document in pieces, as ``analyze_compliance_stream`` takes it."""
+
+    chunk_size = chunk_size or settings.UPLOAD_READ_CHUNK
+
+    if fmt == PDF:
+        return iter_pdf_text(stream)
+
+    if fmt == DOCX:
+        return iter_docx_text(stream)
+
+    if fmt == HTML:
+        return iter_html_text(stream, chunk_size)
+
+    return iter_plain_text(stream, chunk_size)
+
+
+def read_head(pieces, limit: int):
+    """Pull pieces until more than ``limit`` characters have been read.
+
+    Returns the pieces read and whether the document continues.
+    """
+
+    head = []
+    size = 0
+
+    for piece in pieces:
+        head.append(piece)
+        size += len(piece)
+
+        if size > limit:
+            return head, True
+
+    return head, False
+
+
+# ==============================
+# Ingestion Pool
+# ==============================
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_ingest_pool():
+    """Threads that parse and score uploads; its size bounds how many
+    documents are open at once."""
+
+    global _pool, _pool_pid
+
+    with _pool_lock:
+
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ThreadPoolExecutor(max_workers=settings.INGEST_WORKERS, thread_name_prefix="ingest")
+            _pool_pid = os.getpid()
+
+        return _pool
+
+
+def current_ingest_pool():
+    return _pool if _pool_pid == os.getpid() else None
+
+
+async def _in_pool(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_ingest_pool(), fn, *args)
+
+
+async def open_document(upload):
+    """Spool an upload and detect its format; returns (file, format)."""
+
+    spooled = await spool_upload(upload)
+
+    try:
+        head = spooled.read(SNIFF_BYTES)
+        spooled.seek(0)
+
+        return spooled, detect_format(head, upload.filename, getattr(upload, "content_type", None))
+
+    except BaseException:
+        spooled.close()
+        raise
+
+
+async def extract_upload_text(upload):
+    """Whole text of an uploaded document (for batch analysis)."""
+
+    spooled, fmt = await open_document(upload)
+
+    with spooled:
+        return await _in_pool(lambda: "".join(iter_document_text(spooled, fmt)))
+
+
+def _extract_or_stream(spooled, fmt, filename, packs):
+    """Text of a short document, or the streamed result of a long one.
+
+    Runs as one ingestion pool task, so extractor state (e.g. an HTML
+    page's text blocks) only lives on one of ``INGEST_WORKERS`` threads.
+    """
+
+    from services.scoring_engine import analyze_compliance_stream
+
+    pieces = iter_document_text(spooled, fmt)
+    head, more = read_head(pieces, settings.STREAM_THRESHOLD_CHARS)
+
+    if not more:
+        return "".join(head), None
+
+    logger.info("Streaming %s upload %s into the scorer", fmt, filename)
+
+    return None, analyze_compliance_stream(itertools.chain(head, pieces), packs=packs)
+
+
+async def analyze_upload(upload, packs=None):
+    """Score an uploaded document without holding it in memory.
+
+    Short documents go through ``run_analysis_async`` like any other text
+    (result cache, process pool). Longer ones are extracted and scored
+    piece by piece on the ingestion pool with ``analyze_compliance_stream``.
+    """
+
+    from services.worker_pool import run_analysis_async
+
+    spooled, fmt = await open_document(upload)
+
+    with spooled:
+        text, result = await _in_pool(_extract_or_stream, spooled, fmt, upload.filename, packs)
+
+    if result is None:
+        result = await run_analysis_async(text, packs=packs)
+
+    return result
@@ -0,0 +1,176 @@
+import time
+import logging
+import threading
+
+import numpy as np
+
+from core.config import settings
+from services.embedding_cache import get_embedding_store
+from services.encoders import create_encoder, encoder_key
+from services.similarity import normalize_rows
+
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================
+# Strong Model (second tier)
+# ==============================
+_strong_model = None
+_strong_lock = threading.Lock()
+_clause_embeddings = {}
+
+
+def strong_key():
+    return encoder_key(settings.CASCADE_BACKEND, settings.CASCADE_MODEL_NAME)
+
+
+def get_strong_model():
+    """The second-tier encoder, loaded on the first borderline clause."""
+
+    global _strong_model
+
+    with _strong_lock:
+
+        if _strong_model is None:
+            start = time.perf_counter()
+            _strong_model = create_encoder(settings.CASCADE_BACKEND, settings.CASCADE_MODEL_NAME)
+            logger.info(
+                "Loaded cascade model %s (%s) in %.2fs",
+                settings.CASCADE_MODEL_NAME, settings.CASCADE_BACKEND, time.perf_counter() - start
+            )
+
+        return _strong_model
+
+
+def encode_strong(sentences):
+
+    model = get_strong_model()
+
+    def encode_fn(batch):
+        return model.encode(batch, batch_size=settings.INFERENCE_MAX_BATCH)
+
+    # Sentences escalated before are served from the strong model's cache
+    store = get_embedding_store(strong_key())
+
+    if store is None:
+        return encode_fn(sentences)
+
+    return store.encode(sentences, encode_fn)
+
+
+def strong_clause_embeddings(clause_index):
+    """Every clause of ``clause_index`` embedded with the strong model."""
+
+    key = (strong_key(), clause_index.clauses_hash)
+
+    with _strong_lock:
+        embeddings = _clause_embeddings.get(key)
+
+    if embeddings is None:
+        embeddings = normalize_rows(
+            get_strong_model().encode([clause["description"] for clause in clause_index.clauses])
+        )
+
+        with _strong_lock:
+            _clause_embeddings[key] = embeddings
+
+    return embeddings
+
+
+# ==============================
+# Escalation
+# ==============================
+def borderline_clauses(evidence, threshold, band, skip=None):
+    """Clauses whose best score (0-1) lies within ``band`` of ``threshold``."""
+
+    return [
+        c for c, matches in enumerate(evidence)
+        if matches and abs(matches[0][1] - threshold) <= band and not (skip is not None and skip[c])
+    ]
+
+
+def escalate(clause_index, evidence, top_k, skip=None):
+    """Re-score borderline clauses with the strong model.
+
+    ``evidence`` holds each clause's candidate (sentence, score) pairs from
+    the fast model, best first. Only the candidates of borderline clauses
+    are encoded again; every other clause keeps the fast model's verdict.
+    Returns the evidence cut to ``top_k`` and the escalated clause positions.
+    """
+
+    escalated = borderline_clauses(
+        evidence,
+        settings.SIMILARITY_THRESHOLD / 100,
+        settings.CASCADE_BAND / 100,
+        skip
+    )
+
+    rescored = 0
+
+    if escalated:
+        texts = list(dict.fromkeys(sentence for c in escalated for sentence, _ in evidence[c]))
+        rows = {sentence: row for row, sentence in enumerate(texts)}
+
+        sentence_embeddings = normalize_rows(encode_strong(texts))
+        clause_embeddings = strong_clause_embeddings(clause_index)
+
+        for c in escalated:
+            candidates = [sentence for sentence, _ in evidence[c]]
+            scores = sentence_embeddings[[rows[s] for s in candidates]] @ clause_embeddings[c]
+            order = np.argsort(-scores, kind="stable")
+
+            evidence[c] = [(candidates[j], float(scores[j])) for j in order]
+
+        rescored = len(texts)
+
+    return [matches[:top_k] for matches in evidence], escalated, rescored
+
+
+# ==============================
+# Tier Statistics
+# ==============================
+class CascadeStats:
+    """How many clauses each tier decided, and what the analyses cost."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.analyses = 0
+        self.clauses = 0
+        self.escalated = 0
+        self.sentences_rescored = 0
+        self.fast_seconds = 0.0
+        self.strong_seconds = 0.0
+
+    def record(self, clauses, escalated, rescored, fast_seconds, strong_seconds):
+
+        with self._lock:
+            self.analyses += 1
+            self.clauses += clauses
+            self.escalated += escalated
+            self.sentences_rescored += rescored
+            self.fast_seconds += fast_seconds
+            self.strong_seconds += strong_seconds
+
+    def stats(self):
+
+        with self._lock:
+            analyses = self.analyses or 1
+
+            return {
+                "fast_model": encoder_key(),
+                "strong_model": strong_key(),
+                "band": settings.CASCADE_BAND,
+                "analyses": self.analyses,
+                "clauses": self.clauses,
+                "decided_fast": self.clauses - self.escalated,
+                "decided_strong": self.escalated,
+                "escalation_rate": round(self.escalated / self.clauses, 4) if self.clauses else 0.0,
+                "sentences_rescored": self.sentences_rescored,
+                "average_fast_ms": round(self.fast_seconds * 1000 / analyses, 2),
+                "average_strong_ms": round(self.strong_seconds * 1000 / analyses, 2),
+                "average_total_ms": round((self.fast_seconds + self.strong_seconds) * 1000 / analyses, 2)
+            }
+
+
+cascade_stats = CascadeStats()
@@ -0,0 +1,120 @@
+import time
+import logging
+import threading
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================
+# Model State
+# ==============================
+_model = None
+_lock = threading.Lock()
+_warmup_thread = None
+
+_status = {
+    "state": "not_loaded",
+    "model_name": settings.MODEL_NAME,
+    "backend": settings.ENCODER_BACKEND,
+    "load_seconds": None,
+    "error": None
+}
+
+
+def model_status():
+    return dict(_status)
+
+
+def is_ready():
+    return _status["state"] == "ready"
+
+
+def mark_ready():
+
+    # Ready once the model and the clause index are both in memory
+    if _status["state"] == "loaded":
+        _status["state"] = "ready"
+
+
+# ==============================
+# Lazy Model Loading
+# ==============================
+def get_model():
+    """Load the configured encoder backend on first use.
+
+    torch and sentence-transformers are only imported here, so importing
+    the app stays cheap and health probes answer immediately.
+    """
+
+    global _model
+
+    if _model is not None:
+        return _model
+
+    with _lock:
+
+        if _model is not None:
+            return _model
+
+        _status.update(state="loading", error=None)
+        start = time.perf_counter()
+
+        try:
+            from services.encoders import create_encoder
+
+            _model = create_encoder()
+
+        except Exception as e:
+            _status.update(state="failed", error=str(e))
+            logger.exception("Failed to load model %s (%s)", settings.MODEL_NAME, settings.ENCODER_BACKEND)
+            raise
+
+        # The backend that actually runs (ONNX may fall back to torch)
+        _status.update(
+            state="loaded",
+            backend=getattr(_model, "backend", settings.ENCODER_BACKEND),
+            load_seconds=round(time.perf_counter() - start, 3)
+        )
+        logger.info(
+            "Loaded model %s (%s) in %.2fs",
+            settings.MODEL_NAME, _status["backend"], _status["load_seconds"]
+        )
+
+        return _model
+
+
+# ==============================
+# Background Warm-up
+# ==============================
+def warm_up():
+
+    # Imported here to avoid a cycle: scoring_engine uses get_model()
+    from services.scoring_engine import encode_sentences, load_clause_index
+
+    try:
+        get_model()
+        load_clause_index()
+
+        # First forward pass initializes tokenizer and thread pools
+        encode_sentences(["Warm-up sentence for the compliance model."])
+
+    except Exception as e:
+        _status.update(state="failed", error=str(e))
+        logger.exception("Model warm-up failed")
+
+
+def start_warmup():
+
+    global _warmup_thread
+
+    with _lock:
+        if _warmup_thread is not None:
+            return _warmup_thread
+
+        _warmup_thread = threading.Thread(target=warm_up, name="model-warmup", daemon=True)
+        _warmup_thread.start()
+
+        return _warmup_thread
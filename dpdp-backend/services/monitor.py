@@ -0,0 +1,180 @@
+import time
+import random
+import asyncio
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from services.crawler import FAILED, MODIFIED, fetch_policy_conditional, get_crawler
+from services.http_cache import get_http_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on one sleep, so newly added URLs are picked up promptly
+MAX_SLEEP_SECONDS = 60
+
+
+# ==============================
+# Monitored URL Re-scans
+# ==============================
+class PolicyMonitor:
+    """Re-scan a list of policy URLs every ``interval`` seconds (+/- jitter).
+
+    Each scan is a conditional GET. A 304 or a body with the same hash as
+    the last analyzed version skips analysis entirely; only pages that
+    actually changed are analyzed and stored.
+    """
+
+    def __init__(self, urls, interval: float = None, jitter: float = None, cache=None):
+        self.interval = interval or settings.MONITOR_INTERVAL_SECONDS
+        self.jitter = settings.MONITOR_JITTER if jitter is None else jitter
+        self.cache = cache or get_http_cache()
+
+        self._state = {}
+        self._task = None
+
+        for url in urls:
+            self.add(url)
+
+    def _delay(self):
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def add(self, url: str):
+
+        if url not in self._state:
+            self._state[url] = {
+                # Spread the first scans over the jitter window
+                "next_check": time.time() + random.uniform(0, self.jitter * self.interval),
+                "last_checked": None,
+                "last_status": None,
+                "last_changed": None,
+                "overall_score": None,
+                "checks": 0,
+                "analyses": 0,
+                "error": None
+            }
+
+    async def analyze(self, url: str, text: str):
+        """Analyze a changed policy and store the result; returns the score."""
+
+        from services.result_store import queue_compliance_result
+        from services.sentence_corpus import index_policy
+        from services.worker_pool import run_analysis_async
+
+        result = await run_analysis_async(text, website_url=url)
+
+        stored = await run_in_threadpool(queue_compliance_result, url, result)
+        index_policy(stored, url, text)
+
+        return result["overall_score"]
+
+    async def scan(self, url: str):
+
+        state = self._state[url]
+        state.update(last_checked=time.time(), checks=state["checks"] + 1)
+
+        try:
+            fetched = await fetch_policy_conditional(url, get_crawler(), self.cache)
+            state.update(last_status=fetched.status, error=fetched.error)
+
+            if fetched.status == MODIFIED:
+                state["overall_score"] = await self.analyze(url, fetched.text)
+                state["last_changed"] = state["last_checked"]
+                state["analyses"] += 1
+
+            # Cache only after a successful analysis, so a failed one is retried
+            if fetched.status != FAILED and self.cache:
+                self.cache.put(url, fetched.entry)
+
+        except Exception as e:
+            logger.exception("Monitored scan of %s failed", url)
+            state.update(last_status=FAILED, error=str(e))
+
+        logger.info("Monitored scan of %s: %s", url, state["last_status"])
+
+        return state["last_status"]
+
+    async def run_due(self):
+        """Scan every URL whose next check is due, concurrently."""
+
+        now = time.time()
+        due = [url for url, state in self._state.items() if state["next_check"] <= now]
+
+        for url in due:
+            self._state[url]["next_check"] = now + self._delay()
+
+        statuses = await asyncio.gather(*(self.scan(url) for url in due), return_exceptions=True)
+
+        for url, status in zip(due, statuses):
+            if isinstance(status, Exception):
+                logger.error("Monitored scan of %s raised", url, exc_info=status)
+
+        return statuses
+
+    async def _loop(self):
+
+        while True:
+            # One bad round must not stop monitoring for every URL
+            try:
+                await self.run_due()
+            except Exception:
+                logger.exception("Monitor round failed")
+
+            next_check = min((s["next_check"] for s in self._state.values()), default=None)
+            delay = MAX_SLEEP_SECONDS if next_check is None else next_check - time.time()
+
+            await asyncio.sleep(min(max(delay, 0), MAX_SLEEP_SECONDS))
+
+    def start(self):
+
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+        return self._task
+
+    async def stop(self):
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self):
+
+        return {
+            "interval_seconds": self.interval,
+            "jitter": self.jitter,
+            "urls": [dict(state, url=url) for url, state in self._state.items()]
+        }
+
+
+_monitor = None
+
+
+def start_monitor():
+
+    global _monitor
+
+    if _monitor is None and settings.MONITOR_URLS:
+        _monitor = PolicyMonitor(settings.MONITOR_URLS)
+        _monitor.start()
+
+    return _monitor
+
+
+async def stop_monitor():
+
+    global _monitor
+
+    if _monitor is not None:
+        await _monitor.stop()
+        _monitor = None
+
+
+def current_monitor():
+    return _monitor
@@ -1,22 +1,166 @@
+import re
+import json
+import threading
+from collections import deque
+
+from services.clause_index import CLAUSES_PATH, _clauses_hash
+
+
+# ==============================
+# Multi-keyword Matcher
+# ==============================
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str):
+
+    # "Opt-in", "opt in" and "OPT\nIN" all become ["opt", "in"]
+    return WORD.findall(text.lower())
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over every clause keyword at once.
+
+    ``keywords`` maps a label (clause title) to its keywords; a keyword may
+    be a phrase. The automaton steps over words rather than characters, so
+    text is scanned once whatever the number of keywords, and hits always
+    fall on word boundaries ("use" never fires inside "because").
+    """
+
+    def __init__(self, keywords: dict):
+
+        self.labels = list(keywords)
+
+        # goto[state] maps a word to the next state
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for label_index, label in enumerate(self.labels):
+            for keyword in keywords[label]:
+                self._add(tokenize(keyword), label_index)
+
+        self._link()
+
+    def _add(self, words, label_index):
+
+        if not words:
+            return
+
+        state = 0
+
+        for word in words:
+            next_state = self._goto[state].get(word)
+
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][word] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+
+            state = next_state
+
+        self._output[state].append((len(words), label_index))
+
+    def _link(self):
+
+        # Breadth-first, so a state's failure target is always finished first
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+
+                target = self._goto[fail].get(word, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, words):
+        """Yield ``(start, end, label)`` word spans for each keyword hit in a
+        tokenized text."""
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+
+        for position, word in enumerate(words):
+
+            while state and word not in goto[state]:
+                state = fail[state]
+
+            state = goto[state].get(word, 0)
+
+            for length, label_index in output[state]:
+                yield position + 1 - length, position + 1, self.labels[label_index]
+
+    def match(self, text: str):
+        """Labels with at least one keyword in ``text``."""
+
+        return {label for _, _, label in self.find(tokenize(text))}
+
+    def matches_any(self, text: str):
+
+        return next(self.find(tokenize(text)), None) is not None
+
+
+# ==============================
+# Clause Keywords
+# ==============================
+_lock = threading.Lock()
+_matchers = {}
+
+
+def get_keyword_matcher(clauses, clauses_hash: str):
+    """Matcher for the ``keywords`` of each clause, built once per clauses file."""
+
+    with _lock:
+
+        matcher = _matchers.get(clauses_hash)
+
+        if matcher is None:
+            matcher = KeywordMatcher({clause["title"]: clause.get("keywords", []) for clause in clauses})
+            _matchers[clauses_hash] = matcher
+
+        return matcher
+
+
+def load_keyword_matcher(clauses_path: str = CLAUSES_PATH):
+
+    clauses_hash = _clauses_hash(clauses_path)
+
+    with _lock:
+        matcher = _matchers.get(clauses_hash)
+
+    if matcher is not None:
+        return matcher
+
+    with open(clauses_path, "r", encoding="utf-8") as f:
+        clauses = json.load(f)
+
+    return get_keyword_matcher(clauses, clauses_hash)
+
+
 def analyze_text(text):
+    """Titles of the clauses whose keywords appear in ``text``, in clause order."""
 
-    text = text.lower()
+    matcher = load_keyword_matcher()
+    found = matcher.match(text)
 
-    clauses = {
-        "Data Collection Disclosure": ["collect", "data", "information"],
-        "User Consent Clause": ["consent", "permission", "agree"],
-        "Purpose Limitation": ["purpose", "use", "service"],
-        "Data Retention Policy": ["retain", "store", "retention"],
-        "User Data Deletion Rights": ["delete", "remove", "erase"]
-    }
+    return [label for label in matcher.labels if label in found]
 
-    detected = []
 
-    for clause, keywords in clauses.items():
+def candidate_sentences(sentences, matcher=None):
+    """Positions of the sentences that mention any clause keyword."""
 
-        for word in keywords:
-            if word in text:
-                detected.append(clause)
-                break
+    matcher = matcher or load_keyword_matcher()
 
-    return detected
\ No newline at end of file
+    return [
+        i for i, sentence in enumerate(sentences)
+        if matcher.matches_any(sentence)
+    ]
@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import hashlib
+import logging
+from collections import defaultdict, deque
+
+import numpy as np
+
+from core.config import settings
+from services.similarity import top_k_matches
+
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================
+# Stored Policy Version
+# ==============================
+class PolicyVersion:
+    """Sentences, embeddings and per-clause top-k of one analyzed policy."""
+
+    def __init__(self, website_url, model_name, clauses_hash, sentences, embeddings,
+                 indices, scores, analyzed_at=None):
+        self.website_url = website_url
+        self.model_name = model_name
+        self.clauses_hash = clauses_hash
+        self.sentences = sentences
+        self.embeddings = embeddings
+        self.indices = indices
+        self.scores = scores
+        self.analyzed_at = analyzed_at or time.time()
+
+    @classmethod
+    def load(cls, path):
+
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+
+            return cls(
+                meta["website_url"],
+                meta["model_name"],
+                meta["clauses_hash"],
+                meta["sentences"],
+                np.asarray(data["embeddings"], dtype=np.float32),
+                np.asarray(data["indices"], dtype=np.int64),
+                np.asarray(data["scores"], dtype=np.float32),
+                meta["analyzed_at"]
+            )
+
+    def save(self, path):
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        meta = json.dumps({
+            "website_url": self.website_url,
+            "model_name": self.model_name,
+            "clauses_hash": self.clauses_hash,
+            "sentences": self.sentences,
+            "analyzed_at": self.analyzed_at
+        })
+
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            embeddings=self.embeddings.astype(np.float16),
+            indices=self.indices,
+            scores=self.scores,
+            meta=np.array(meta)
+        )
+        os.replace(tmp_path, path)
+
+
+class PolicyVersionStore:
+    """Latest analyzed version per website URL, one .npz file each."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, website_url: str):
+        key = hashlib.sha1(website_url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, website_url: str):
+
+        path = self._path(website_url)
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            version = PolicyVersion.load(path)
+        except Exception as e:
+            logger.warning("Discarding unreadable policy version %s: %s", path, e)
+            return None
+
+        return version if version.website_url == website_url else None
+
+    def put(self, version: PolicyVersion):
+        version.save(self._path(version.website_url))
+
+
+_store = None
+
+
+def get_version_store():
+    """The shared store, or None when POLICY_VERSION_DIR is empty."""
+
+    global _store
+
+    if _store is None and settings.POLICY_VERSION_DIR:
+        _store = PolicyVersionStore(settings.POLICY_VERSION_DIR)
+
+    return _store
+
+
+# ==============================
+# Sentence Diff
+# ==============================
+def diff_sentences(old_sentences, new_sentences):
+    """Match new sentences to identical old ones, wherever they moved.
+
+    Returns ``old_to_new`` (new position per old sentence, -1 if removed)
+    and the positions of added sentences in the new list. Repeated
+    sentences are paired in order of appearance.
+    """
+
+    positions = defaultdict(deque)
+
+    for i, sentence in enumerate(old_sentences):
+        positions[sentence].append(i)
+
+    old_to_new = np.full(len(old_sentences), -1, dtype=np.int64)
+    added = []
+
+    for j, sentence in enumerate(new_sentences):
+        if positions[sentence]:
+            old_to_new[positions[sentence].popleft()] = j
+        else:
+            added.append(j)
+
+    return old_to_new, np.asarray(added, dtype=np.int64)
+
+
+# ==============================
+# Incremental Top-k
+# ==============================
+def update_top_k(clause_embeddings, previous, old_to_new, embeddings, added, k):
+    """Per-clause top-k for the new version without rescoring every sentence.
+
+    Clauses whose previous top-k all survived only need their old entries
+    compared with the added sentences. Clauses that lost a top-k sentence
+    are rescored against the whole new version.
+    """
+
+    k = max(1, min(k, embeddings.shape[0]))
+
+    remapped = old_to_new[previous.indices]
+    rescore = (remapped < 0).any(axis=1) | (previous.indices.shape[1] < k)
+
+    added_scores = clause_embeddings @ embeddings[added].T
+
+    candidates = np.concatenate(
+        [remapped, np.broadcast_to(added, added_scores.shape)], axis=1
+    )
+    candidate_scores = np.concatenate([previous.scores, added_scores], axis=1)
+
+    # Same tie-break as top_k_matches: lower position first
+    order = np.lexsort((candidates, -candidate_scores), axis=1)[:, :k]
+
+    indices = np.take_along_axis(candidates, order, axis=1)
+    scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+    if rescore.any():
+        indices[rescore], scores[rescore] = top_k_matches(
+            clause_embeddings[rescore], embeddings, k
+        )
+
+    return indices, scores
@@ -8,14 +8,16 @@ from reportlab.lib.units import inch
 from reportlab.lib.pagesizes import letter
 import os
 
+from services.chart_renderer import get_chart_renderer
 
-def generate_pdf_report(result: dict, website_url: str):
 
-    if not os.path.exists("reports"):
-        os.makedirs("reports")
+def generate_pdf_report(result: dict, website_url: str, file_path: str = "reports/dpdp_compliance_report.pdf"):
 
-    file_path = "reports/dpdp_compliance_report.pdf"
-    doc = SimpleDocTemplate(file_path, pagesize=letter)
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+
+    # Build into a temp file so a download never sees a half-written PDF
+    tmp_path = file_path + ".tmp"
+    doc = SimpleDocTemplate(tmp_path, pagesize=letter)
     elements = []
 
     styles = getSampleStyleSheet()
@@ -98,11 +100,15 @@ def generate_pdf_report(result: dict, website_url: str):
     elements.append(Spacer(1, 0.5 * inch))
 
     # ===== Graph =====
-    if os.path.exists(result["graph_path"]):
+    # Reuses the chart already rendered for this result, if any
+    if result.get("section_analysis"):
+        graph_path = get_chart_renderer().ensure(result["section_analysis"])
+
         elements.append(Paragraph("<b>Clause Similarity Graph</b>", styles["Heading2"]))
         elements.append(Spacer(1, 0.3 * inch))
-        elements.append(Image(result["graph_path"], width=5 * inch, height=3 * inch))
+        elements.append(Image(graph_path, width=5 * inch, height=3 * inch))
 
     doc.build(elements)
+    os.replace(tmp_path, file_path)
 
     return file_path
\ No newline at end of file
@@ -0,0 +1,158 @@
+import os
+import csv
+import json
+import logging
+from io import StringIO
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from models.report_history_model import ReportHistory
+
+
+logger = logging.getLogger(__name__)
+
+LEGACY_HISTORY_FILE = "reports/report_history.json"
+
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+CSV_FIELDS = ["filename", "score", "risk", "date"]
+
+
+def to_item(row):
+
+    return {
+        "id": row.id,
+        "filename": row.source,
+        "score": row.score,
+        "risk": row.risk,
+        "date": row.created_at.strftime(DATE_FORMAT)
+    }
+
+
+# ==============================
+# Writes
+# ==============================
+def build_report(source: str, result: dict):
+
+    return ReportHistory(
+        source=source,
+        score=result["overall_score"],
+        risk=result["risk_level"],
+        created_at=datetime.now()
+    )
+
+
+def save_report(db, source: str, result: dict):
+
+    row = build_report(source, result)
+
+    db.add(row)
+    db.commit()
+
+    return row
+
+
+def import_legacy_history(db, path: str = LEGACY_HISTORY_FILE):
+    """Move entries from the old JSON history file into the table once."""
+
+    if not os.path.exists(path):
+        return 0
+
+    if db.scalar(select(func.count()).select_from(ReportHistory)):
+        return 0
+
+    with open(path, "r") as f:
+        history = json.load(f)
+
+    rows = []
+
+    for entry in history:
+        try:
+            created_at = datetime.strptime(entry["date"], DATE_FORMAT)
+        except (KeyError, ValueError):
+            created_at = datetime.now()
+
+        rows.append(ReportHistory(
+            source=entry.get("filename", ""),
+            score=entry.get("score"),
+            risk=entry.get("risk"),
+            created_at=created_at
+        ))
+
+    db.add_all(rows)
+    db.commit()
+
+    os.replace(path, path + ".imported")
+    logger.info("Imported %d history entries from %s", len(rows), path)
+
+    return len(rows)
+
+
+# ==============================
+# Reads
+# ==============================
+def history_query(url=None, risk=None, date_from=None, date_to=None, before_id=None):
+
+    query = select(ReportHistory).order_by(ReportHistory.id.desc())
+
+    if url:
+        query = query.where(ReportHistory.source == url)
+
+    if risk:
+        query = query.where(ReportHistory.risk == risk)
+
+    if date_from:
+        query = query.where(ReportHistory.created_at >= date_from)
+
+    if date_to:
+        query = query.where(ReportHistory.created_at < date_to)
+
+    # Keyset pagination: continue below the last id already returned
+    if before_id:
+        query = query.where(ReportHistory.id < before_id)
+
+    return query
+
+
+def get_history_page(db, limit: int = None, **filters):
+    """One page of history, newest first, plus the cursor for the next page
+    (None on the last page). Without a ``limit`` every matching row is one
+    page."""
+
+    if limit is None:
+        return [to_item(row) for row in db.scalars(history_query(**filters))], None
+
+    rows = db.scalars(history_query(**filters).limit(limit + 1)).all()
+
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+
+    return [to_item(row) for row in rows[:limit]], next_cursor
+
+
+def iter_history_csv(session_factory, batch_size: int = 500, **filters):
+    """CSV lines for every matching entry, read through a server-side cursor."""
+
+    db = session_factory()
+
+    try:
+        buffer = StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction="ignore")
+
+        writer.writeheader()
+
+        rows = db.execute(
+            history_query(**filters).execution_options(yield_per=batch_size)
+        ).scalars()
+
+        for row in rows:
+            writer.writerow(to_item(row))
+
+            if buffer.tell() >= 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+    finally:
+        db.close()
@@ -0,0 +1,184 @@
+import os
+import re
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+REPORT_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class QueueFull(Exception):
+    pass
+
+
+# ==============================
+# Report Job
+# ==============================
+class ReportJob:
+
+    def __init__(self, report_id, website_url, path):
+        self.id = report_id
+        self.website_url = website_url
+        self.path = path
+        self.status = QUEUED
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.future = None
+
+    def to_dict(self):
+
+        return {
+            "report_id": self.id,
+            "website_url": self.website_url,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "download_endpoint": f"/download-report?report_id={self.id}"
+        }
+
+
+# ==============================
+# Bounded Report Queue
+# ==============================
+class ReportJobQueue:
+    """Renders PDF reports on a small thread pool, one file per report.
+
+    At most ``max_pending`` reports may be queued or rendering; further
+    submissions raise ``QueueFull``. The last ``history`` jobs are kept in
+    memory for status lookups; finished files stay downloadable by ID.
+    """
+
+    def __init__(self, directory, max_workers=2, max_pending=100, history=1000, render_fn=None):
+
+        if render_fn is None:
+            from services.report_generator import generate_pdf_report
+            render_fn = generate_pdf_report
+
+        self.directory = directory
+        self.max_pending = max_pending
+        self.history = history
+        self.render_fn = render_fn
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf-report")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._latest = None
+
+    def path_for(self, report_id: str):
+
+        # IDs come from URLs; only our own hex IDs map to a file
+        if not REPORT_ID.fullmatch(report_id or ""):
+            return None
+
+        return os.path.join(self.directory, f"{report_id}.pdf")
+
+    def submit(self, result: dict, website_url: str):
+
+        report_id = uuid.uuid4().hex
+        job = ReportJob(report_id, website_url, self.path_for(report_id))
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"{self._pending} reports already pending")
+
+            self._pending += 1
+
+        try:
+            job.future = self._executor.submit(self._render, job, result)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        # Published only once it has a future, so lookups can always wait on it
+        with self._lock:
+            self._jobs[report_id] = job
+            self._latest = job
+
+            while len(self._jobs) > self.history:
+                self._jobs.popitem(last=False)
+
+        return job
+
+    def get(self, report_id: str):
+
+        with self._lock:
+            return self._jobs.get(report_id)
+
+    def latest(self):
+        return self._latest
+
+    def _render(self, job, result):
+
+        job.status = RUNNING
+
+        try:
+            self.render_fn(result, job.website_url, job.path)
+            job.status = DONE
+
+        except Exception as e:
+            logger.exception("Report %s failed", job.id)
+            job.status = FAILED
+            job.error = str(e)
+
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._pending -= 1
+
+        return job
+
+    def stats(self):
+
+        with self._lock:
+            return {"pending": self._pending, "tracked_jobs": len(self._jobs)}
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+# ==============================
+# Process-wide Queue
+# ==============================
+_queue = None
+_queue_pid = None
+_queue_lock = threading.Lock()
+
+
+def get_report_queue():
+
+    global _queue, _queue_pid
+
+    with _queue_lock:
+
+        # Threads don't survive fork, so each process gets its own pool
+        if _queue is None or _queue_pid != os.getpid():
+            _queue = ReportJobQueue(
+                settings.REPORT_DIR,
+                max_workers=settings.REPORT_WORKERS,
+                max_pending=settings.REPORT_MAX_PENDING,
+                history=settings.REPORT_JOB_HISTORY
+            )
+            _queue_pid = os.getpid()
+
+        return _queue
+
+
+def current_report_queue():
+    return _queue if _queue_pid == os.getpid() else None
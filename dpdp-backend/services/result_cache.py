@@ -0,0 +1,266 @@
+import os
+import copy
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================
+# Cache Key
+# ==============================
+class KeyBuilder:
+    """Incremental form of ``make_key`` for sentences that arrive lazily."""
+
+    def __init__(self, model_name, threshold, clauses_hash, top_k, variant=""):
+        self._digest = hashlib.sha256()
+
+        for part in (model_name, repr(float(threshold)), clauses_hash, str(top_k)):
+            self._digest.update(part.encode("utf-8"))
+            self._digest.update(b"\0")
+
+        # Only non-default scoring variants extend the key, so existing entries stay valid
+        if variant:
+            self._digest.update(variant.encode("utf-8"))
+            self._digest.update(b"\0")
+
+    def add(self, sentence):
+        self._digest.update(sentence.encode("utf-8"))
+        self._digest.update(b"\n")
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+
+def make_key(sentences, model_name, threshold, clauses_hash, top_k, variant=""):
+    """Content address for one analysis.
+
+    ``sentences`` is the segmented policy text, so whitespace and fragments
+    the scorer ignores never cause a miss.
+    """
+
+    builder = KeyBuilder(model_name, threshold, clauses_hash, top_k, variant)
+
+    for sentence in sentences:
+        builder.add(sentence)
+
+    return builder.hexdigest()
+
+
+# ==============================
+# Two-tier Result Cache
+# ==============================
+class ResultCache:
+    """In-process LRU in front of an optional on-disk JSON tier."""
+
+    def __init__(self, max_entries=256, disk_dir="", max_disk_bytes=0, ttl_seconds=0):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    # ---------- public API ----------
+
+    def get(self, key):
+
+        with self._lock:
+            result = self._memory.get(key)
+
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return copy.deepcopy(result)
+
+        result = self._disk_get(key)
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._memory_put(key, result)
+
+        return copy.deepcopy(result)
+
+    def put(self, key, result):
+
+        # Both tiers off: skip the copy, which is costly for large catalogs
+        if self.max_entries <= 0 and not self.disk_dir:
+            return
+
+        result = copy.deepcopy(result)
+
+        with self._lock:
+            self._memory_put(key, result)
+
+        self._disk_put(key, result)
+
+    def clear(self):
+
+        with self._lock:
+            self._memory.clear()
+
+            for path, _, _ in self._disk_entries():
+                self._remove(path)
+
+            self._disk_bytes = 0
+
+    def stats(self):
+
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_enabled": bool(self.disk_dir),
+                "disk_bytes": self._disk_bytes,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0
+            }
+
+    # ---------- memory tier ----------
+
+    def _memory_put(self, key, result):
+
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # ---------- disk tier ----------
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _disk_entries(self):
+
+        entries = []
+
+        if not self.disk_dir:
+            return entries
+
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".json"):
+                continue
+
+            path = os.path.join(self.disk_dir, name)
+
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            entries.append((path, stat.st_size, stat.st_mtime))
+
+        return entries
+
+    def _remove(self, path):
+
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return 0
+
+        return size
+
+    def _disk_get(self, key):
+
+        if not self.disk_dir:
+            return None
+
+        path = self._path(key)
+
+        try:
+            mtime = os.path.getmtime(path)
+        except FileNotFoundError:
+            return None
+
+        if self.ttl_seconds and time.time() - mtime > self.ttl_seconds:
+            with self._lock:
+                self._disk_bytes -= self._remove(path)
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Dropping unreadable cache entry %s: %s", path, e)
+            with self._lock:
+                self._disk_bytes -= self._remove(path)
+            return None
+
+        # Refresh mtime so eviction approximates LRU
+        os.utime(path, None)
+
+        return result
+
+    def _disk_put(self, key, result):
+
+        if not self.disk_dir:
+            return
+
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+
+        size = os.path.getsize(tmp_path)
+
+        with self._lock:
+            self._disk_bytes -= self._remove(path)
+            os.replace(tmp_path, path)
+            self._disk_bytes += size
+
+            if self.max_disk_bytes and self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk(keep=path)
+
+    def _evict_disk(self, keep=None):
+
+        now = time.time()
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+
+        for path, size, mtime in entries:
+
+            if path == keep:
+                continue
+
+            expired = self.ttl_seconds and now - mtime > self.ttl_seconds
+
+            if not expired and self._disk_bytes <= self.max_disk_bytes:
+                continue
+
+            self._disk_bytes -= self._remove(path)
+
+
+result_cache = ResultCache(
+    max_entries=settings.RESULT_CACHE_SIZE,
+    disk_dir=settings.RESULT_CACHE_DIR,
+    max_disk_bytes=settings.RESULT_CACHE_MAX_BYTES,
+    ttl_seconds=settings.RESULT_CACHE_TTL
+)
@@ -0,0 +1,85 @@
+import json
+from datetime import datetime
+from concurrent.futures import Future
+
+from core.config import settings
+from models.compliance_model import ComplianceResult
+from services.write_behind import get_write_queue
+
+# Registers the flush hook that writes clause rows and rollups
+import services.analytics  # noqa: F401
+
+
+# ==============================
+# ComplianceResult Persistence
+# ==============================
+def build_record(website_url: str, result: dict):
+
+    return ComplianceResult(
+        website_url=website_url,
+        compliance_percentage=result["overall_score"],
+        risk_level=result["risk_level"],
+        section_analysis=json.dumps(result["section_analysis"]),
+        missing_clauses=json.dumps(result["missing_clauses"]),
+        created_at=datetime.utcnow()
+    )
+
+
+def save_compliance_result(db, website_url: str, result: dict):
+
+    record = build_record(website_url, result)
+
+    db.add(record)
+    db.commit()
+    db.refresh(record)
+
+    return record
+
+
+def save_compliance_results(db, items):
+    """Insert many (website_url, result) pairs in a single transaction
+    and return their ids."""
+
+    records = [build_record(website_url, result) for website_url, result in items]
+
+    if not records:
+        return []
+
+    db.add_all(records)
+    db.flush()
+
+    # Read ids before commit expires the instances
+    ids = [record.id for record in records]
+
+    db.commit()
+
+    return ids
+
+
+def queue_record(record):
+    """Insert ``record`` without waiting for the commit when write-behind is
+    enabled; returns a Future of its id either way."""
+
+    if settings.DB_WRITE_BEHIND:
+        return get_write_queue().submit(record)
+
+    from database.db import SessionLocal
+
+    future = Future()
+    db = SessionLocal()
+
+    try:
+        db.add(record)
+        db.commit()
+        future.set_result(record.id)
+    except Exception as e:
+        db.rollback()
+        future.set_exception(e)
+    finally:
+        db.close()
+
+    return future
+
+
+def queue_compliance_result(website_url: str, result: dict):
+    return queue_record(build_record(website_url, result))
@@ -1,20 +1,25 @@
-import matplotlib
-matplotlib.use("Agg")
-
-import os
 import json
+import time
+import random
+import logging
+
 import numpy as np
-import matplotlib.pyplot as plt
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from core.config import settings
+from services.clause_catalog import ClauseCatalog, get_catalog
+from services.clause_index import CLAUSES_PATH, get_clause_index
+from services.embedding_cache import get_embedding_store, stored_precision
+from services.encoders import encoder_key
+from services.inference_scheduler import get_scheduler
+from services.model_cascade import cascade_stats, escalate, strong_key
+from services.model_loader import get_model, mark_ready
+from services.nlp_analyzer import candidate_sentences, get_keyword_matcher
+from services.policy_versions import PolicyVersion, diff_sentences, get_version_store, update_top_k
+from services.result_cache import KeyBuilder, make_key, result_cache
+from services.similarity import RunningTopK, normalize_rows, top_k_matches
 
 
-# ==============================
-# Load Semantic Model
-# ==============================
-model = SentenceTransformer(settings.MODEL_NAME)
+logger = logging.getLogger(__name__)
 
 
 # ==============================
@@ -22,70 +27,704 @@ model = SentenceTransformer(settings.MODEL_NAME)
 # ==============================
 def load_clauses():
 
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    file_path = os.path.join(base_dir, "data", "dpdp_clauses.json")
-
-    with open(file_path, "r", encoding="utf-8") as f:
+    with open(CLAUSES_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
 # ==============================
-# AI Compliance Analysis
+# Clause Embedding Index
 # ==============================
-def analyze_compliance(policy_text: str):
+def load_clause_index():
 
-    clauses = load_clauses()
+    # Rebuilt automatically when the model, backend or clauses file changes
+    clause_index = get_clause_index(get_model(), encoder_key())
+    mark_ready()
 
-    results = {}
-    missing = []
-    total_score = 0
-    clause_names = []
-    clause_scores = []
-    explanations = []
+    return clause_index
 
-    sentences = [
+
+def load_catalog(packs):
+
+    # Each pack's embeddings are stored once per model, like the default index
+    catalog = get_catalog(get_model(), packs, encoder_key())
+    mark_ready()
+
+    return catalog
+
+
+def _index_for(packs):
+    return load_catalog(packs) if packs else load_clause_index()
+
+
+# ==============================
+# Sentence Embeddings
+# ==============================
+def _model_encode(sentences):
+    return get_model().encode(sentences, batch_size=settings.INFERENCE_MAX_BATCH)
+
+
+def encode_sentences(sentences):
+
+    # Concurrent requests share encode batches on the scheduler thread
+    if settings.INFERENCE_SCHEDULER:
+        encode_fn = get_scheduler(_model_encode).encode
+    else:
+        encode_fn = _model_encode
+
+    # Boilerplate shared across policies is only embedded once
+    store = get_embedding_store(encoder_key())
+
+    if store is None:
+        return stored_precision(encode_fn(sentences))
+
+    return store.encode(sentences, encode_fn)
+
+
+# ==============================
+# Sentence Segmentation
+# ==============================
+def split_sentences(policy_text: str):
+
+    return [
         s.strip()
         for s in policy_text.split(".")
         if len(s.strip()) > 20
     ]
 
+
+def iter_sentences(text_chunks):
+    """Lazily yield the same sentences as ``split_sentences``.
+
+    Accepts one string or any iterable of text pieces (e.g. decoded upload
+    chunks); a sentence may span several pieces.
+    """
+
+    if isinstance(text_chunks, str):
+        text_chunks = (text_chunks,)
+
+    carry = ""
+
+    for chunk in text_chunks:
+
+        buffer = carry + chunk
+        start = 0
+
+        while True:
+            end = buffer.find(".", start)
+            if end < 0:
+                break
+
+            sentence = buffer[start:end].strip()
+            if len(sentence) > 20:
+                yield sentence
+
+            start = end + 1
+
+        carry = buffer[start:]
+
+    sentence = carry.strip()
+    if len(sentence) > 20:
+        yield sentence
+
+
+def empty_result():
+
+    return {
+        "overall_score": 0,
+        "risk_level": "High Risk",
+        "section_analysis": {},
+        "missing_clauses": [],
+        "recommendations": [],
+        "graph_path": "",
+        "explanations": []
+    }
+
+
+# ==============================
+# AI Compliance Analysis
+# ==============================
+def analyze_compliance(policy_text: str, top_k: int = None, prefilter: bool = None, packs=None, cascade: bool = None):
+
+    top_k = top_k or settings.EVIDENCE_TOP_K
+
+    if prefilter is None:
+        prefilter = settings.KEYWORD_PREFILTER
+
+    if cascade is None:
+        cascade = settings.MODEL_CASCADE
+
+    # Very large documents go through the bounded-memory path, which keeps
+    # no candidate sentences: neither the prefilter nor the cascade applies
+    if len(policy_text) > settings.STREAM_THRESHOLD_CHARS:
+        if prefilter or cascade:
+            logger.info("Streaming a %d-character policy without prefilter or cascade", len(policy_text))
+        return analyze_compliance_stream(policy_text, top_k, packs=packs)
+
+    clause_index = _index_for(packs)
+
+    sentences = split_sentences(policy_text)
+
     if not sentences:
-        return {
-            "overall_score": 0,
-            "risk_level": "High Risk",
-            "section_analysis": {},
-            "missing_clauses": [],
-            "recommendations": [],
-            "graph_path": "",
-            "explanations": []
-        }
+        return empty_result()
+
+    cache_key = make_key(
+        sentences,
+        encoder_key(),
+        settings.SIMILARITY_THRESHOLD,
+        clause_index.clauses_hash,
+        top_k,
+        _variant(prefilter, cascade)
+    )
+
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if cascade:
+        result = score_cascade(clause_index, sentences, top_k, prefilter)
+
+    elif prefilter:
+        result = score_candidates(clause_index, sentences, top_k)
+
+    else:
+        # Encode and normalize policy sentences once
+        sentence_embeddings = normalize_rows(encode_sentences(sentences))
+
+        result = score_sentences(clause_index, sentences, sentence_embeddings, top_k)
+
+    result_cache.put(cache_key, result)
+
+    return result
+
+
+def _variant(prefilter, cascade):
+
+    parts = []
+
+    if prefilter:
+        parts.append("keyword-prefilter")
+
+    # Escalated scores depend on the strong model and the band
+    if cascade:
+        parts.append(f"cascade:{strong_key()}:{settings.CASCADE_BAND}:{settings.CASCADE_CANDIDATES}")
+
+    return "|".join(parts)
+
+
+def match_evidence(clause_index, sentences, sentence_embeddings, top_k):
+    """Each clause's ``top_k`` (sentence, score) pairs, best first."""
+
+    # One matrix product scores every clause against every sentence
+    indices, scores = top_k_matches(
+        clause_index.embeddings,
+        sentence_embeddings,
+        top_k
+    )
+
+    return [
+        [(sentences[j], float(score)) for j, score in zip(row_indices, row_scores)]
+        for row_indices, row_scores in zip(indices, scores)
+    ]
+
+
+def score_sentences(clause_index, sentences, sentence_embeddings, top_k):
+    return assemble_result(clause_index, match_evidence(clause_index, sentences, sentence_embeddings, top_k))
+
+
+# ==============================
+# Keyword Prefilter Cascade
+# ==============================
+def score_candidates(clause_index, sentences, top_k):
+    """Embed and score only the sentences that mention a clause keyword.
+
+    Scores can only go down compared with a full scan (a clause's best
+    match may have been pruned); ``result["prefilter"]`` reports how many
+    sentences were skipped and, for a sample of requests, the drift.
+    """
+
+    candidates = keyword_candidates(clause_index, sentences)
+
+    result = score_sentences(
+        clause_index,
+        candidates,
+        normalize_rows(encode_sentences(candidates)),
+        top_k
+    )
+
+    return report_prefilter(clause_index, sentences, candidates, result, top_k)
+
+
+def report_prefilter(clause_index, sentences, candidates, result, top_k):
+    """Add the ``prefilter`` counts (and, when sampled, the drift) to ``result``."""
+
+    result["prefilter"] = {
+        "sentences": len(sentences),
+        "candidates": len(candidates),
+        "pruned": len(sentences) - len(candidates)
+    }
+
+    if settings.KEYWORD_PREFILTER_AUDIT_RATE > random.random():
+        full = score_sentences(clause_index, sentences, normalize_rows(encode_sentences(sentences)), top_k)
+        result["prefilter"]["drift"] = prefilter_drift(full, result)
+
+        logger.info("Keyword prefilter drift: %s", result["prefilter"]["drift"])
+
+    return result
+
+
+def keyword_candidates(clause_index, sentences):
+
+    matcher = get_keyword_matcher(clause_index.clauses, clause_index.clauses_hash)
+    keep = candidate_sentences(sentences, matcher)
+
+    # No keyword anywhere: nothing to go on, so scan everything
+    return [sentences[i] for i in keep] if keep else sentences
+
+
+def prefilter_drift(full: dict, pruned: dict):
+    """How far prefiltered clause scores moved from a full scan."""
+
+    deltas = {
+        title: round(details["similarity_score"] - pruned["section_analysis"][title]["similarity_score"], 2)
+        for title, details in full["section_analysis"].items()
+    }
+
+    return {
+        "overall_score": round(full["overall_score"] - pruned["overall_score"], 2),
+        "max_clause": max(deltas.values(), default=0.0),
+        "mean_clause": round(sum(deltas.values()) / len(deltas), 2) if deltas else 0.0,
+        "clauses": deltas,
+        "status_changed": [
+            title for title, details in full["section_analysis"].items()
+            if details["status"] != pruned["section_analysis"][title]["status"]
+        ]
+    }
+
+
+def compare_prefilter(policy_text: str, top_k: int = None, packs=None):
+    """Pruning and drift of the keyword cascade for one policy."""
+
+    full = analyze_compliance(policy_text, top_k, prefilter=False, packs=packs)
+    pruned = analyze_compliance(policy_text, top_k, prefilter=True, packs=packs)
+
+    return {
+        **pruned.get("prefilter", {}),
+        "drift": prefilter_drift(full, pruned)
+    }
+
+
+# ==============================
+# Tiered Model Cascade
+# ==============================
+def score_cascade(clause_index, sentences, top_k, prefilter=False):
+    """Score with the configured (fast) encoder, then let the strong model
+    decide only the clauses near the threshold.
+
+    The fast model keeps ``CASCADE_CANDIDATES`` sentences per clause; a
+    clause whose best score is within ``CASCADE_BAND`` points of
+    ``SIMILARITY_THRESHOLD`` has just those sentences re-scored by the
+    strong model. ``result["cascade"]`` reports what each tier decided.
+    """
+
+    start = time.perf_counter()
+
+    candidates = keyword_candidates(clause_index, sentences) if prefilter else sentences
+
+    return cascade_result(
+        clause_index, candidates, normalize_rows(encode_sentences(candidates)), top_k, start
+    )
+
+
+def cascade_result(clause_index, sentences, sentence_embeddings, top_k, start=None):
+    """The cascade over sentences already embedded by the fast model."""
+
+    start = start or time.perf_counter()
+
+    evidence = match_evidence(
+        clause_index,
+        sentences,
+        sentence_embeddings,
+        max(top_k, settings.CASCADE_CANDIDATES)
+    )
+
+    fast_done = time.perf_counter()
+
+    # A parent's score is the mean of its children: only leaves decide
+    skip = None
+    if isinstance(clause_index, ClauseCatalog):
+        skip = np.bincount(clause_index.parents[clause_index.parents >= 0], minlength=len(evidence)) > 0
+
+    evidence, escalated, rescored = escalate(clause_index, evidence, top_k, skip)
+
+    strong_done = time.perf_counter()
+
+    result = assemble_result(clause_index, evidence)
+
+    result["cascade"] = {
+        "fast_model": encoder_key(),
+        "strong_model": strong_key(),
+        "band": settings.CASCADE_BAND,
+        "clauses": len(evidence),
+        "decided_fast": len(evidence) - len(escalated),
+        "decided_strong": len(escalated),
+        "escalated_clauses": [clause_index.clauses[c]["title"] for c in escalated],
+        "sentences_rescored": rescored,
+        "fast_ms": round((fast_done - start) * 1000, 2),
+        "strong_ms": round((strong_done - fast_done) * 1000, 2),
+        "total_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+
+    cascade_stats.record(len(evidence), len(escalated), rescored, fast_done - start, strong_done - fast_done)
+
+    return result
+
+
+# ==============================
+# Batch Analysis
+# ==============================
+def analyze_many(policy_texts, top_k: int = None, packs=None, prefilter: bool = None, cascade: bool = None):
+    """Analyze several policies, encoding all their sentences together.
+
+    Cached policies are answered from the result cache; the rest share
+    one de-duplicated encode call before being scored one by one. With
+    the keyword prefilter on, only each policy's candidate sentences go
+    into that call; with the model cascade on, each policy's borderline
+    clauses are then escalated as in ``analyze_compliance``.
+    """
+
+    top_k = top_k or settings.EVIDENCE_TOP_K
+
+    if prefilter is None:
+        prefilter = settings.KEYWORD_PREFILTER
+
+    if cascade is None:
+        cascade = settings.MODEL_CASCADE
+
+    clause_index = _index_for(packs)
+
+    results = [None] * len(policy_texts)
+    pending = []
+
+    for i, policy_text in enumerate(policy_texts):
+
+        if len(policy_text) > settings.STREAM_THRESHOLD_CHARS:
+            results[i] = analyze_compliance_stream(policy_text, top_k, packs=packs)
+            continue
+
+        sentences = split_sentences(policy_text)
+
+        if not sentences:
+            results[i] = empty_result()
+            continue
+
+        cache_key = make_key(
+            sentences,
+            encoder_key(),
+            settings.SIMILARITY_THRESHOLD,
+            clause_index.clauses_hash,
+            top_k,
+            _variant(prefilter, cascade)
+        )
 
-    # Encode policy sentences
-    sentence_embeddings = model.encode(sentences)
+        cached = result_cache.get(cache_key)
 
-    for clause in clauses:
+        if cached is not None:
+            results[i] = cached
+        else:
+            scored = keyword_candidates(clause_index, sentences) if prefilter else sentences
+            pending.append((i, sentences, scored, cache_key))
+
+    if not pending:
+        return results
+
+    unique = list(dict.fromkeys(s for _, _, scored, _ in pending for s in scored))
+    rows = {sentence: row for row, sentence in enumerate(unique)}
+
+    embeddings = normalize_rows(encode_sentences(unique))
+
+    for i, sentences, scored, cache_key in pending:
+
+        sentence_embeddings = embeddings[[rows[s] for s in scored]]
+
+        if cascade:
+            results[i] = cascade_result(clause_index, scored, sentence_embeddings, top_k)
+
+        else:
+            results[i] = score_sentences(clause_index, scored, sentence_embeddings, top_k)
+
+            if prefilter:
+                report_prefilter(clause_index, sentences, scored, results[i], top_k)
+
+        result_cache.put(cache_key, results[i])
+
+    return results
+
+
+# ==============================
+# Incremental Re-scoring
+# ==============================
+def _round_embeddings(embeddings):
+
+    # Stored versions keep float16; score with the same precision every time
+    return normalize_rows(embeddings).astype(np.float16).astype(np.float32)
+
+
+def analyze_policy_version(website_url: str, policy_text: str, top_k: int = None, packs=None):
+    """Analyze a new version of a website's policy, reusing the last one.
+
+    Sentences already seen in the previous version keep their stored
+    embeddings; only added or edited sentences are encoded. The response
+    gains ``version_changes`` listing the clause scores that moved and the
+    sentences responsible.
+
+    Results are cached under their own variant, since stored embeddings
+    are float16. A hit is only used when the URL has no stored version or
+    the text is unchanged: for a changed text it would leave the store one
+    version behind and report no moved clauses, so that case is scored
+    incrementally instead.
+    """
+
+    top_k = top_k or settings.EVIDENCE_TOP_K
+    store = get_version_store()
+
+    # Stored versions hold every sentence's embedding, and the cascade
+    # re-scores from sentences: neither fits the incremental path
+    incremental = not (settings.MODEL_CASCADE or settings.KEYWORD_PREFILTER)
+
+    if store is None or not incremental or len(policy_text) > settings.STREAM_THRESHOLD_CHARS:
+        return analyze_compliance(policy_text, top_k, packs=packs)
+
+    clause_index = _index_for(packs)
+    sentences = split_sentences(policy_text)
+
+    if not sentences:
+        return empty_result()
+
+    previous = store.get(website_url)
+
+    if previous is not None and previous.model_name != encoder_key():
+        previous = None
+
+    cache_key = make_key(
+        sentences,
+        encoder_key(),
+        settings.SIMILARITY_THRESHOLD,
+        clause_index.clauses_hash,
+        top_k,
+        "float16"
+    )
+
+    if previous is None or previous.sentences == sentences:
+        cached = result_cache.get(cache_key)
+
+        if cached is not None:
+            # Nothing is encoded, so nothing new is stored for the next diff
+            cached["version_changes"] = {
+                "previous_analyzed_at": previous.analyzed_at if previous is not None else None,
+                "sentences_total": len(sentences),
+                "sentences_added": 0 if previous is not None else len(sentences),
+                "sentences_removed": 0,
+                "sentences_encoded": 0,
+                "clauses_moved": []
+            }
+            return cached
+
+    if previous is None:
+        old_to_new = np.zeros(0, dtype=np.int64)
+        added = np.arange(len(sentences))
+    else:
+        old_to_new, added = diff_sentences(previous.sentences, sentences)
+
+    dim = clause_index.embeddings.shape[1]
+    embeddings = np.zeros((len(sentences), dim), dtype=np.float32)
+
+    if previous is not None:
+        kept = old_to_new >= 0
+        embeddings[old_to_new[kept]] = previous.embeddings[kept]
+
+    if len(added):
+        embeddings[added] = _round_embeddings(encode_sentences([sentences[j] for j in added]))
+
+    comparable = previous is not None and previous.clauses_hash == clause_index.clauses_hash
+
+    if comparable:
+        indices, scores = update_top_k(
+            clause_index.embeddings, previous, old_to_new, embeddings, added, top_k
+        )
+    else:
+        indices, scores = top_k_matches(clause_index.embeddings, embeddings, top_k)
+
+    evidence = [
+        [(sentences[j], float(score)) for j, score in zip(row_indices, row_scores)]
+        for row_indices, row_scores in zip(indices, scores)
+    ]
+
+    result = assemble_result(clause_index, evidence)
+    result_cache.put(cache_key, result)
+
+    result["version_changes"] = {
+        "previous_analyzed_at": previous.analyzed_at if previous is not None else None,
+        "sentences_total": len(sentences),
+        "sentences_added": int(len(added)),
+        "sentences_removed": int((old_to_new < 0).sum()),
+        "sentences_encoded": int(len(added)),
+        "clauses_moved": _moved_clauses(
+            clause_index.clauses, previous, old_to_new, sentences, added, indices, scores
+        ) if comparable else []
+    }
+
+    store.put(PolicyVersion(
+        website_url, encoder_key(), clause_index.clauses_hash,
+        sentences, embeddings, indices, scores
+    ))
+
+    return result
+
+
+def _moved_clauses(clauses, previous, old_to_new, sentences, added, indices, scores):
+
+    added = set(added.tolist())
+    moved = []
+
+    for c, clause in enumerate(clauses):
+
+        before = round(float(previous.scores[c, 0]) * 100, 2)
+        after = round(float(scores[c, 0]) * 100, 2)
+
+        if before == after:
+            continue
+
+        moved.append({
+            "clause_title": clause["title"],
+            "previous_score": before,
+            "score": after,
+            "delta": round(after - before, 2),
+            "added_sentences": [
+                sentences[j] for j in indices[c].tolist() if j in added
+            ],
+            "removed_sentences": [
+                previous.sentences[i] for i in previous.indices[c].tolist()
+                if old_to_new[i] < 0
+            ]
+        })
+
+    return moved
+
+
+# ==============================
+# Streaming Analysis
+# ==============================
+def _chunks(sentences, size):
+
+    chunk = []
+
+    for sentence in sentences:
+        chunk.append(sentence)
+
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def analyze_compliance_stream(text_chunks, top_k: int = None, chunk_size: int = None, packs=None):
+    """Same result as ``analyze_compliance`` with flat peak memory.
+
+    Sentences are segmented lazily and encoded ``chunk_size`` at a time;
+    only a running top-k (scores, positions and the few sentences they
+    point at) is kept per clause.
+    """
+
+    top_k = top_k or settings.EVIDENCE_TOP_K
+    chunk_size = chunk_size or settings.STREAM_CHUNK_SENTENCES
+
+    clause_index = _index_for(packs)
+
+    def key_builder():
+        return KeyBuilder(
+            encoder_key(),
+            settings.SIMILARITY_THRESHOLD,
+            clause_index.clauses_hash,
+            top_k
+        )
+
+    # A string can be read twice: hash it first so repeats skip encoding
+    if isinstance(text_chunks, str):
+        builder = key_builder()
+        for sentence in iter_sentences(text_chunks):
+            builder.add(sentence)
+
+        cached = result_cache.get(builder.hexdigest())
+        if cached is not None:
+            return cached
+
+    builder = key_builder()
+    running = RunningTopK(len(clause_index.clauses), top_k)
+    kept = {}
+    offset = 0
+
+    for chunk in _chunks(iter_sentences(text_chunks), chunk_size):
+
+        for sentence in chunk:
+            builder.add(sentence)
+
+        running.update(
+            clause_index.embeddings,
+            normalize_rows(encode_sentences(chunk)),
+            offset
+        )
+
+        # Hold on to the text of current top-k sentences only
+        referenced = running.referenced()
+        kept = {i: kept[i] for i in referenced if i in kept}
+        kept.update(
+            (offset + j, sentence)
+            for j, sentence in enumerate(chunk)
+            if offset + j in referenced
+        )
+
+        offset += len(chunk)
+
+    if offset == 0:
+        return empty_result()
+
+    evidence = [
+        [(kept[int(j)], float(score)) for j, score in zip(row_indices, row_scores)]
+        for row_indices, row_scores in zip(running.indices, running.scores)
+    ]
+
+    result = assemble_result(clause_index, evidence)
+
+    result_cache.put(builder.hexdigest(), result)
+
+    return result
+
+
+# ==============================
+# Result Assembly
+# ==============================
+def build_result(clauses, evidence):
+    """Turn per-clause evidence lists of (sentence, cosine score), best
+    first, into the API response."""
+
+    results = {}
+    missing = []
+    total_score = 0
+    explanations = []
+
+    for clause, matches in zip(clauses, evidence):
 
         clause_title = clause["title"]
-        clause_text = clause["description"]
         clause_section = clause["section"]
         clause_category = clause["category"]
 
-        clause_embedding = model.encode([clause_text])
+        best_sentence, best_similarity = matches[0]
 
-        similarities = cosine_similarity(
-            clause_embedding,
-            sentence_embeddings
-        )[0]
-
-        best_index = int(np.argmax(similarities))
-        best_sentence = sentences[best_index]
-
-        similarity_score = float(similarities[best_index]) * 100
+        similarity_score = best_similarity * 100
         final_score = round(similarity_score, 2)
 
-        clause_names.append(clause_title)
-        clause_scores.append(final_score)
-
         total_score += final_score
 
         explanations.append({
@@ -93,7 +732,14 @@ def analyze_compliance(policy_text: str):
             "section": clause_section,
             "category": clause_category,
             "policy_sentence": best_sentence,
-            "similarity_score": final_score
+            "similarity_score": final_score,
+            "evidence": [
+                {
+                    "policy_sentence": sentence,
+                    "similarity_score": round(score * 100, 2)
+                }
+                for sentence, score in matches
+            ]
         })
 
         if final_score >= settings.SIMILARITY_THRESHOLD:
@@ -118,55 +764,175 @@ def analyze_compliance(policy_text: str):
 
     overall_score = round(total_score / len(clauses), 2)
 
-    # ==============================
-    # Risk Classification
-    # ==============================
-    if overall_score >= 75:
-        risk = "Low Risk"
-    elif overall_score >= 45:
-        risk = "Medium Risk"
-    else:
-        risk = "High Risk"
-
-    # ==============================
-    # Generate Recommendations
-    # ==============================
-    recommendations = []
-
-    if missing:
-        for clause in missing:
-            recommendations.append(
-                f"The privacy policy should include a section for '{clause}' to improve DPDP compliance."
-            )
-    else:
-        recommendations.append(
-            "The privacy policy appears well aligned with DPDP Act 2023 requirements."
-        )
+    return {
+        "overall_score": overall_score,
+        "risk_level": risk_level(overall_score),
+        "section_analysis": results,
+        "missing_clauses": missing,
+        "recommendations": recommendations_for(missing),
+        "graph_path": "",
+        "explanations": explanations
+    }
+
+
+# ==============================
+# Risk Classification
+# ==============================
+def risk_level(score):
+
+    if score >= 75:
+        return "Low Risk"
+    elif score >= 45:
+        return "Medium Risk"
+
+    return "High Risk"
+
 
-    # ==============================
-    # Generate Compliance Graph
-    # ==============================
-    if not os.path.exists("reports"):
-        os.makedirs("reports")
+# ==============================
+# Generate Recommendations
+# ==============================
+def recommendations_for(missing, regulation: str = None):
+
+    if not missing:
+        return [f"The privacy policy appears well aligned with {regulation or 'DPDP Act 2023'} requirements."]
+
+    return [
+        f"The privacy policy should include a section for '{clause}' to improve {regulation or 'DPDP'} compliance."
+        for clause in missing
+    ]
+
+
+# ==============================
+# Clause Catalog Results
+# ==============================
+def assemble_result(clause_index, evidence):
 
-    graph_path = "reports/compliance_chart.png"
+    if isinstance(clause_index, ClauseCatalog):
+        return build_catalog_result(clause_index, evidence)
 
-    plt.figure(figsize=(10, 5))
-    plt.bar(clause_names, clause_scores)
-    plt.xlabel("DPDP Clauses")
-    plt.ylabel("Similarity Score (%)")
-    plt.title("DPDP Compliance Clause Analysis")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(graph_path)
-    plt.close()
+    return build_result(clause_index.clauses, evidence)
+
+
+def _evidence_items(matches):
+
+    return [
+        {"policy_sentence": sentence, "similarity_score": round(score * 100, 2)}
+        for sentence, score in matches
+    ]
+
+
+def build_catalog_result(catalog, evidence):
+    """The API response for several clause packs.
+
+    Sub-clause scores roll up into their parents (mean of the children),
+    top-level clauses into section, category and pack scores. The usual
+    top-level fields describe the top-level clauses of every selected
+    pack; ``packs`` holds the full hierarchy.
+    """
+
+    best = np.array([matches[0][1] * 100 for matches in evidence])
+    scores = np.round(catalog.rollup(best), 2)
+    matched = scores >= settings.SIMILARITY_THRESHOLD
+
+    children = catalog.children()
+    clauses = catalog.clauses
+
+    def node_result(i):
+
+        clause = clauses[i]
+
+        return {
+            "clause_id": clause.get("clause_id"),
+            "title": clause["title"],
+            "section": clause["section"],
+            "category": clause["category"],
+            "similarity_score": float(scores[i]),
+            "status": "Matched" if matched[i] else "Missing",
+            "evidence": _evidence_items(evidence[i]),
+            "requirements": [node_result(child) for child in children[i]]
+        }
+
+    def rollup_by(roots, field):
+
+        groups = {}
+
+        for i in roots:
+            group = groups.setdefault(clauses[i][field], {"scores": [], "missing": 0})
+            group["scores"].append(float(scores[i]))
+            group["missing"] += 0 if matched[i] else 1
+
+        return {
+            name: {
+                "score": round(sum(group["scores"]) / len(group["scores"]), 2),
+                "clauses": len(group["scores"]),
+                "missing": group["missing"]
+            }
+            for name, group in groups.items()
+        }
+
+    packs = []
+    section_analysis = {}
+    missing = []
+    explanations = []
+
+    # Titles only need the pack in front when several packs are scored
+    prefix = len(catalog.packs) > 1
+
+    for p, pack in enumerate(catalog.packs):
+
+        roots = catalog.roots[catalog.pack_of[catalog.roots] == p]
+        pack_score = round(float(scores[roots].mean()), 2)
+        pack_missing = []
+
+        for i in roots:
+
+            clause = clauses[i]
+            title = f"{pack.pack_id}: {clause['title']}" if prefix else clause["title"]
+
+            section_analysis[title] = {
+                "section": clause["section"],
+                "category": clause["category"],
+                "similarity_score": float(scores[i]),
+                "status": "Matched" if matched[i] else "Missing",
+                "pack": pack.spec
+            }
+
+            explanations.append({
+                "clause_title": title,
+                "section": clause["section"],
+                "category": clause["category"],
+                "policy_sentence": evidence[i][0][0],
+                "similarity_score": float(scores[i]),
+                "evidence": _evidence_items(evidence[i])
+            })
+
+            if not matched[i]:
+                pack_missing.append(title)
+
+        missing += pack_missing
+
+        packs.append({
+            "pack_id": pack.pack_id,
+            "version": pack.version,
+            "title": pack.title,
+            "score": pack_score,
+            "risk_level": risk_level(pack_score),
+            "missing_clauses": pack_missing,
+            "sections": rollup_by(roots, "section"),
+            "categories": rollup_by(roots, "category"),
+            "clauses": [node_result(i) for i in roots]
+        })
+
+    overall_score = round(float(scores[catalog.roots].mean()), 2)
+    regulation = ", ".join(dict.fromkeys(pack.regulation for pack in catalog.packs))
 
     return {
         "overall_score": overall_score,
-        "risk_level": risk,
-        "section_analysis": results,
+        "risk_level": risk_level(overall_score),
+        "section_analysis": section_analysis,
         "missing_clauses": missing,
-        "recommendations": recommendations,
-        "graph_path": graph_path,
-        "explanations": explanations
-    }
\ No newline at end of file
+        "recommendations": recommendations_for(missing, regulation),
+        "graph_path": "",
+        "explanations": explanations,
+        "packs": packs
+    }
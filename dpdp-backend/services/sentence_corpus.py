@@ -0,0 +1,627 @@
+import os
+import json
+import math
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+DTYPES = ("int8", "float16")
+
+
+# ==============================
+# Compact Row Encoding
+# ==============================
+def quantize(embeddings, dtype: str):
+
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+
+    if dtype == "int8":
+        # Rows are unit length, so every component already lies in [-1, 1]
+        return np.clip(np.rint(embeddings * 127), -127, 127).astype(np.int8)
+
+    return embeddings.astype(np.float16)
+
+
+def dequantize(rows, dtype: str):
+
+    rows = np.asarray(rows, dtype=np.float32)
+
+    return rows / 127 if dtype == "int8" else rows
+
+
+def score_rows(rows, query, dtype: str):
+    """Dot products of stored rows with a float32 query; int8 rows are
+    scaled through the query instead of dequantizing every row."""
+
+    if dtype == "int8":
+        query = query / 127
+
+    return rows.astype(np.float32) @ query
+
+
+def top_rows(rows, scores, k):
+    """The ``k`` best (row, score) pairs, best first."""
+
+    if len(scores) > k:
+        best = np.argpartition(-scores, k - 1)[:k]
+        rows, scores = rows[best], scores[best]
+
+    order = np.argsort(-scores, kind="stable")
+
+    return rows[order], scores[order]
+
+
+# ==============================
+# IVF Index
+# ==============================
+class IVFIndex:
+    """Inverted-file ANN index: rows are bucketed by their nearest centroid
+    and a query only scores the rows of its ``nprobe`` closest buckets.
+
+    Buckets are stored CSR-style: ``order`` lists row numbers grouped by
+    bucket and ``bounds[b]:bounds[b + 1]`` is bucket ``b``'s slice.
+    """
+
+    def __init__(self, centroids, order, bounds, indexed_rows):
+        self.centroids = centroids
+        self.order = order
+        self.bounds = bounds
+        self.indexed_rows = indexed_rows
+
+    @classmethod
+    def train(cls, rows, dtype, nlist, iterations=8, sample_size=None, chunk_size=65536, seed=0):
+        """Spherical k-means on a sample of ``rows``, then assign every row."""
+
+        rng = np.random.default_rng(seed)
+        n = len(rows)
+        nlist = max(1, min(nlist, n))
+        sample_size = min(n, sample_size or 64 * nlist)
+
+        sample_ids = np.sort(rng.choice(n, size=sample_size, replace=False))
+        sample = _normalize(dequantize(rows[sample_ids], dtype))
+
+        centroids = sample[rng.choice(sample_size, size=nlist, replace=False)]
+
+        for _ in range(iterations):
+            assign = _nearest(sample, centroids, chunk_size)
+
+            # Per-bucket sums via one sort and a segmented reduction
+            order = np.argsort(assign, kind="stable")
+            counts = np.bincount(assign, minlength=nlist)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+            sums = np.zeros_like(centroids)
+            filled = counts > 0
+            sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+
+            # Re-seed empty buckets from random sample rows
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+
+            centroids = _normalize(sums)
+
+        assign = np.concatenate([
+            _nearest(dequantize(rows[start:start + chunk_size], dtype), centroids, chunk_size)
+            for start in range(0, n, chunk_size)
+        ])
+
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+
+        return cls(centroids, order.astype(np.int64), bounds.astype(np.int64), n)
+
+    def candidates(self, query, nprobe):
+
+        scores = self.centroids @ query
+        nprobe = max(1, min(nprobe, len(scores)))
+        buckets = np.argpartition(-scores, nprobe - 1)[:nprobe]
+
+        return np.concatenate([self.order[self.bounds[b]:self.bounds[b + 1]] for b in buckets])
+
+    @classmethod
+    def load(cls, path):
+
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["centroids"], data["order"], data["bounds"], int(data["indexed_rows"])
+            )
+
+    def save(self, path):
+
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            centroids=self.centroids,
+            order=self.order,
+            bounds=self.bounds,
+            indexed_rows=np.array(self.indexed_rows)
+        )
+        os.replace(tmp_path, path)
+
+
+def _normalize(matrix):
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+
+    return (matrix / norms).astype(np.float32)
+
+
+def _nearest(vectors, centroids, chunk_size):
+
+    return np.concatenate([
+        np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), chunk_size)
+    ]) if len(vectors) else np.zeros(0, dtype=np.int64)
+
+
+# ==============================
+# Sentence Corpus
+# ==============================
+class SentenceCorpus:
+    """Every analyzed sentence, embedded, in append-only memory-mapped files.
+
+    ``vectors.bin`` holds one quantized row per sentence, ``text.bin`` the
+    sentences themselves (``text_ends.bin`` marks where each one ends) and
+    ``results.bin`` one (ComplianceResult id, first row) pair per analysis.
+    Counts are published in ``meta.json`` after the data is written, so a
+    crashed process only loses the append in flight; the maps are synced
+    to disk by ``flush``. One process writes; searches may run
+    concurrently with appends.
+    """
+
+    def __init__(self, directory, model_name, dtype="int8"):
+
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown CORPUS_DTYPE '{dtype}', expected one of {DTYPES}")
+
+        self.directory = directory
+        self.model_name = model_name
+        self.dtype = dtype
+
+        self.dim = None
+        self.rows = 0
+        self.results = 0
+        self.text_bytes = 0
+        self.capacity = 0
+        self.result_capacity = 0
+
+        self._lock = threading.Lock()
+        self._index = None
+
+        self._vectors = None
+        self._text_ends = None
+        self._result_table = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._open_existing()
+
+    # ---------- storage ----------
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _open_existing(self):
+
+        if not os.path.exists(self._path("meta.json")):
+            return
+
+        with open(self._path("meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if meta["model_name"] != self.model_name or meta["dtype"] != self.dtype:
+            logger.warning("Corpus in %s was built for another model or dtype; starting over", self.directory)
+            return
+
+        self.dim = meta["dim"]
+        self.rows = meta["rows"]
+        self.results = meta["results"]
+        self.text_bytes = meta["text_bytes"]
+
+        self._map(max(self.rows, 1), max(self.results, 1))
+
+        if os.path.exists(self._path("ivf.npz")):
+            try:
+                index = IVFIndex.load(self._path("ivf.npz"))
+                if index.indexed_rows <= self.rows and index.centroids.shape[1] == self.dim:
+                    self._index = index
+            except Exception as e:
+                logger.warning("Discarding unreadable corpus index: %s", e)
+
+    def _map(self, capacity, result_capacity):
+
+        item = np.dtype(self.dtype).itemsize
+
+        for name, size in (
+            ("vectors.bin", capacity * self.dim * item),
+            ("text_ends.bin", capacity * 8),
+            ("results.bin", result_capacity * 16)
+        ):
+            with open(self._path(name), "ab") as f:
+                if f.tell() < size:
+                    f.truncate(size)
+
+        self._vectors = np.memmap(self._path("vectors.bin"), dtype=self.dtype, mode="r+", shape=(capacity, self.dim))
+        self._text_ends = np.memmap(self._path("text_ends.bin"), dtype=np.int64, mode="r+", shape=(capacity,))
+        self._result_table = np.memmap(self._path("results.bin"), dtype=np.int64, mode="r+", shape=(result_capacity, 2))
+
+        self.capacity = capacity
+        self.result_capacity = result_capacity
+
+    def _write_meta(self):
+
+        tmp_path = self._path("meta.json.tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "model_name": self.model_name,
+                "dtype": self.dtype,
+                "dim": self.dim,
+                "rows": self.rows,
+                "results": self.results,
+                "text_bytes": self.text_bytes
+            }, f)
+
+        os.replace(tmp_path, self._path("meta.json"))
+
+    # ---------- writes ----------
+
+    def append(self, result_id: int, sentences, embeddings):
+
+        if not len(sentences):
+            return 0
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        with self._lock:
+
+            if self.dim is None:
+                self.dim = embeddings.shape[1]
+
+            n = len(sentences)
+
+            # Grow by doubling so appends stay amortized O(1)
+            if self.rows + n > self.capacity or self.results + 1 > self.result_capacity:
+                capacity = max(self.capacity, 1024)
+                while capacity < self.rows + n:
+                    capacity *= 2
+
+                result_capacity = max(self.result_capacity, 256)
+                while result_capacity < self.results + 1:
+                    result_capacity *= 2
+
+                self._map(capacity, result_capacity)
+
+            encoded = [" ".join(sentence.split()).encode("utf-8") for sentence in sentences]
+
+            with open(self._path("text.bin"), "r+b" if os.path.exists(self._path("text.bin")) else "wb") as f:
+                f.seek(self.text_bytes)
+                f.write(b"".join(encoded))
+                f.truncate()
+
+            self._vectors[self.rows:self.rows + n] = quantize(embeddings, self.dtype)
+            self._text_ends[self.rows:self.rows + n] = self.text_bytes + np.cumsum([len(e) for e in encoded])
+            self._result_table[self.results] = (result_id, self.rows)
+
+            self.rows += n
+            self.results += 1
+            self.text_bytes = int(self._text_ends[self.rows - 1])
+
+            self._write_meta()
+
+        return n
+
+    def flush(self):
+
+        with self._lock:
+            for array in (self._vectors, self._text_ends, self._result_table):
+                if array is not None:
+                    array.flush()
+
+    # ---------- reads ----------
+
+    def sentence(self, row: int):
+
+        start = int(self._text_ends[row - 1]) if row else 0
+        end = int(self._text_ends[row])
+
+        with open(self._path("text.bin"), "rb") as f:
+            f.seek(start)
+            return f.read(end - start).decode("utf-8")
+
+    def result_ids(self, rows):
+        """ComplianceResult id of each row."""
+
+        results = self.results
+        firsts = self._result_table[:results, 1]
+
+        return self._result_table[np.searchsorted(firsts, rows, side="right") - 1, 0]
+
+    def search(self, query, k=10, nprobe=16, chunk_size=65536):
+        """Approximate top-``k`` rows for a normalized query vector.
+
+        Rows covered by the IVF index are searched in the ``nprobe`` best
+        buckets; rows appended since it was built are scanned exactly.
+        """
+
+        with self._lock:
+            rows, index, vectors = self.rows, self._index, self._vectors
+
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32), 0
+
+        found_rows, found_scores = [], []
+        searched = 0
+
+        if index is not None:
+            # Sorted reads walk the memory map forwards
+            candidates = np.sort(index.candidates(query, nprobe))
+            found_rows.append(candidates)
+            found_scores.append(score_rows(vectors[candidates], query, self.dtype))
+            searched += len(candidates)
+
+        for start in range(index.indexed_rows if index else 0, rows, chunk_size):
+            stop = min(start + chunk_size, rows)
+            chunk_rows, chunk_scores = top_rows(
+                np.arange(start, stop),
+                score_rows(vectors[start:stop], query, self.dtype),
+                k
+            )
+            found_rows.append(chunk_rows)
+            found_scores.append(chunk_scores)
+            searched += stop - start
+
+        best_rows, best_scores = top_rows(np.concatenate(found_rows), np.concatenate(found_scores), k)
+
+        return best_rows, best_scores, searched
+
+    # ---------- index maintenance ----------
+
+    def unindexed_rows(self):
+        return self.rows - (self._index.indexed_rows if self._index else 0)
+
+    def needs_rebuild(self, min_rows, fraction):
+
+        indexed = self._index.indexed_rows if self._index else 0
+
+        return self.unindexed_rows() >= max(min_rows, fraction * indexed)
+
+    def rebuild_index(self, nlist=None, iterations=8):
+
+        with self._lock:
+            rows, vectors = self.rows, self._vectors
+
+        if not rows:
+            return None
+
+        nlist = nlist or max(1, int(math.sqrt(rows)))
+
+        logger.info("Building corpus IVF index over %d rows (%d lists)", rows, nlist)
+        index = IVFIndex.train(vectors[:rows], self.dtype, nlist, iterations)
+        index.save(self._path("ivf.npz"))
+
+        with self._lock:
+            self._index = index
+
+        return index
+
+    def stats(self):
+
+        index = self._index
+
+        return {
+            "rows": self.rows,
+            "results": self.results,
+            "dtype": self.dtype,
+            "bytes": self.rows * (self.dim or 0) * np.dtype(self.dtype).itemsize + self.text_bytes,
+            "indexed_rows": index.indexed_rows if index else 0,
+            "ivf_lists": len(index.centroids) if index else 0
+        }
+
+
+# ==============================
+# Background Indexer
+# ==============================
+class CorpusIndexer:
+    """Appends stored analyses to the corpus on a background thread.
+
+    IVF rebuilds run on a second thread, one at a time, so appends keep
+    going (into the unindexed tail) while a large index is trained.
+    """
+
+    def __init__(self, corpus, embed_fn):
+        self.corpus = corpus
+        self.embed_fn = embed_fn
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="corpus-indexer")
+        self._rebuilder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="corpus-ivf")
+        self._rebuilding = threading.Event()
+
+    def submit(self, result_id, website_url: str, policy_text: str):
+        """``result_id`` may be a Future (e.g. from the write-behind queue)."""
+
+        return self._executor.submit(self._index, result_id, website_url, policy_text)
+
+    def _index(self, result_id, website_url, policy_text):
+
+        try:
+            if isinstance(result_id, Future):
+                result_id = result_id.result()
+
+        except Exception:
+            logger.exception("Result for %s was not stored; not indexing it", website_url)
+            raise
+
+        try:
+            sentences, embeddings = self.embed_fn(website_url, policy_text)
+            added = self.corpus.append(result_id, sentences, embeddings)
+
+            self._maybe_rebuild()
+
+            return added
+
+        except Exception:
+            logger.exception("Indexing result %s into the corpus failed", result_id)
+            raise
+
+    def _maybe_rebuild(self):
+
+        if self._rebuilding.is_set():
+            return
+
+        if self.corpus.needs_rebuild(settings.CORPUS_IVF_MIN_ROWS, settings.CORPUS_IVF_REBUILD_FRACTION):
+            self._rebuilding.set()
+            self._rebuilder.submit(self._rebuild)
+
+    def _rebuild(self):
+
+        try:
+            self.corpus.rebuild_index()
+        except Exception:
+            logger.exception("Rebuilding the corpus IVF index failed")
+        finally:
+            self._rebuilding.clear()
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+        self._rebuilder.shutdown(wait=wait)
+        self.corpus.flush()
+
+
+def embed_policy(website_url: str, policy_text: str):
+    """Sentences and normalized embeddings of a stored analysis.
+
+    URL analyses reuse the embeddings saved with the policy version, so
+    nothing is encoded twice; other texts go through the embedding cache.
+    """
+
+    from services.encoders import encoder_key
+    from services.policy_versions import get_version_store
+    from services.scoring_engine import encode_sentences, split_sentences
+    from services.similarity import normalize_rows
+
+    sentences = split_sentences(policy_text)
+
+    if not sentences:
+        return [], None
+
+    store = get_version_store() if website_url else None
+    version = store.get(website_url) if store else None
+
+    if version is not None and version.model_name == encoder_key() and list(version.sentences) == sentences:
+        return sentences, normalize_rows(version.embeddings)
+
+    return sentences, normalize_rows(encode_sentences(sentences))
+
+
+# ==============================
+# Process-wide Corpus
+# ==============================
+_indexer = None
+_indexer_pid = None
+_indexer_lock = threading.Lock()
+
+
+def get_corpus_indexer():
+    """The shared indexer (and its corpus), or None when CORPUS_DIR is empty."""
+
+    global _indexer, _indexer_pid
+
+    if not settings.CORPUS_DIR:
+        return None
+
+    with _indexer_lock:
+
+        if _indexer is None or _indexer_pid != os.getpid():
+            from services.encoders import encoder_key
+
+            model_name = encoder_key()
+            slug = "".join(c if c.isalnum() else "_" for c in model_name)
+            corpus = SentenceCorpus(os.path.join(settings.CORPUS_DIR, slug), model_name, settings.CORPUS_DTYPE)
+
+            _indexer = CorpusIndexer(corpus, embed_policy)
+            _indexer_pid = os.getpid()
+
+        return _indexer
+
+
+def current_corpus_indexer():
+    """The indexer if this process started one, without creating it."""
+
+    return _indexer if _indexer_pid == os.getpid() else None
+
+
+def get_corpus():
+
+    indexer = get_corpus_indexer()
+
+    return indexer.corpus if indexer else None
+
+
+def index_policy(result_id, website_url: str, policy_text: str):
+    """Queue a stored analysis for corpus search; no-op when disabled."""
+
+    indexer = get_corpus_indexer()
+
+    return indexer.submit(result_id, website_url, policy_text) if indexer else None
+
+
+# ==============================
+# Corpus Search
+# ==============================
+def search_policies(db, corpus, query_embedding, limit: int = 20, nprobe: int = None, overfetch: int = 10):
+    """Best-matching sentence per website for one normalized query vector.
+
+    Fetches ``limit * overfetch`` sentences so sites with several matching
+    sentences (or several stored analyses) still leave ``limit`` distinct
+    websites, then resolves result ids to URLs with a single query.
+    """
+
+    from sqlalchemy import select
+
+    from models.compliance_model import ComplianceResult
+
+    rows, scores, searched = corpus.search(
+        query_embedding, limit * overfetch, nprobe or settings.CORPUS_IVF_NPROBE
+    )
+
+    result_ids = corpus.result_ids(rows) if len(rows) else np.zeros(0, dtype=np.int64)
+
+    records = {
+        record.id: record
+        for record in db.execute(
+            select(ComplianceResult.id, ComplianceResult.website_url, ComplianceResult.created_at)
+            .where(ComplianceResult.id.in_({int(i) for i in result_ids}))
+        )
+    } if len(result_ids) else {}
+
+    matches = {}
+
+    for row, score, result_id in zip(rows, scores, result_ids):
+
+        record = records.get(int(result_id))
+
+        # Rows of deleted results are skipped; scores arrive best first
+        if record is None or record.website_url in matches:
+            continue
+
+        matches[record.website_url] = {
+            "website_url": record.website_url,
+            "result_id": record.id,
+            "analyzed_at": record.created_at.isoformat() if record.created_at else None,
+            "sentence": corpus.sentence(int(row)),
+            "score": round(float(score) * 100, 2)
+        }
+
+        if len(matches) == limit:
+            break
+
+    return list(matches.values()), searched
@@ -0,0 +1,81 @@
+import numpy as np
+
+
+# ==============================
+# Vector Helpers
+# ==============================
+def normalize_rows(matrix):
+
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+
+    return matrix / norms
+
+
+# ==============================
+# Top-k Clause Scoring Kernel
+# ==============================
+def top_k_matches(clause_embeddings, sentence_embeddings, k: int = 1):
+    """Score every clause against every sentence in one matrix product.
+
+    Both inputs must already be row-normalized. Returns ``(indices, scores)``,
+    each shaped ``(n_clauses, k)`` and ordered best first; ties keep the
+    lower sentence index first, matching ``np.argmax``.
+    """
+
+    scores = clause_embeddings @ sentence_embeddings.T
+
+    n_sentences = scores.shape[1]
+    k = max(1, min(k, n_sentences))
+
+    if k == 1:
+        indices = np.argmax(scores, axis=1)[:, None]
+
+    else:
+        if k < n_sentences:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(n_sentences), scores.shape)
+
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.lexsort((candidates, -candidate_scores), axis=1)
+        indices = np.take_along_axis(candidates, order, axis=1)
+
+    return indices, np.take_along_axis(scores, indices, axis=1)
+
+
+# ==============================
+# Streaming Top-k
+# ==============================
+class RunningTopK:
+    """Per-clause top-k over sentences that arrive in chunks.
+
+    Keeps only ``k`` scores and sentence positions per clause, and breaks
+    ties the same way as ``top_k_matches`` (lower position first), so the
+    final result equals scoring the whole document at once.
+    """
+
+    def __init__(self, n_clauses: int, k: int):
+        self.k = max(1, k)
+        self.scores = np.full((n_clauses, 0), -np.inf, dtype=np.float32)
+        self.indices = np.zeros((n_clauses, 0), dtype=np.int64)
+
+    def update(self, clause_embeddings, sentence_embeddings, offset: int):
+
+        chunk_scores = clause_embeddings @ sentence_embeddings.T
+        chunk_indices = np.broadcast_to(
+            np.arange(offset, offset + chunk_scores.shape[1]),
+            chunk_scores.shape
+        )
+
+        scores = np.concatenate([self.scores, chunk_scores], axis=1)
+        indices = np.concatenate([self.indices, chunk_indices], axis=1)
+
+        order = np.lexsort((indices, -scores), axis=1)[:, :self.k]
+
+        self.scores = np.take_along_axis(scores, order, axis=1)
+        self.indices = np.take_along_axis(indices, order, axis=1)
+
+    def referenced(self):
+        return set(self.indices.ravel().tolist())
@@ -0,0 +1,153 @@
+import os
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+
+
+# ==============================
+# Worker Process Setup
+# ==============================
+def _threads_per_worker(workers: int):
+
+    if settings.TORCH_THREADS_PER_WORKER > 0:
+        return settings.TORCH_THREADS_PER_WORKER
+
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def _init_worker(counter, threads):
+
+    import torch
+    from services import embedding_cache
+
+    # Partition the cores: each worker gets its own slice of intra-op threads
+    torch.set_num_threads(threads)
+
+    with counter.get_lock():
+        counter.value += 1
+        worker_id = counter.value
+
+    # One job at a time per worker, so there is nothing to micro-batch
+    settings.INFERENCE_SCHEDULER = False
+
+    # The memmap LRU is single-writer; give each worker its own files
+    embedding_cache.use_worker_partition(worker_id)
+
+
+def _analyze(policy_text, top_k, website_url=None, packs=None):
+
+    from services.scoring_engine import analyze_compliance, analyze_policy_version
+
+    if website_url:
+        return analyze_policy_version(website_url, policy_text, top_k, packs=packs)
+
+    return analyze_compliance(policy_text, top_k, packs=packs)
+
+
+def _ping(_):
+    return os.getpid()
+
+
+# ==============================
+# Pool Lifecycle
+# ==============================
+def start_worker_pool():
+    """Start ANALYSIS_WORKERS analysis processes.
+
+    With the default ``forkserver`` start method the workers come from a
+    clean server process that has only imported the scoring modules, so
+    no torch thread pool or lock state is inherited; each worker loads its
+    own model on its first job. With ``fork`` the model and clause index
+    are loaded in the parent first and the workers share the weights
+    copy-on-write, at the risk of deadlocking in an inherited OpenMP pool
+    if the parent has already run inference.
+    """
+
+    global _pool
+
+    workers = settings.ANALYSIS_WORKERS
+
+    if workers <= 0 or _pool is not None:
+        return _pool
+
+    method = settings.ANALYSIS_START_METHOD
+    context = multiprocessing.get_context(method)
+
+    if method == "fork":
+        from services.scoring_engine import load_clause_index
+
+        # Workers must inherit a loaded model, so this cannot be lazy
+        load_clause_index()
+
+    elif method == "forkserver":
+        # Import torch once in the server rather than in every worker
+        context.set_forkserver_preload(["services.scoring_engine"])
+
+    threads = _threads_per_worker(workers)
+
+    # The parent may have used the Rust tokenizer pool; keep children serial
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+    _pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(context.Value("i", 0), threads)
+    )
+
+    # Start every worker now, before the app starts any threads of its own
+    pids = set(_pool.map(_ping, range(workers * 4)))
+
+    logger.info(
+        "Started %d %s analysis workers (%d torch threads each): %s",
+        workers, method, threads, sorted(pids)
+    )
+
+    return _pool
+
+
+def stop_worker_pool():
+
+    global _pool
+
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+# ==============================
+# Analysis Entry Points
+# ==============================
+def run_analysis(policy_text: str, top_k: int = None, website_url: str = None, packs=None):
+    """Blocking analysis, on the worker pool when one is running.
+
+    With ``website_url`` the policy is re-scored incrementally against the
+    last analyzed version of that site. ``packs`` selects clause packs
+    instead of the default DPDP clauses.
+    """
+
+    if _pool is None:
+        return _analyze(policy_text, top_k, website_url, packs)
+
+    return _pool.submit(_analyze, policy_text, top_k, website_url, packs).result()
+
+
+async def run_analysis_async(policy_text: str, top_k: int = None, website_url: str = None, packs=None):
+    """Analysis that never blocks the event loop."""
+
+    if _pool is None:
+        return await run_in_threadpool(run_analysis, policy_text, top_k, website_url, packs)
+
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(_pool, _analyze, policy_text, top_k, website_url, packs)
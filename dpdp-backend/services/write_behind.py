@@ -0,0 +1,231 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================
+# Write-behind Queue
+# ==============================
+class WriteBehindQueue:
+    """Inserts ORM records on a background thread, many per transaction.
+
+    Callers get a Future for the new row's id and don't wait for the
+    commit. A batch is written once it holds ``max_batch_size`` records or
+    ``max_wait_ms`` has passed since its first record arrived. A batch that
+    fails to commit is retried one record at a time, so only the records
+    that cannot be written fail. Stopping writes everything still queued.
+    """
+
+    def __init__(self, session_factory, max_batch_size=100, max_wait_ms=20):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.records = 0
+        self.failed = 0
+
+    def start(self):
+
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run,
+                name="db-write-behind",
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+
+        with self._lock:
+            if not self._thread:
+                return
+
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    # ---------- caller API ----------
+
+    def submit(self, record):
+
+        future = Future()
+
+        self.start()
+        self._queue.put((record, future))
+
+        return future
+
+    def stats(self):
+
+        return {
+            "batches": self.batches,
+            "records": self.records,
+            "failed": self.failed,
+            "average_batch_size": round(self.records / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize()
+        }
+
+    # ---------- writer thread ----------
+
+    def _collect(self, first):
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+
+            if item is None:
+                # Write this batch, then everything left, then stop
+                self._queue.put(None)
+                break
+
+            batch.append(item)
+
+        return batch
+
+    def _insert(self, records):
+
+        db = self.session_factory()
+        generated = [record for record in records if record.id is None]
+
+        try:
+            db.add_all(records)
+            db.flush()
+
+            # Read ids before commit expires the instances
+            ids = [record.id for record in records]
+
+            db.commit()
+
+            return ids
+
+        except Exception:
+            db.rollback()
+
+            # Rolled-back instances keep the ids the failed flush gave them,
+            # which other writers may take before a retry
+            for record in generated:
+                record.id = None
+
+            raise
+
+        finally:
+            db.close()
+
+    def _write(self, batch):
+
+        try:
+            ids = self._insert([record for record, _ in batch])
+
+        except Exception:
+            if len(batch) == 1:
+                self._write_one(batch[0])
+                return
+
+            # One bad record must not take the rest of the batch with it
+            logger.warning(
+                "Write-behind batch of %d records failed; retrying one at a time", len(batch), exc_info=True
+            )
+            written = sum(self._write_one(item) for item in batch)
+
+            if written:
+                self.batches += 1
+
+            return
+
+        self.batches += 1
+        self.records += len(batch)
+
+        for (_, future), record_id in zip(batch, ids):
+            future.set_result(record_id)
+
+    def _write_one(self, item):
+
+        record, future = item
+
+        try:
+            record_id, = self._insert([record])
+
+        except Exception as e:
+            logger.exception("Write-behind insert of %s failed", type(record).__name__)
+            self.failed += 1
+            future.set_exception(e)
+            return False
+
+        self.records += 1
+        future.set_result(record_id)
+
+        return True
+
+    def _run(self):
+
+        while True:
+
+            first = self._queue.get()
+
+            if first is None:
+                if self._queue.empty():
+                    return
+
+                # Records that raced with stop() are still written
+                self._queue.put(None)
+                continue
+
+            self._write(self._collect(first))
+
+
+# ==============================
+# Process-wide Queue
+# ==============================
+_write_queue = None
+_write_queue_pid = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue():
+
+    global _write_queue, _write_queue_pid
+
+    with _write_queue_lock:
+
+        # Threads don't survive fork, so each process gets its own queue
+        if _write_queue is None or _write_queue_pid != os.getpid():
+            from database.db import SessionLocal
+
+            _write_queue = WriteBehindQueue(
+                SessionLocal,
+                max_batch_size=settings.DB_WRITE_MAX_BATCH,
+                max_wait_ms=settings.DB_WRITE_MAX_WAIT_MS
+            )
+            _write_queue_pid = os.getpid()
+
+        return _write_queue
+
+
+def current_write_queue():
+    return _write_queue if _write_queue_pid == os.getpid() else None
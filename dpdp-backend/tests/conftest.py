@@ -0,0 +1,68 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from core.config import settings
+from services import chart_renderer, scoring_engine
+from services.clause_index import ClauseIndex
+from services.result_cache import ResultCache
+
+
+def fake_vector(text, dim=16):
+    """A deterministic pseudo-embedding seeded by the text."""
+
+    seed = int.from_bytes(hashlib.sha1(text.encode()).digest()[:4], "little")
+    return np.random.default_rng(seed).normal(size=dim).astype(np.float32)
+
+
+def fake_index(clauses, clauses_hash="test-clauses"):
+    """A clause index embedding each description with ``fake_vector``."""
+
+    embeddings = scoring_engine.normalize_rows([fake_vector(c["description"]) for c in clauses])
+    return ClauseIndex("fake-model", clauses_hash, clauses, embeddings)
+
+
+@pytest.fixture(autouse=True)
+def chart_dir(monkeypatch, tmp_path_factory):
+    """Render every test's charts into a temporary directory."""
+
+    directory = tmp_path_factory.mktemp("charts")
+
+    monkeypatch.setattr(settings, "CHART_DIR", str(directory))
+    monkeypatch.setattr(chart_renderer, "_renderer", None)
+
+    yield directory
+
+    renderer = chart_renderer.current_chart_renderer()
+    if renderer is not None:
+        renderer.shutdown()
+
+
+@pytest.fixture
+def fake_encoder(monkeypatch):
+    """Score with ``fake_vector`` and no result cache; returns every encoded batch."""
+
+    encoded = []
+
+    def encode(sentences):
+        encoded.append(list(sentences))
+        return np.stack([fake_vector(s) for s in sentences])
+
+    monkeypatch.setattr(scoring_engine, "result_cache", ResultCache(0))
+    monkeypatch.setattr(scoring_engine, "encode_sentences", encode)
+    monkeypatch.setattr(scoring_engine, "encoder_key", lambda: "fake-model")
+
+    return encoded
+
+
+@pytest.fixture
+def fake_clauses(monkeypatch, fake_encoder):
+    """Call with a clause list to score against it; returns the encoded batches."""
+
+    def use(clauses, clauses_hash="test-clauses"):
+        index = fake_index(clauses, clauses_hash)
+        monkeypatch.setattr(scoring_engine, "load_clause_index", lambda: index)
+        return fake_encoder
+
+    return use
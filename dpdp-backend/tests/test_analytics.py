@@ -0,0 +1,84 @@
+from sqlalchemy.orm import sessionmaker
+
+from database.db import Base, create_db_engine
+from models.analytics_model import ClauseResult
+from models.compliance_model import ComplianceResult
+from services import analytics
+from services.result_store import build_record, save_compliance_result, save_compliance_results
+
+
+def result(score, grievance_status):
+    return {
+        "overall_score": score,
+        "risk_level": "Low Risk" if score >= 75 else "High Risk",
+        "missing_clauses": [],
+        "section_analysis": {
+            "Notice Requirement": {
+                "section": "Section 5", "category": "Transparency",
+                "similarity_score": score, "status": "Matched"
+            },
+            "Grievance Redressal": {
+                "section": "Section 13", "category": "Rights",
+                "similarity_score": 20.0, "status": grievance_status
+            }
+        }
+    }
+
+
+def make_session(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'analytics.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_rollups_follow_every_insert_path(tmp_path):
+    db = make_session(tmp_path)
+
+    save_compliance_result(db, "https://a.example", result(80.0, "Missing"))
+    save_compliance_results(db, [
+        ("https://a.example", result(60.0, "Matched")),
+        ("https://b.example", result(90.0, "Missing"))
+    ])
+
+    rates = {row["clause_title"]: row for row in analytics.clause_failure_rates(db)}
+
+    assert rates["Grievance Redressal"]["analyses"] == 3
+    assert rates["Grievance Redressal"]["failure_rate"] == round(2 / 3, 4)
+    assert rates["Notice Requirement"]["average_score"] == round(230 / 3, 2)
+    assert db.query(ClauseResult).count() == 6
+
+    trend = analytics.url_score_trend(db, "https://a.example")
+    assert trend[0]["analyses"] == 2
+    assert trend[0]["average_score"] == 70.0
+
+    risks = analytics.risk_distribution(db)
+    assert risks["total"] == 3
+    assert {level["risk_level"]: level["analyses"] for level in risks["levels"]} == {"Low Risk": 2, "High Risk": 1}
+
+    failing = analytics.failing_sites(db, "Grievance Redressal")
+    assert {site["website_url"] for site in failing} == {"https://a.example", "https://b.example"}
+
+    assert analytics.category_trend(db, "Rights")[0]["failure_rate"] == round(2 / 3, 4)
+
+
+def test_backfill_rebuilds_rollups_for_existing_results(tmp_path):
+    db = make_session(tmp_path)
+
+    # Simulate rows written before clause rows existed
+    for score in (50.0, 90.0):
+        record = build_record("https://c.example", result(score, "Missing"))
+        db.execute(ComplianceResult.__table__.insert().values(
+            website_url=record.website_url,
+            compliance_percentage=record.compliance_percentage,
+            risk_level=record.risk_level,
+            section_analysis=record.section_analysis,
+            missing_clauses=record.missing_clauses,
+            created_at=record.created_at
+        ))
+    db.commit()
+
+    assert analytics.backfill_analytics(db, batch_size=1) == 2
+    assert analytics.backfill_analytics(db) == 0
+
+    rates = {row["clause_title"]: row for row in analytics.clause_failure_rates(db)}
+    assert rates["Grievance Redressal"]["failures"] == 2
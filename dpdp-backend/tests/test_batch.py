@@ -0,0 +1,83 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from core.config import settings
+from database.db import Base, create_db_engine, get_db
+from services import crawler, scoring_engine
+
+
+CLAUSES = [
+    {"title": "Consent", "section": "6", "category": "Consent", "description": "consent"},
+    {"title": "Retention", "section": "8", "category": "Storage", "description": "retention"}
+]
+
+
+SHARED = "We only process personal data with the consent of the user"
+POLICIES = {
+    "https://a.example": f"{SHARED}. Records are deleted after twelve months of inactivity.",
+    "https://b.example": f"{SHARED}. Backups are kept for ninety days and then destroyed."
+}
+
+
+@pytest.fixture
+def encoded(monkeypatch, fake_clauses):
+    monkeypatch.setattr(settings, "CORPUS_DIR", "")
+    return fake_clauses(CLAUSES, "test-batch-clauses")
+
+
+def make_client(tmp_path):
+    from api.routes import router
+
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'batch.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+
+    def db_session():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = db_session
+
+    return TestClient(app)
+
+
+def test_analyze_many_encodes_shared_sentences_once(encoded):
+    results = scoring_engine.analyze_many(list(POLICIES.values()), top_k=1)
+
+    assert len(encoded) == 1
+    assert encoded[0].count(SHARED) == 1
+    assert [r["overall_score"] for r in results] == [
+        scoring_engine.analyze_compliance(text, top_k=1)["overall_score"] for text in POLICIES.values()
+    ]
+
+
+def test_batch_reports_one_entry_per_item_when_a_fetch_fails(monkeypatch, tmp_path, encoded):
+
+    async def fetch(url, crawler=None, cache=None):
+        if url == "https://broken.example":
+            raise ValueError("extractor exploded")
+        return POLICIES[url]
+
+    monkeypatch.setattr(crawler, "fetch_privacy_policy_async", fetch)
+
+    response = make_client(tmp_path).post(
+        "/batch/analyze",
+        data={"urls": ["https://a.example", "https://broken.example", "https://b.example"]}
+    )
+
+    assert response.status_code == 200
+
+    body = response.json()
+    statuses = {item["source"]: item["status"] for item in body["items"]}
+
+    assert (body["total"], body["succeeded"], body["failed"]) == (3, 2, 1)
+    assert statuses == {"https://a.example": "ok", "https://broken.example": "error", "https://b.example": "ok"}
+    assert all(item["result_id"] for item in body["items"] if item["status"] == "ok")
+    assert len(encoded) == 1
@@ -0,0 +1,153 @@
+import json
+
+import bulk_scan
+from services import worker_pool
+
+
+def fake_analysis(text, packs=None):
+
+    if "fail" in text:
+        raise RuntimeError("model exploded")
+
+    return {
+        "overall_score": float(len(text)),
+        "risk_level": "High Risk",
+        "missing_clauses": ["Grievance Redressal"],
+        "section_analysis": {}
+    }
+
+
+def test_inputs_are_read_from_lists_directories_and_jsonl(tmp_path):
+    urls = tmp_path / "urls.txt"
+    urls.write_text("https://a.example/privacy\n# skipped\n\nhttps://b.example/privacy\n")
+
+    policies = tmp_path / "policies"
+    (policies / "nested").mkdir(parents=True)
+    (policies / "one.txt").write_text("We collect data.")
+    (policies / "nested" / "two.html").write_text("<html><body><p>We collect data.</p></body></html>")
+    (policies / "notes.xlsx").write_bytes(b"ignored")
+
+    requests = tmp_path / "requests.jsonl"
+    requests.write_text(
+        json.dumps({"request_id": "r-1", "title": "t", "body": "Policy text one."}) + "\n"
+        + json.dumps({"url": "https://c.example"}) + "\n"
+    )
+
+    assert [job[0] for job in bulk_scan.read_jobs(str(urls))] == ["https://a.example/privacy", "https://b.example/privacy"]
+    assert sorted(job[0] for job in bulk_scan.read_jobs(str(policies))) == ["nested/two.html", "one.txt"]
+    assert list(bulk_scan.read_jobs(str(requests))) == [
+        ("r-1", bulk_scan.TEXT, "Policy text one."),
+        ("https://c.example", bulk_scan.URL, "https://c.example")
+    ]
+
+
+def test_scan_writes_incrementally_and_resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker_pool, "run_analysis", fake_analysis)
+
+    jobs = [(f"p{i}", bulk_scan.TEXT, "policy " * i) for i in range(1, 6)] + [("bad", bulk_scan.TEXT, "fail")]
+
+    output = bulk_scan.JsonlOutput(str(tmp_path / "scan.jsonl"))
+    checkpoint = bulk_scan.Checkpoint(str(tmp_path / "scan.jsonl.checkpoint"))
+
+    summary = bulk_scan.run_scan(iter(jobs), output, checkpoint, concurrency=2, flush_every=2)
+
+    rows = [json.loads(line) for line in (tmp_path / "scan.jsonl").read_text().splitlines()]
+
+    assert (summary["scanned"], summary["ok"], summary["failed"]) == (6, 5, 1)
+    assert sorted(row["id"] for row in rows) == ["bad", "p1", "p2", "p3", "p4", "p5"]
+    assert next(row for row in rows if row["id"] == "bad")["error"] == "RuntimeError: model exploded"
+    assert summary["analyze_ms"]["p50"] >= 0
+
+    # A second run skips finished ids; --retry-failed only rescans failures
+    resumed = bulk_scan.run_scan(iter(jobs), output, bulk_scan.Checkpoint(checkpoint.path), concurrency=2)
+    assert (resumed["scanned"], resumed["skipped"]) == (0, 6)
+
+    retried = bulk_scan.run_scan(
+        iter(jobs), output, bulk_scan.Checkpoint(checkpoint.path), concurrency=2, retry_failed=True
+    )
+    assert (retried["scanned"], retried["skipped"]) == (1, 5)
+
+
+def test_urls_share_one_crawler_and_skip_the_http_cache(tmp_path, monkeypatch):
+    from services import crawler
+
+    monkeypatch.setattr(worker_pool, "run_analysis", fake_analysis)
+
+    calls = []
+
+    async def fetch(url, crawler=None, cache=None):
+        calls.append((crawler, cache))
+        return f"Policy text fetched from {url}"
+
+    monkeypatch.setattr(crawler, "fetch_privacy_policy_async", fetch)
+
+    jobs = [(f"https://site{i}.example", bulk_scan.URL, f"https://site{i}.example") for i in range(5)]
+
+    summary = bulk_scan.run_scan(
+        iter(jobs),
+        bulk_scan.JsonlOutput(str(tmp_path / "scan.jsonl")),
+        bulk_scan.Checkpoint(str(tmp_path / "scan.jsonl.checkpoint")),
+        concurrency=3
+    )
+
+    assert summary["ok"] == 5
+    assert len({id(crawler) for crawler, _ in calls}) == 1
+    assert all(cache is False for _, cache in calls)
+
+
+def test_unreadable_jsonl_lines_become_error_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker_pool, "run_analysis", fake_analysis)
+
+    source = tmp_path / "requests.jsonl"
+    source.write_text(
+        json.dumps({"id": "r-1", "text": "Policy text one."}) + "\n"
+        + '{"id": "r-2", "text": \n'
+        + json.dumps(["not", "an", "object"]) + "\n"
+        + json.dumps({"id": "r-4", "title": "no text"}) + "\n"
+        + json.dumps({"id": "r-5", "text": "Policy text five."}) + "\n"
+    )
+
+    jobs = list(bulk_scan.read_jobs(str(source)))
+
+    assert [(job_id, kind) for job_id, kind, _ in jobs] == [
+        ("r-1", bulk_scan.TEXT), ("line-2", bulk_scan.INVALID), ("line-3", bulk_scan.INVALID),
+        ("line-4", bulk_scan.INVALID), ("r-5", bulk_scan.TEXT)
+    ]
+
+    summary = bulk_scan.run_scan(
+        iter(jobs),
+        bulk_scan.JsonlOutput(str(tmp_path / "scan.jsonl")),
+        bulk_scan.Checkpoint(str(tmp_path / "scan.jsonl.checkpoint"))
+    )
+
+    rows = {row["id"]: row for row in map(json.loads, (tmp_path / "scan.jsonl").read_text().splitlines())}
+
+    assert (summary["ok"], summary["failed"]) == (2, 3)
+    assert rows["line-3"]["error"] == "Line 3 is not a JSON object"
+    assert rows["line-4"]["error"] == "Line 4 has no url, path or text field"
+    assert rows["line-2"]["error"].startswith("Line 2 is not valid JSON")
+    assert rows["line-2"]["source"] is None
+
+
+def test_rows_written_before_a_crash_are_not_scanned_twice(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker_pool, "run_analysis", fake_analysis)
+
+    jobs = [(f"p{i}", bulk_scan.TEXT, "policy " * i) for i in range(1, 5)]
+    output = bulk_scan.JsonlOutput(str(tmp_path / "scan.jsonl"))
+    checkpoint_path = str(tmp_path / "scan.jsonl.checkpoint")
+
+    # The first two rows reached the output, then the run died (with a
+    # torn line) before recording them in the checkpoint
+    output.write([bulk_scan.scan_one(job) for job in jobs[:2]])
+    with open(output.path, "a", encoding="utf-8") as f:
+        f.write('{"id": "p3", "sta')
+
+    checkpoint = bulk_scan.Checkpoint(checkpoint_path)
+
+    assert checkpoint.recover(output) == 2
+    assert bulk_scan.Checkpoint(checkpoint_path).done == {"p1": "ok", "p2": "ok"}
+
+    summary = bulk_scan.run_scan(iter(jobs), output, checkpoint)
+
+    assert (summary["scanned"], summary["skipped"]) == (2, 2)
+    assert bulk_scan.Checkpoint(checkpoint_path).recover(output) == 0
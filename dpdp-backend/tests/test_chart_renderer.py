@@ -0,0 +1,89 @@
+import os
+import threading
+
+from services.chart_renderer import ChartRenderer, attach_chart
+
+
+SECTION_ANALYSIS = {
+    "Consent": {"similarity_score": 71.5, "status": "Matched"},
+    "Data Retention": {"similarity_score": 32.0, "status": "Missing"}
+}
+
+
+def test_chart_is_rendered_once_per_result(tmp_path):
+    renderer = ChartRenderer(str(tmp_path))
+
+    first = renderer.ensure(SECTION_ANALYSIS)
+    second = renderer.ensure(dict(SECTION_ANALYSIS))
+
+    renderer.shutdown()
+
+    assert first == second
+    assert renderer.stats()["rendered"] == 1
+    with open(first, "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+    assert os.listdir(tmp_path) == [os.path.basename(first)]
+
+
+def test_attach_chart_returns_before_rendering(tmp_path):
+    release = threading.Event()
+    drawn = []
+
+    def draw(names, scores, path):
+        release.wait(5)
+        drawn.append((names, scores))
+        open(path, "wb").close()
+
+    renderer = ChartRenderer(str(tmp_path), draw_fn=draw)
+    result = {"overall_score": 51.75, "section_analysis": SECTION_ANALYSIS, "graph_path": ""}
+
+    attached = attach_chart(result, renderer)
+
+    assert not drawn
+    assert result["graph_path"] == ""
+    assert attached["graph_path"] == f"charts/{attached['chart_id']}.png"
+
+    release.set()
+    path = renderer.wait(attached["chart_id"], timeout=5)
+    renderer.shutdown()
+
+    assert os.path.exists(path)
+    assert drawn == [(["Consent", "Data Retention"], [71.5, 32.0])]
+
+
+def test_unknown_chart_ids_are_rejected(tmp_path):
+    renderer = ChartRenderer(str(tmp_path))
+
+    assert renderer.wait("../secret") is None
+    assert renderer.wait("0" * 40) is None
+
+    renderer.shutdown()
+
+
+
+def test_chart_route_reports_slow_and_failed_renders(monkeypatch):
+    from concurrent.futures import Future
+
+    import pytest
+    from fastapi import HTTPException
+
+    from api import routes
+
+    failed = Future()
+    failed.set_exception(OSError("disk full"))
+
+    class Renderer:
+        def __init__(self, future):
+            self.future = future
+
+        def wait(self, chart_key, timeout=None):
+            return self.future.result(timeout)
+
+    for future, status_code in ((Future(), 503), (failed, 500)):
+        monkeypatch.setattr(routes, "get_chart_renderer", lambda future=future: Renderer(future))
+        monkeypatch.setattr(routes.settings, "CHART_WAIT_SECONDS", 0.01)
+
+        with pytest.raises(HTTPException) as error:
+            routes.get_chart("0" * 40)
+
+        assert error.value.status_code == status_code
@@ -0,0 +1,116 @@
+import json
+
+import numpy as np
+import pytest
+
+from services import scoring_engine
+from services.clause_catalog import (
+    ClauseCatalog, ClausePack, UnknownPack, available_packs, flatten, resolve_packs
+)
+from tests.conftest import fake_vector
+
+
+def write_pack(directory, pack_id, version, clauses):
+
+    path = directory / f"{pack_id}-{version}.json"
+    path.write_text(json.dumps({"pack_id": pack_id, "version": version, "clauses": clauses}))
+
+    return str(path)
+
+
+RULES = [
+    {
+        "clause_id": "R1", "title": "Notice", "section": "Rule 1", "category": "Transparency",
+        "description": "notice",
+        "requirements": [
+            {"clause_id": "R1.a", "title": "Purpose", "description": "purpose"},
+            {
+                "clause_id": "R1.b", "title": "Withdrawal", "description": "withdrawal",
+                "requirements": [
+                    {"clause_id": "R1.b.i", "title": "Link", "description": "link"},
+                    {"clause_id": "R1.b.ii", "title": "Ease", "description": "ease"}
+                ]
+            }
+        ]
+    },
+    {"clause_id": "R2", "title": "Security", "section": "Rule 2", "category": "Security", "description": "security"}
+]
+
+
+def test_sub_clauses_inherit_section_and_category():
+    nodes = flatten("rules", RULES)
+
+    assert [node["key"] for node in nodes] == [
+        "rules:R1", "rules:R1.a", "rules:R1.b", "rules:R1.b.i", "rules:R1.b.ii", "rules:R2"
+    ]
+    assert [node["parent"] for node in nodes] == [None, 0, 0, 2, 2, None]
+    assert nodes[3]["section"] == "Rule 1"
+    assert nodes[3]["category"] == "Transparency"
+    assert nodes[3]["depth"] == 2
+
+
+def test_scores_roll_up_through_every_level():
+    pack = ClausePack("rules", "1", "Rules", flatten("rules", RULES), "hash")
+    catalog = ClauseCatalog([pack], [np.eye(6, dtype=np.float32)])
+
+    rolled = catalog.rollup([0, 80, 0, 60, 40, 70])
+
+    # R1.b = mean(60, 40); R1 = mean(R1.a, R1.b); leaves and R2 unchanged
+    assert rolled.tolist() == [65.0, 80.0, 50.0, 60.0, 40.0, 70.0]
+
+
+def test_bare_pack_id_selects_newest_version(tmp_path):
+    write_pack(tmp_path, "rules", "2025.9", RULES)
+    write_pack(tmp_path, "rules", "2025.10", RULES)
+
+    assert [pack.spec for pack in resolve_packs(["rules"], str(tmp_path))] == ["rules@2025.10"]
+    assert [pack.spec for pack in resolve_packs(["rules@2025.9"], str(tmp_path))] == ["rules@2025.9"]
+
+    with pytest.raises(UnknownPack):
+        resolve_packs(["rules@2024"], str(tmp_path))
+
+
+def test_installed_packs_load():
+    packs = available_packs()
+
+    assert "dpdp-act@2023" in packs
+    assert all(pack.nodes for pack in packs.values())
+    assert all(node["description"] for pack in packs.values() for node in pack.nodes)
+
+
+# ==============================
+# Scoring against a catalog
+# ==============================
+def test_catalog_result_reports_hierarchy_and_rollups(monkeypatch, fake_encoder):
+    rules = ClausePack("rules", "1", "Rules", flatten("rules", RULES), "rules-hash", regulation="Rules")
+    controls = ClausePack("controls", "1", "Controls", flatten("controls", [
+        {"clause_id": "C1", "title": "Security", "section": "IT", "category": "Security", "description": "security"}
+    ]), "controls-hash")
+
+    catalog = ClauseCatalog(
+        [rules, controls],
+        [
+            scoring_engine.normalize_rows([fake_vector(n["description"]) for n in pack.nodes])
+            for pack in (rules, controls)
+        ]
+    )
+
+    monkeypatch.setattr(scoring_engine, "load_catalog", lambda packs: catalog)
+
+    policy = "We explain the purpose of processing in detail. Data is protected with strong security controls."
+    result = scoring_engine.analyze_compliance(policy, top_k=2, packs=["rules", "controls"])
+
+    assert list(result["section_analysis"]) == ["rules: Notice", "rules: Security", "controls: Security"]
+    assert [pack["pack_id"] for pack in result["packs"]] == ["rules", "controls"]
+
+    notice = result["packs"][0]["clauses"][0]
+    withdrawal = notice["requirements"][1]
+
+    assert [r["title"] for r in withdrawal["requirements"]] == ["Link", "Ease"]
+    assert withdrawal["similarity_score"] == pytest.approx(
+        np.mean([r["similarity_score"] for r in withdrawal["requirements"]]), abs=0.01
+    )
+    assert result["packs"][0]["sections"]["Rule 1"]["score"] == notice["similarity_score"]
+
+    top_level = [details["similarity_score"] for details in result["section_analysis"].values()]
+    assert result["overall_score"] == pytest.approx(np.mean(top_level), abs=0.01)
@@ -0,0 +1,117 @@
+import os
+import json
+
+import numpy as np
+import pytest
+
+from core.config import settings
+from services import clause_index
+from services.clause_index import ClauseIndex, get_clause_index
+from tests.conftest import fake_vector
+
+
+CLAUSES = [
+    {"title": "Consent", "section": "6", "category": "Consent", "description": "consent"},
+    {"title": "Retention", "section": "8", "category": "Storage", "description": "retention"}
+]
+
+
+class CountingModel:
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        return np.stack([fake_vector(t) for t in texts])
+
+
+@pytest.fixture
+def clauses_path(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "CLAUSE_INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setattr(clause_index, "_indexes", {})
+    monkeypatch.setattr(clause_index, "_file_state", {})
+
+    path = tmp_path / "clauses.json"
+    path.write_text(json.dumps(CLAUSES))
+
+    return str(path)
+
+
+def forget_loaded_indexes():
+    clause_index._indexes.clear()
+
+
+def test_index_is_built_once_then_loaded_from_disk(clauses_path):
+    model = CountingModel()
+
+    built = get_clause_index(model, "tiny-model", clauses_path)
+
+    assert model.calls == 1
+    assert [c["title"] for c in built.clauses] == ["Consent", "Retention"]
+    assert np.allclose(np.linalg.norm(built.embeddings, axis=1), 1)
+    assert len(os.listdir(settings.CLAUSE_INDEX_DIR)) == 1
+
+    assert get_clause_index(model, "tiny-model", clauses_path) is built
+
+    forget_loaded_indexes()
+    loaded = get_clause_index(model, "tiny-model", clauses_path)
+
+    assert model.calls == 1
+    assert loaded.clauses == built.clauses
+    assert np.array_equal(loaded.embeddings, built.embeddings)
+
+
+def test_changed_clauses_or_model_rebuild_the_index(clauses_path):
+    model = CountingModel()
+
+    first = get_clause_index(model, "tiny-model", clauses_path)
+
+    with open(clauses_path, "w") as f:
+        json.dump(CLAUSES + [{"title": "Notice", "section": "5", "category": "Notice", "description": "notice"}], f)
+
+    rebuilt = get_clause_index(model, "tiny-model", clauses_path)
+
+    assert model.calls == 2
+    assert rebuilt.clauses_hash != first.clauses_hash
+    assert len(rebuilt.clauses) == 3
+
+    other = get_clause_index(model, "other-model", clauses_path)
+
+    assert model.calls == 3
+    assert other.model_name == "other-model"
+    assert len(os.listdir(settings.CLAUSE_INDEX_DIR)) == 3
+
+
+def test_stored_index_for_another_hash_is_not_loaded(tmp_path):
+    index = ClauseIndex.build(CountingModel(), "tiny-model", "hash-a", CLAUSES)
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+
+    assert ClauseIndex.load(path, "tiny-model", "hash-b") is None
+    assert ClauseIndex.load(path, "other-model", "hash-a") is None
+    assert ClauseIndex.load(path, "tiny-model", "hash-a").clauses == CLAUSES
+
+
+def test_corrupt_or_missing_index_files_are_rebuilt(clauses_path, caplog):
+    model = CountingModel()
+
+    get_clause_index(model, "tiny-model", clauses_path)
+    path, = [os.path.join(settings.CLAUSE_INDEX_DIR, name) for name in os.listdir(settings.CLAUSE_INDEX_DIR)]
+
+    with open(path, "wb") as f:
+        f.write(b"not an npz file")
+
+    forget_loaded_indexes()
+    rebuilt = get_clause_index(model, "tiny-model", clauses_path)
+
+    assert model.calls == 2
+    assert "Discarding unreadable clause index" in caplog.text
+    assert ClauseIndex.load(path, "tiny-model", rebuilt.clauses_hash) is not None
+
+    os.remove(path)
+    forget_loaded_indexes()
+    get_clause_index(model, "tiny-model", clauses_path)
+
+    assert model.calls == 3
+    assert os.path.exists(path)
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.crawler import (
+    MODIFIED, NOT_MODIFIED, UNCHANGED,
+    AsyncCrawler, fetch_policy_conditional, fetch_privacy_policy_async
+)
+from services.http_cache import HttpCache
+
+
+POLICY_HTML = (
+    "<html><body><nav>Menu</nav>"
+    + "".join(
+        f"<p>We process personal data of the data principal for purpose {i} "
+        f"only with consent and retain it no longer than necessary.</p>"
+        for i in range(12)
+    )
+    + "</body></html>"
+).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    etag_hits = 0
+
+    def do_GET(self):
+
+        if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            StubHandler.etag_hits += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        if self.path == "/slow":
+            with StubHandler.lock:
+                StubHandler.active += 1
+                StubHandler.peak = max(StubHandler.peak, StubHandler.active)
+            time.sleep(0.05)
+            with StubHandler.lock:
+                StubHandler.active -= 1
+
+        if self.path == "/missing":
+            self.send_response(404)
+            body = b"not found"
+        elif self.path == "/huge":
+            self.send_response(200)
+            body = b"x" * 200_000
+        else:
+            self.send_response(200)
+            body = POLICY_HTML
+
+        if self.path == "/etag":
+            self.send_header("ETag", '"v1"')
+
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_port}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def run(coro_fn, **options):
+
+    async def main():
+        crawler = AsyncCrawler(**options)
+        try:
+            return await coro_fn(crawler)
+        finally:
+            await crawler.aclose()
+
+    return asyncio.run(main())
+
+
+def test_fetch_returns_page(server_url):
+    page = run(lambda crawler: crawler.fetch(server_url + "/policy"))
+
+    assert page.ok
+    assert page.text == POLICY_HTML.decode()
+
+
+def test_error_status_is_not_ok(server_url):
+    page = run(lambda crawler: crawler.fetch(server_url + "/missing"))
+
+    assert page.status_code == 404
+    assert not page.ok
+
+
+def test_oversized_response_is_rejected(server_url):
+    page = run(
+        lambda crawler: crawler.fetch(server_url + "/huge"),
+        max_bytes=64 * 1024
+    )
+
+    assert not page.ok
+    assert "exceeds" in page.error
+
+
+def test_invalid_url_returns_error():
+    page = run(lambda crawler: crawler.fetch("not-a-valid-url"))
+
+    assert page.error
+
+
+def test_fetch_many_respects_per_host_limit(server_url):
+    StubHandler.peak = 0
+
+    pages = run(
+        lambda crawler: crawler.fetch_many([server_url + "/slow"] * 8),
+        max_per_host=2
+    )
+
+    assert all(page.ok for page in pages)
+    assert StubHandler.peak <= 2
+
+
+def test_policy_text_is_extracted(server_url, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    text = run(lambda crawler: fetch_privacy_policy_async(server_url + "/policy", crawler, cache))
+
+    assert "purpose 11" in text
+    assert "Menu" not in text
+
+
+def test_conditional_fetch_uses_cached_validators(server_url, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    url = server_url + "/etag"
+
+    first = run(lambda crawler: fetch_policy_conditional(url, crawler, cache))
+    cache.put(url, first.entry)
+
+    hits = StubHandler.etag_hits
+    second = run(lambda crawler: fetch_policy_conditional(url, crawler, cache))
+
+    assert first.status == MODIFIED
+    assert second.status == NOT_MODIFIED
+    assert StubHandler.etag_hits == hits + 1
+    assert second.text == first.text
+
+
+def test_identical_body_is_reported_unchanged(server_url, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    url = server_url + "/policy"
+
+    first = run(lambda crawler: fetch_policy_conditional(url, crawler, cache))
+    cache.put(url, first.entry)
+    second = run(lambda crawler: fetch_policy_conditional(url, crawler, cache))
+
+    assert second.status == UNCHANGED
+    assert second.text == first.text
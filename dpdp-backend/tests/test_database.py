@@ -0,0 +1,125 @@
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from database.db import Base, create_db_engine
+from models.compliance_model import ComplianceResult
+from services.result_store import build_record
+from services.write_behind import WriteBehindQueue
+
+
+RESULT = {
+    "overall_score": 60.0,
+    "risk_level": "Medium Risk",
+    "section_analysis": {},
+    "missing_clauses": []
+}
+
+
+def make_factory(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(bind=engine)
+
+
+def test_sqlite_runs_in_wal_mode(tmp_path):
+    engine, _ = make_factory(tmp_path)
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+
+
+def test_write_behind_batches_concurrent_inserts(tmp_path):
+    _, factory = make_factory(tmp_path)
+    writes = WriteBehindQueue(factory, max_batch_size=16, max_wait_ms=50)
+
+    futures = []
+    lock = threading.Lock()
+
+    def submit(i):
+        future = writes.submit(build_record(f"https://site{i}.example", RESULT))
+        with lock:
+            futures.append(future)
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [future.result(5) for future in futures]
+    writes.stop()
+
+    assert len(set(ids)) == 40
+    assert writes.stats()["batches"] < 40
+
+    db = factory()
+    assert db.query(ComplianceResult).count() == 40
+
+
+def test_stop_writes_everything_still_queued(tmp_path):
+    _, factory = make_factory(tmp_path)
+    writes = WriteBehindQueue(factory, max_batch_size=4, max_wait_ms=1000)
+
+    futures = [writes.submit(build_record("https://example.com", RESULT)) for _ in range(10)]
+    writes.stop()
+
+    assert all(future.done() for future in futures)
+    assert factory().query(ComplianceResult).count() == 10
+
+
+def test_one_bad_record_does_not_fail_its_batch(tmp_path):
+    _, factory = make_factory(tmp_path)
+    writes = WriteBehindQueue(factory, max_batch_size=16, max_wait_ms=1000)
+
+    existing = writes.submit(build_record("https://example.com", RESULT)).result(5)
+
+    duplicate = build_record("https://duplicate.example", RESULT)
+    duplicate.id = existing
+
+    futures = [writes.submit(build_record(f"https://site{i}.example", RESULT)) for i in range(3)]
+    bad = writes.submit(duplicate)
+    futures += [writes.submit(build_record(f"https://site{i}.example", RESULT)) for i in range(3, 6)]
+    writes.stop()
+
+    assert bad.exception() is not None
+    assert len({future.result() for future in futures}) == 6
+    assert writes.stats()["failed"] == 1
+    assert factory().query(ComplianceResult).count() == 7
+
+
+def test_retried_records_do_not_reuse_ids_from_the_failed_batch(tmp_path):
+    _, factory = make_factory(tmp_path)
+    writes = WriteBehindQueue(factory, max_batch_size=16, max_wait_ms=1000)
+
+    existing = writes.submit(build_record("https://example.com", RESULT)).result(5)
+
+    insert = writes._insert
+
+    def insert_racing_another_writer(records):
+        try:
+            return insert(records)
+        except Exception:
+            if len(records) > 1:
+                # Another writer takes the ids the failed flush handed out
+                db = factory()
+                db.add_all([build_record(f"https://other{i}.example", RESULT) for i in range(3)])
+                db.commit()
+                db.close()
+            raise
+
+    writes._insert = insert_racing_another_writer
+
+    duplicate = build_record("https://duplicate.example", RESULT)
+    duplicate.id = existing
+
+    futures = [writes.submit(build_record(f"https://site{i}.example", RESULT)) for i in range(3)]
+    bad = writes.submit(duplicate)
+    writes.stop()
+
+    assert bad.exception() is not None
+    assert all(future.exception() is None for future in futures)
+    assert writes.stats()["failed"] == 1
+    assert factory().query(ComplianceResult).count() == 7
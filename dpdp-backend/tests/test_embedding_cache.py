@@ -0,0 +1,85 @@
+import numpy as np
+
+from services.embedding_cache import SentenceEmbeddingStore
+
+
+class CountingEncoder:
+
+    def __init__(self):
+        self.encoded = []
+
+    def __call__(self, sentences):
+        self.encoded.extend(sentences)
+        return np.array([[len(s), 1.0, 0.5, 0.25] for s in sentences], dtype=np.float32)
+
+
+def test_only_misses_are_encoded(tmp_path):
+    store = SentenceEmbeddingStore("model", str(tmp_path), 1024)
+    encoder = CountingEncoder()
+
+    first = store.encode(["cookie text", "grievance text"], encoder)
+    second = store.encode(["grievance text", "new text", "new text"], encoder)
+
+    assert encoder.encoded == ["cookie text", "grievance text", "new text"]
+    assert np.array_equal(first[1], second[0])
+    assert store.stats()["hits"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    # 4 dims * 2 bytes * 2 slots
+    store = SentenceEmbeddingStore("model", str(tmp_path), 16)
+    encoder = CountingEncoder()
+
+    store.encode(["a"], encoder)
+    store.encode(["b"], encoder)
+    store.encode(["a"], encoder)
+    store.encode(["c"], encoder)
+    store.encode(["a", "b"], encoder)
+
+    assert encoder.encoded == ["a", "b", "c", "b"]
+    assert store.stats()["bytes_used"] == 16
+
+
+def test_store_reopens_from_disk(tmp_path):
+    store = SentenceEmbeddingStore("model", str(tmp_path), 1024)
+    store.encode(["persisted sentence"], CountingEncoder())
+    store.flush()
+
+    reopened = SentenceEmbeddingStore("model", str(tmp_path), 1024)
+    encoder = CountingEncoder()
+    reopened.encode(["persisted sentence"], encoder)
+
+    assert encoder.encoded == []
+
+
+def test_other_model_starts_empty(tmp_path):
+    store = SentenceEmbeddingStore("model", str(tmp_path), 1024)
+    store.encode(["persisted sentence"], CountingEncoder())
+    store.flush()
+
+    other = SentenceEmbeddingStore("other-model", str(tmp_path), 1024)
+    encoder = CountingEncoder()
+    other.encode(["persisted sentence"], encoder)
+
+    assert encoder.encoded == ["persisted sentence"]
+
+
+def test_scores_do_not_depend_on_the_store_being_enabled(tmp_path, monkeypatch):
+    from core.config import settings
+    from services import scoring_engine
+
+    sentences = ["cookie text", "grievance text"]
+    vectors = np.random.default_rng(0).normal(size=(2, 8)).astype(np.float32)
+
+    monkeypatch.setattr(settings, "INFERENCE_SCHEDULER", False)
+    monkeypatch.setattr(scoring_engine, "_model_encode", lambda batch: vectors[[sentences.index(s) for s in batch]])
+
+    monkeypatch.setattr(scoring_engine, "get_embedding_store", lambda name: None)
+    uncached = scoring_engine.encode_sentences(sentences)
+
+    store = SentenceEmbeddingStore("model", str(tmp_path), 1024)
+    monkeypatch.setattr(scoring_engine, "get_embedding_store", lambda name: store)
+
+    assert np.array_equal(scoring_engine.encode_sentences(sentences), uncached)
+    assert np.array_equal(scoring_engine.encode_sentences(sentences), uncached)
+    assert store.stats()["hits"] == 2
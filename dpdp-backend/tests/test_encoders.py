@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from core.config import settings
+from services import encoders
+from services.encoders import available_backend, create_encoder, encoder_key
+
+
+class FakeEncoder:
+
+    backend = None
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def encode(self, sentences, batch_size=32):
+        return np.zeros((len(sentences), 4), dtype=np.float32)
+
+
+def fake_backends(monkeypatch, onnxruntime=True):
+
+    classes = {
+        backend: type(f"Fake{backend}", (FakeEncoder,), {"backend": backend})
+        for backend in encoders.BACKENDS
+    }
+
+    monkeypatch.setattr(encoders, "_ENCODERS", classes)
+    monkeypatch.setattr(encoders, "_has_onnxruntime", lambda: onnxruntime)
+
+
+def test_backend_is_selected_from_settings(monkeypatch):
+    fake_backends(monkeypatch)
+    monkeypatch.setattr(settings, "ENCODER_BACKEND", "onnx-int8")
+
+    encoder = create_encoder(model_name="tiny-model")
+
+    assert encoder.backend == "onnx-int8"
+    assert encoder.model_name == "tiny-model"
+    assert create_encoder("torch-int8", "tiny-model").backend == "torch-int8"
+
+    with pytest.raises(ValueError):
+        create_encoder("tensorflow")
+
+
+def test_onnx_falls_back_to_torch_without_onnxruntime(monkeypatch, caplog):
+    fake_backends(monkeypatch, onnxruntime=False)
+
+    assert create_encoder("onnx", "tiny-model").backend == "torch"
+    assert create_encoder("onnx-int8", "tiny-model").backend == "torch-int8"
+    assert "requires onnxruntime" in caplog.text
+
+    # The fallback's cache key is the torch one, not the ONNX one
+    assert encoder_key("onnx", "tiny-model") == encoder_key("torch", "tiny-model") == "tiny-model"
+    assert available_backend("onnx-int8") == "torch-int8"
+
+
+def test_parity_check_does_not_fall_back(monkeypatch):
+    fake_backends(monkeypatch, onnxruntime=False)
+
+    # The real OnnxEncoder then raises for the missing package
+    assert create_encoder("onnx", "tiny-model", fallback=False).backend == "onnx"
+
+
+def test_each_backend_has_its_own_cache_key(monkeypatch):
+    fake_backends(monkeypatch)
+
+    keys = {backend: encoder_key(backend, "tiny-model") for backend in encoders.BACKENDS}
+
+    assert keys["torch"] == "tiny-model"
+    assert len(set(keys.values())) == len(encoders.BACKENDS)
+    assert encoder_key("torch", "other-model") != keys["torch"]
@@ -28,3 +28,14 @@ def test_cors_headers():
     assert response.status_code == 200
     assert "access-control-allow-origin" in response.headers
 
+
+def test_liveness_does_not_need_model():
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_readiness_reports_model_state():
+    response = client.get("/health/ready")
+    assert response.status_code in (200, 503)
+    assert "state" in response.json()["model"]
@@ -0,0 +1,71 @@
+from services.html_extractor import extract_blocks, extract_text
+
+
+SENTENCE = "We process personal data only for the purpose stated in this notice."
+
+
+def test_nested_divs_yield_each_block_once():
+    html = "<div>" * 10 + f"<p>{SENTENCE}</p>" + "</div>" * 10
+
+    texts = [block.text for block in extract_blocks(html)]
+
+    assert texts == [SENTENCE]
+
+
+def test_text_around_child_blocks_keeps_document_order():
+    html = "<div>Before <b>bold</b><p>Inside</p>After<ul><li>Item</li></ul>End</div>"
+
+    texts = [block.text for block in extract_blocks(html)]
+
+    assert texts == ["Before bold", "Inside", "After", "Item", "End"]
+
+
+def test_boilerplate_and_scripts_are_skipped():
+    html = (
+        "<html><head><title>Title</title><script>if (a</b) {}</script></head><body>"
+        "<nav><a href='/'>Home page navigation link</a></nav>"
+        f"<p>{SENTENCE}</p>"
+        "<div><a href='/1'>A long list of links to other pages</a></div>"
+        "<footer>Copyright notice for the whole site</footer>"
+        "</body></html>"
+    )
+
+    assert extract_text(html) == SENTENCE
+
+
+def test_main_region_is_preferred():
+    policy = " ".join(f"{SENTENCE} Clause {i}." for i in range(10))
+    html = (
+        "<body><div>Unrelated promotional text that is long enough to keep.</div>"
+        f"<main><p>{policy}</p></main></body>"
+    )
+
+    assert extract_text(html) == policy
+
+
+def test_chunked_input_matches_whole_document():
+    html = (
+        "<html><head><script>var x = '</scr' + 'ipt>';</script></head><body>"
+        + "".join(f"<section><h2>Part {i}</h2><p>{SENTENCE} {i}</p></section>" for i in range(20))
+        + "</body></html>"
+    )
+
+    whole = [block.text for block in extract_blocks(html)]
+
+    for size in (3, 17, 256):
+        assert [block.text for block in extract_blocks(html, chunk_size=size)] == whole
+
+    assert [block.text for block in extract_blocks(html.encode(), chunk_size=5)] == whole
+
+
+def test_empty_documents_have_no_text():
+    assert extract_text("") == ""
+    assert extract_text(" \n\t") == ""
+    assert extract_blocks(b"") == []
+
+
+def test_bytes_default_to_utf8_unless_a_charset_is_declared():
+    assert [block.text for block in extract_blocks("<p>café</p>".encode("utf-8"))] == ["café"]
+
+    latin = '<html><head><meta charset="iso-8859-1"></head><body><p>café</p></body></html>'.encode("latin-1")
+    assert [block.text for block in extract_blocks(latin)] == ["café"]
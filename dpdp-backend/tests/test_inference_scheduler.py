@@ -0,0 +1,63 @@
+import threading
+
+import numpy as np
+
+from services.inference_scheduler import InferenceScheduler
+
+
+class RecordingEncoder:
+
+    def __init__(self):
+        self.batches = []
+        self.release = threading.Event()
+
+    def __call__(self, sentences):
+        self.release.wait(5)
+        self.batches.append(list(sentences))
+        return np.array([[float(s.split("-")[1])] for s in sentences])
+
+
+def test_concurrent_callers_get_their_own_slices():
+    encoder = RecordingEncoder()
+    scheduler = InferenceScheduler(encoder, max_batch_size=8, max_wait_ms=50)
+
+    futures = [
+        scheduler.submit([f"s-{caller * 10 + i}" for i in range(3)])
+        for caller in range(4)
+    ]
+    encoder.release.set()
+
+    for caller, future in enumerate(futures):
+        expected = [[caller * 10 + i] for i in range(3)]
+        assert future.result(5).tolist() == expected
+
+    scheduler.stop()
+
+    assert all(len(batch) <= 8 for batch in encoder.batches)
+    assert len(encoder.batches) < len(futures)
+
+
+def test_large_request_is_split_into_bounded_batches():
+    encoder = RecordingEncoder()
+    encoder.release.set()
+    scheduler = InferenceScheduler(encoder, max_batch_size=4, max_wait_ms=1)
+
+    embeddings = scheduler.encode([f"s-{i}" for i in range(10)])
+    scheduler.stop()
+
+    assert embeddings[:, 0].tolist() == list(range(10))
+    assert max(len(batch) for batch in encoder.batches) == 4
+
+
+def test_encode_errors_reach_the_caller():
+
+    def failing_encoder(sentences):
+        raise ValueError("model unavailable")
+
+    scheduler = InferenceScheduler(failing_encoder, max_batch_size=4, max_wait_ms=1)
+
+    future = scheduler.submit(["s-1"])
+    scheduler_error = future.exception(5)
+    scheduler.stop()
+
+    assert isinstance(scheduler_error, ValueError)
@@ -0,0 +1,115 @@
+import io
+import asyncio
+import zipfile
+
+import pytest
+
+from core.config import settings
+from services import ingestion, scoring_engine
+from services.ingestion import (
+    DOCX, HTML, PDF, TEXT, UnsupportedFormat, UploadTooLarge,
+    detect_format, iter_document_text, spool_upload
+)
+
+
+class FakeUpload:
+
+    def __init__(self, data, filename="policy.txt", content_type=None):
+        self._stream = io.BytesIO(data)
+        self.filename = filename
+        self.content_type = content_type
+        self.reads = []
+
+    async def read(self, size=-1):
+        self.reads.append(size)
+        return self._stream.read(size)
+
+
+def make_docx(paragraphs):
+
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(
+        f"<w:p><w:r><w:t>{first}</w:t></w:r><w:r><w:t xml:space=\"preserve\"> {rest}</w:t></w:r></w:p>"
+        for first, rest in (p.split(" ", 1) for p in paragraphs)
+    )
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", f'<w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>')
+
+    return buffer.getvalue()
+
+
+def test_format_is_detected_from_content_before_the_name():
+    assert detect_format(b"%PDF-1.7\n...", "policy.txt") == PDF
+    assert detect_format(b"PK\x03\x04...", "policy.bin") == DOCX
+    assert detect_format(b"\xef\xbb\xbf  <!DOCTYPE html><html>", "policy.txt") == HTML
+    assert detect_format(b"We collect data.", "policy.htm") == HTML
+    assert detect_format(b"We collect data.", "policy") == TEXT
+
+    with pytest.raises(UnsupportedFormat):
+        detect_format(b"\xd0\xcf\x11\xe0\xa1\xb1", "policy.doc")
+
+
+def test_docx_paragraphs_are_extracted_in_order():
+    data = make_docx(["We collect your email address.", "You may withdraw consent at any time."])
+
+    text = "".join(iter_document_text(io.BytesIO(data), DOCX))
+
+    assert text.split() == "We collect your email address. You may withdraw consent at any time.".split()
+
+
+def test_malformed_docx_is_an_unsupported_format():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", "<w:document><w:body><w:p>unclosed")
+
+    with pytest.raises(UnsupportedFormat):
+        "".join(iter_document_text(io.BytesIO(buffer.getvalue()), DOCX))
+
+
+def test_empty_html_upload_has_no_text():
+    assert "".join(iter_document_text(io.BytesIO(b""), HTML)) == ""
+    assert "".join(iter_document_text(io.BytesIO(b"  \n "), HTML)) == ""
+
+
+def test_text_is_decoded_across_chunk_boundaries():
+    data = "Données personnelles sont protégées. ".encode("utf-8") * 10
+
+    assert "".join(iter_document_text(io.BytesIO(data), TEXT, chunk_size=7)) == data.decode("utf-8")
+
+
+def test_upload_is_read_in_chunks_and_capped(monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_SPOOL_BYTES", 16)
+
+    upload = FakeUpload(b"x" * 100)
+    spooled = asyncio.run(spool_upload(upload, max_bytes=100, chunk_size=32))
+
+    assert spooled.read() == b"x" * 100
+    assert set(upload.reads) == {32}
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(spool_upload(FakeUpload(b"x" * 101), max_bytes=100, chunk_size=32))
+
+
+def test_long_documents_are_scored_as_a_stream(monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_THRESHOLD_CHARS", 100)
+    monkeypatch.setattr(settings, "UPLOAD_READ_CHUNK", 64)
+
+    seen = {}
+
+    def fake_stream(pieces, packs=None):
+        seen["pieces"] = list(pieces)
+        return {"overall_score": 0.0}
+
+    monkeypatch.setattr(scoring_engine, "analyze_compliance_stream", fake_stream)
+
+    sentence = "We retain personal data only as long as necessary. "
+    data = make_docx([sentence.strip()] * 20)
+
+    result = asyncio.run(ingestion.analyze_upload(FakeUpload(data, "policy.docx")))
+
+    assert result == {"overall_score": 0.0}
+    assert len(seen["pieces"]) == 20
+    assert "".join(seen["pieces"]).split() == (sentence * 20).split()
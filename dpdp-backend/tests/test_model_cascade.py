@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from core.config import settings
+from services import model_cascade, scoring_engine
+from services.clause_index import ClauseIndex
+from services.result_cache import ResultCache
+
+
+CLAUSES = [
+    {"title": "Notice", "section": "Section 5", "category": "Transparency", "description": "notice"},
+    {"title": "Retention", "section": "Section 8", "category": "Storage", "description": "retention"},
+    {"title": "Grievance", "section": "Section 13", "category": "Rights", "description": "grievance"}
+]
+
+NOTICE = "We give notice before we collect anything"
+RETENTION = "Data is kept only as long as we need it"
+OTHER = "Our offices are open on weekdays only"
+
+FAST = {
+    NOTICE: [1.0, 0.0, 0.0, 0.0],
+    RETENTION: [0.0, 0.4, np.sqrt(1 - 0.16), 0.0],
+    OTHER: [0.0, 0.0, 1.0, 0.0]
+}
+
+
+POLICY = f"{NOTICE}. {RETENTION}. {OTHER}."
+
+
+@pytest.fixture
+def setup(monkeypatch, fake_encoder):
+    clause_index = ClauseIndex(
+        "fast-model", "clauses-hash", CLAUSES,
+        np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=np.float32)
+    )
+
+    strong_calls = []
+
+    def encode_strong(sentences):
+        strong_calls.append(list(sentences))
+        return np.array([[0, 1, 0, 0] if s == RETENTION else [0, 0, 1, 0] for s in sentences], dtype=np.float32)
+
+    monkeypatch.setattr(settings, "CASCADE_BAND", 10.0)
+    monkeypatch.setattr(settings, "CASCADE_CANDIDATES", 2)
+    monkeypatch.setattr(scoring_engine, "load_clause_index", lambda: clause_index)
+    monkeypatch.setattr(
+        scoring_engine, "encode_sentences",
+        lambda sentences: np.array([FAST[s] for s in sentences], dtype=np.float32)
+    )
+    monkeypatch.setattr(model_cascade, "encode_strong", encode_strong)
+    monkeypatch.setattr(model_cascade, "strong_clause_embeddings", lambda index: np.eye(4, dtype=np.float32)[[0, 1, 3]])
+
+    stats = model_cascade.CascadeStats()
+    monkeypatch.setattr(scoring_engine, "cascade_stats", stats)
+
+    return strong_calls, stats
+
+
+def test_only_borderline_clauses_reach_the_strong_model(setup):
+    strong_calls, stats = setup
+
+    fast = scoring_engine.analyze_compliance(POLICY, top_k=1, cascade=False)
+    result = scoring_engine.analyze_compliance(POLICY, top_k=1, cascade=True)
+
+    # Retention sat at 40 (threshold 35 +/- 10): the strong model decides it
+    assert fast["section_analysis"]["Retention"]["status"] == "Matched"
+    assert fast["section_analysis"]["Retention"]["similarity_score"] == 40.0
+    assert result["section_analysis"]["Retention"]["similarity_score"] == 100.0
+
+    # Clear decisions keep the fast model's scores
+    assert result["section_analysis"]["Notice"] == fast["section_analysis"]["Notice"]
+    assert result["section_analysis"]["Grievance"] == fast["section_analysis"]["Grievance"]
+
+    # Only Retention's two candidate sentences were encoded again
+    assert len(strong_calls) == 1
+    assert len(strong_calls[0]) == 2 and RETENTION in strong_calls[0]
+
+    cascade = result["cascade"]
+    assert (cascade["decided_fast"], cascade["decided_strong"]) == (2, 1)
+    assert cascade["escalated_clauses"] == ["Retention"]
+    assert result["explanations"][1]["policy_sentence"] == RETENTION
+
+    assert stats.stats()["decided_strong"] == 1
+    assert stats.stats()["escalation_rate"] == round(1 / 3, 4)
+
+
+def test_batch_analysis_runs_the_cascade(monkeypatch, setup):
+    strong_calls, stats = setup
+    monkeypatch.setattr(settings, "MODEL_CASCADE", True)
+
+    single = scoring_engine.analyze_compliance(POLICY, top_k=1)
+    batch, = scoring_engine.analyze_many([POLICY], top_k=1)
+
+    assert batch["section_analysis"] == single["section_analysis"]
+    assert batch["cascade"]["escalated_clauses"] == ["Retention"]
+    assert len(strong_calls) == 2
+
+    # Cascaded results are cached apart from fast-only ones
+    monkeypatch.setattr(scoring_engine, "result_cache", ResultCache(16))
+
+    fast, = scoring_engine.analyze_many([POLICY], top_k=1, cascade=False)
+    cascaded, = scoring_engine.analyze_many([POLICY], top_k=1, cascade=True)
+
+    assert "cascade" not in fast
+    assert cascaded["cascade"]["decided_strong"] == 1
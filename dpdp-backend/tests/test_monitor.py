@@ -0,0 +1,89 @@
+import time
+import asyncio
+
+from services.crawler import FAILED, MODIFIED, NOT_MODIFIED, UNCHANGED, PolicyFetch, close_crawler
+from services.http_cache import HttpCache
+from services.monitor import PolicyMonitor
+from tests.test_crawler import StubHandler, server_url  # noqa: F401
+
+
+class RecordingMonitor(PolicyMonitor):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.analyzed = []
+
+    async def analyze(self, url, text):
+        self.analyzed.append(url)
+        return 80.0
+
+
+def scan_twice(monitor, url):
+
+    async def main():
+        try:
+            return [await monitor.scan(url), await monitor.scan(url)]
+        finally:
+            await close_crawler()
+
+    return asyncio.run(main())
+
+
+def test_unchanged_pages_skip_analysis(server_url, tmp_path):
+    urls = [server_url + "/etag", server_url + "/policy"]
+    monitor = RecordingMonitor(urls, interval=60, jitter=0, cache=HttpCache(str(tmp_path)))
+
+    assert scan_twice(monitor, urls[0]) == [MODIFIED, NOT_MODIFIED]
+    assert scan_twice(monitor, urls[1]) == [MODIFIED, UNCHANGED]
+    assert monitor.analyzed == urls
+
+    states = {state["url"]: state for state in monitor.status()["urls"]}
+    assert states[urls[0]]["checks"] == 2
+    assert states[urls[0]]["analyses"] == 1
+    assert states[urls[1]]["overall_score"] == 80.0
+
+
+def test_due_urls_are_rescheduled_with_jitter(tmp_path):
+    monitor = RecordingMonitor(["http://a", "http://b"], interval=100, jitter=0.2, cache=HttpCache(str(tmp_path)))
+
+    async def no_scan(url):
+        return url
+
+    monitor.scan = no_scan
+
+    for state in monitor.status()["urls"]:
+        monitor._state[state["url"]]["next_check"] = 0
+
+    start = time.time()
+
+    assert sorted(asyncio.run(monitor.run_due())) == ["http://a", "http://b"]
+
+    for state in monitor.status()["urls"]:
+        assert start + 80 <= state["next_check"] <= time.time() + 120
+
+    assert asyncio.run(monitor.run_due()) == []
+
+
+def test_one_failing_url_does_not_stop_the_others(tmp_path, monkeypatch):
+    from services import monitor as monitor_module
+
+    async def fetch(url, crawler=None, cache=None):
+        if url == "http://broken":
+            raise ValueError("no element found")
+        return PolicyFetch(url, MODIFIED, "policy text", {"text": "policy text"})
+
+    monkeypatch.setattr(monitor_module, "fetch_policy_conditional", fetch)
+    monkeypatch.setattr(monitor_module, "get_crawler", lambda: None)
+
+    monitor = RecordingMonitor(["http://broken", "http://ok"], interval=100, jitter=0, cache=HttpCache(str(tmp_path)))
+
+    for url in ("http://broken", "http://ok"):
+        monitor._state[url]["next_check"] = 0
+
+    statuses = asyncio.run(monitor.run_due())
+
+    states = {state["url"]: state for state in monitor.status()["urls"]}
+
+    assert statuses == [FAILED, MODIFIED]
+    assert states["http://broken"]["error"] == "no element found"
+    assert monitor.analyzed == ["http://ok"]
@@ -0,0 +1,97 @@
+import pytest
+
+from core.config import settings
+from services import scoring_engine
+from services.nlp_analyzer import KeywordMatcher, analyze_text, candidate_sentences, tokenize
+
+
+def test_keywords_match_whole_words_only():
+    matcher = KeywordMatcher({"Use": ["use"], "Pronoun": ["he", "she", "hers"]})
+
+    words = tokenize("Because she uses ushers, we USE it")
+
+    assert [(words[start:end], label) for start, end, label in matcher.find(words)] == [
+        (["she"], "Pronoun"),
+        (["use"], "Use")
+    ]
+
+
+def test_phrases_match_across_whitespace():
+    matcher = KeywordMatcher({"Grievance": ["grievance officer"], "Data": ["personal data"]})
+
+    assert matcher.match("Write to our Grievance\n   Officer about your personal data.") == {
+        "Grievance", "Data"
+    }
+    assert matcher.match("Write to the data grievance officer") == {"Grievance"}
+    assert matcher.match("Officer grievance, data personal") == set()
+
+
+def test_analyze_text_uses_clause_keywords():
+    detected = analyze_text("You can withdraw consent or contact us with a complaint.")
+
+    assert detected == ["Consent", "Grievance Redressal"]
+
+
+# ==============================
+# Cascade
+# ==============================
+CLAUSES = [
+    {"title": "Consent", "section": "6", "category": "Consent", "description": "consent",
+     "keywords": ["consent", "opt out"]},
+    {"title": "Security", "section": "8", "category": "Security", "description": "security",
+     "keywords": ["encrypt", "encryption"]}
+]
+
+
+POLICY = (
+    "We ask for your consent before processing anything. "
+    "Our office is open on weekdays from nine to five. "
+    "All stored records use strong encryption at rest. "
+    "The weather in our city is usually very pleasant. "
+    "You can opt out of marketing messages at any time. "
+)
+
+
+@pytest.fixture
+def encoded(fake_clauses):
+    return fake_clauses(CLAUSES, "test-keyword-clauses")
+
+
+def test_cascade_embeds_only_candidate_sentences(encoded):
+    result = scoring_engine.analyze_compliance(POLICY, top_k=2, prefilter=True)
+
+    assert result["prefilter"] == {"sentences": 5, "candidates": 3, "pruned": 2}
+    assert len(encoded) == 1
+    assert all("weather" not in s and "office" not in s for s in encoded[0])
+
+
+def test_cascade_scores_never_exceed_a_full_scan(encoded):
+    report = scoring_engine.compare_prefilter(POLICY, top_k=2)
+
+    assert report["pruned"] == 2
+    assert report["drift"]["max_clause"] >= 0
+    assert all(delta >= 0 for delta in report["drift"]["clauses"].values())
+
+
+def test_audited_requests_report_drift(monkeypatch, encoded):
+    monkeypatch.setattr(settings, "KEYWORD_PREFILTER_AUDIT_RATE", 1.0)
+
+    result = scoring_engine.analyze_compliance(POLICY, top_k=2, prefilter=True)
+
+    assert set(result["prefilter"]["drift"]["clauses"]) == {"Consent", "Security"}
+
+
+def test_batch_analysis_applies_the_prefilter(monkeypatch, encoded):
+    monkeypatch.setattr(settings, "KEYWORD_PREFILTER", True)
+
+    results = scoring_engine.analyze_many([POLICY, POLICY.upper()], top_k=2)
+
+    assert len(encoded) == 1
+    assert not any("weather" in s.lower() for s in encoded[0])
+    assert results[0] == scoring_engine.analyze_compliance(POLICY, top_k=2, prefilter=True)
+
+
+def test_sentences_without_keywords_are_not_candidates():
+    matcher = KeywordMatcher({"Consent": ["consent"]})
+
+    assert candidate_sentences(["Nothing relevant here at all"], matcher) == []
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from core.config import settings
+from services import scoring_engine
+from services.result_cache import ResultCache
+from services.similarity import top_k_matches
+from tests.conftest import fake_vector
+
+
+CLAUSES = [
+    {"title": f"Clause {i}", "section": f"Section {i}", "category": "Test", "description": f"clause {i}"}
+    for i in range(6)
+]
+
+
+def policy(sentences):
+    return ". ".join(sentences) + "."
+
+
+SENTENCES = [f"The company processes personal data for purpose number {i}" for i in range(40)]
+
+
+@pytest.fixture
+def setup(monkeypatch, tmp_path, fake_clauses):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "POLICY_VERSION_DIR", str(tmp_path / "versions"))
+    monkeypatch.setattr("services.policy_versions._store", None)
+
+    return fake_clauses(CLAUSES)
+
+
+def test_only_changed_sentences_are_encoded(setup):
+    encoded = setup
+    url = "https://example.com/privacy"
+
+    first = scoring_engine.analyze_policy_version(url, policy(SENTENCES), top_k=3)
+
+    edited = SENTENCES[:10] + ["A brand new sentence about grievance redressal officers"] + SENTENCES[12:]
+    second = scoring_engine.analyze_policy_version(url, policy(edited), top_k=3)
+
+    assert first["version_changes"]["sentences_encoded"] == 40
+    assert encoded[-1] == ["A brand new sentence about grievance redressal officers"]
+
+    changes = second["version_changes"]
+    assert changes["sentences_added"] == 1
+    assert changes["sentences_removed"] == 2
+    assert changes["previous_analyzed_at"] is not None
+
+
+def test_incremental_scores_match_full_rescoring(setup):
+    url = "https://example.com/privacy"
+
+    scoring_engine.analyze_policy_version(url, policy(SENTENCES), top_k=3)
+
+    edited = [s for i, s in enumerate(SENTENCES) if i % 7] + [f"Added sentence describing retention period {i}" for i in range(5)]
+    result = scoring_engine.analyze_policy_version(url, policy(edited), top_k=3)
+
+    embeddings = scoring_engine._round_embeddings(np.stack([fake_vector(s) for s in edited]))
+    indices, scores = top_k_matches(scoring_engine.load_clause_index().embeddings, embeddings, 3)
+
+    for explanation, row_indices, row_scores in zip(result["explanations"], indices, scores):
+        assert [e["policy_sentence"] for e in explanation["evidence"]] == [edited[j] for j in row_indices]
+        assert explanation["similarity_score"] == round(float(row_scores[0]) * 100, 2)
+
+
+def test_moved_clauses_name_the_responsible_sentences(setup):
+    url = "https://example.com/privacy"
+
+    first = scoring_engine.analyze_policy_version(url, policy(SENTENCES), top_k=1)
+    best = first["explanations"][0]["policy_sentence"]
+
+    second = scoring_engine.analyze_policy_version(
+        url, policy([s for s in SENTENCES if s != best]), top_k=1
+    )
+
+    moved = {c["clause_title"]: c for c in second["version_changes"]["clauses_moved"]}
+
+    assert "Clause 0" in moved
+    assert moved["Clause 0"]["removed_sentences"] == [best]
+    assert moved["Clause 0"]["delta"] < 0
+
+
+def test_keyword_prefilter_bypasses_the_incremental_path(monkeypatch, setup):
+    monkeypatch.setattr(settings, "KEYWORD_PREFILTER", True)
+
+    result = scoring_engine.analyze_policy_version("https://example.com/privacy", policy(SENTENCES), top_k=3)
+
+    assert "prefilter" in result
+    assert "version_changes" not in result
+
+
+def test_unchanged_versions_are_served_from_the_result_cache(monkeypatch, setup):
+    encoded = setup
+    monkeypatch.setattr(scoring_engine, "result_cache", ResultCache(16))
+    url = "https://example.com/privacy"
+
+    first = scoring_engine.analyze_policy_version(url, policy(SENTENCES), top_k=3)
+    again = scoring_engine.analyze_policy_version(url, policy(SENTENCES), top_k=3)
+
+    assert len(encoded) == 1
+    assert again["explanations"] == first["explanations"]
+    assert again["version_changes"]["sentences_encoded"] == 0
+    assert again["version_changes"]["previous_analyzed_at"] is not None
+
+    # A changed text still diffs against the stored version
+    edited = SENTENCES[:-1] + ["A brand new sentence about grievance redressal officers"]
+    changed = scoring_engine.analyze_policy_version(url, policy(edited), top_k=3)
+
+    assert encoded[-1] == ["A brand new sentence about grievance redressal officers"]
+    assert changed["version_changes"]["sentences_removed"] == 1
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.db import Base
+from models.report_history_model import ReportHistory
+from services import report_history
+
+
+def make_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def add_reports(db, count):
+    for i in range(count):
+        db.add(ReportHistory(
+            source=f"https://site{i % 3}.example/privacy",
+            score=float(i),
+            risk="High Risk" if i % 2 else "Low Risk",
+            created_at=datetime(2024, 1, 1 + i)
+        ))
+    db.commit()
+
+
+def test_keyset_pages_cover_every_row_once(tmp_path):
+    db = make_session(tmp_path)()
+    add_reports(db, 10)
+
+    seen, cursor = [], None
+
+    while True:
+        items, cursor = report_history.get_history_page(db, 4, before_id=cursor)
+        seen.extend(item["id"] for item in items)
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 10
+
+
+def test_history_without_a_limit_is_not_paginated(tmp_path):
+    db = make_session(tmp_path)()
+    add_reports(db, 30)
+
+    items, cursor = report_history.get_history_page(db)
+
+    assert len(items) == 30
+    assert cursor is None
+
+
+def test_filters_combine(tmp_path):
+    db = make_session(tmp_path)()
+    add_reports(db, 10)
+
+    items, _ = report_history.get_history_page(
+        db, 100,
+        url="https://site0.example/privacy",
+        risk="Low Risk",
+        date_from=datetime(2024, 1, 2),
+        date_to=datetime(2024, 1, 9)
+    )
+
+    assert [item["score"] for item in items] == [6.0]
+    assert set(items[0]) == {"id", "filename", "score", "risk", "date"}
+
+
+def test_csv_export_streams_all_rows(tmp_path):
+    factory = make_session(tmp_path)
+    add_reports(factory(), 5)
+
+    lines = "".join(report_history.iter_history_csv(factory, batch_size=2)).splitlines()
+
+    assert lines[0] == "filename,score,risk,date"
+    assert len(lines) == 6
+
+
+def test_legacy_json_history_is_imported_once(tmp_path):
+    db = make_session(tmp_path)()
+    legacy = tmp_path / "report_history.json"
+    legacy.write_text('[{"filename": "a.txt", "score": 50, "risk": "Medium Risk", "date": "2024-03-01 10:00"}]')
+
+    assert report_history.import_legacy_history(db, str(legacy)) == 1
+    assert not legacy.exists()
+
+    items, _ = report_history.get_history_page(db, 10)
+    assert items[0]["date"] == "2024-03-01 10:00"
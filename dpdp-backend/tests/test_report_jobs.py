@@ -0,0 +1,104 @@
+import os
+import threading
+
+import pytest
+
+from services.report_jobs import DONE, FAILED, QueueFull, ReportJobQueue
+
+
+RESULT = {
+    "overall_score": 60.0,
+    "risk_level": "Medium Risk",
+    "missing_clauses": ["Data Retention"],
+    "recommendations": ["Define a retention period."],
+    "section_analysis": {
+        "Consent": {"section": "6", "status": "Matched", "similarity_score": 0.71}
+    },
+    "graph_path": ""
+}
+
+
+def test_each_report_gets_its_own_file(tmp_path):
+    queue = ReportJobQueue(str(tmp_path), max_workers=2)
+
+    jobs = [queue.submit(RESULT, f"https://site-{i}.example") for i in range(4)]
+    for job in jobs:
+        job.future.result(30)
+
+    queue.shutdown()
+
+    assert len({job.id for job in jobs}) == 4
+    assert len({job.path for job in jobs}) == 4
+
+    for job in jobs:
+        assert job.status == DONE
+        with open(job.path, "rb") as f:
+            assert f.read(4) == b"%PDF"
+
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_full_queue_rejects_new_reports(tmp_path):
+    release = threading.Event()
+
+    def render(result, website_url, path):
+        release.wait(5)
+
+    queue = ReportJobQueue(str(tmp_path), max_workers=1, max_pending=2, render_fn=render)
+
+    queue.submit(RESULT, "https://a.example")
+    queue.submit(RESULT, "https://b.example")
+
+    with pytest.raises(QueueFull):
+        queue.submit(RESULT, "https://c.example")
+
+    release.set()
+    queue.shutdown()
+
+    assert queue.stats()["pending"] == 0
+
+
+def test_failed_render_is_reported(tmp_path):
+
+    def render(result, website_url, path):
+        raise ValueError("boom")
+
+    queue = ReportJobQueue(str(tmp_path), render_fn=render)
+
+    job = queue.submit(RESULT, "https://a.example")
+    job.future.result(5)
+    queue.shutdown()
+
+    assert job.status == FAILED
+    assert job.error == "boom"
+    assert queue.get(job.id) is job
+
+
+def test_only_generated_ids_map_to_files(tmp_path):
+    queue = ReportJobQueue(str(tmp_path), render_fn=lambda *args: None)
+
+    assert queue.path_for("../../etc/passwd") is None
+    assert queue.path_for("a" * 32) == os.path.join(str(tmp_path), "a" * 32 + ".pdf")
+
+    queue.shutdown()
+
+
+def test_download_without_id_returns_202_while_rendering(monkeypatch, tmp_path):
+    from api import routes
+    from core.config import settings
+
+    release = threading.Event()
+    queue = ReportJobQueue(str(tmp_path), max_workers=1, render_fn=lambda *args: release.wait(5))
+
+    monkeypatch.setattr(routes, "get_report_queue", lambda: queue)
+    monkeypatch.setattr(settings, "REPORT_WAIT_SECONDS", 0.05)
+
+    queue.submit(RESULT, "https://a.example")
+    assert queue.latest().future is not None
+
+    response = routes.download_report(report_id=None)
+
+    release.set()
+    queue.shutdown()
+
+    assert response.status_code == 202
@@ -0,0 +1,60 @@
+import os
+import time
+
+from services.result_cache import ResultCache, make_key
+
+
+def test_key_depends_on_settings_and_content():
+    base = make_key(["a sentence"], "model", 35, "hash", 3)
+
+    assert base == make_key(["a sentence"], "model", 35.0, "hash", 3)
+    assert base != make_key(["another sentence"], "model", 35, "hash", 3)
+    assert base != make_key(["a sentence"], "other-model", 35, "hash", 3)
+    assert base != make_key(["a sentence"], "model", 40, "hash", 3)
+    assert base != make_key(["a sentence"], "model", 35, "new-hash", 3)
+
+
+def test_memory_tier_is_lru():
+    cache = ResultCache(max_entries=2)
+
+    cache.put("a", {"score": 1})
+    cache.put("b", {"score": 2})
+    cache.get("a")
+    cache.put("c", {"score": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"score": 1}
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_tier_survives_memory_eviction(tmp_path):
+    cache = ResultCache(max_entries=1, disk_dir=str(tmp_path))
+
+    cache.put("a", {"score": 1})
+    cache.put("b", {"score": 2})
+
+    assert cache.get("a") == {"score": 1}
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_expires_entries(tmp_path):
+    cache = ResultCache(max_entries=1, disk_dir=str(tmp_path), ttl_seconds=60)
+
+    cache.put("a", {"score": 1})
+    cache.put("b", {"score": 2})
+
+    old = time.time() - 120
+    os.utime(tmp_path / "a.json", (old, old))
+
+    assert cache.get("a") is None
+    assert not (tmp_path / "a.json").exists()
+
+
+def test_disk_tier_respects_size_budget(tmp_path):
+    cache = ResultCache(max_entries=1, disk_dir=str(tmp_path), max_disk_bytes=150)
+
+    for key in "abcde":
+        cache.put(key, {"text": "x" * 40})
+
+    assert cache.stats()["disk_bytes"] <= 150
+    assert (tmp_path / "e.json").exists()
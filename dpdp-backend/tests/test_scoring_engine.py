@@ -0,0 +1,18 @@
+from services.scoring_engine import iter_sentences, split_sentences
+
+
+POLICY = (
+    "We collect your name and email address when you register. Short one. "
+    "We provide notice before collecting any personal data from you.\n"
+    "You may access, correct or erase your personal data at any time"
+)
+
+
+def test_iter_sentences_matches_split_sentences():
+    assert list(iter_sentences(POLICY)) == split_sentences(POLICY)
+
+
+def test_iter_sentences_handles_sentences_across_chunks():
+    pieces = [POLICY[i:i + 7] for i in range(0, len(POLICY), 7)]
+
+    assert list(iter_sentences(pieces)) == split_sentences(POLICY)
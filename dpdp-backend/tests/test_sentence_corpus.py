@@ -0,0 +1,136 @@
+from concurrent.futures import Future
+
+import numpy as np
+from sqlalchemy.orm import sessionmaker
+
+from database.db import Base, create_db_engine
+from services.result_store import save_compliance_results
+from services.sentence_corpus import CorpusIndexer, IVFIndex, SentenceCorpus, search_policies
+from services.similarity import normalize_rows
+
+
+def unit_vectors(n, dim=32, seed=0):
+    return normalize_rows(np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32))
+
+
+def clustered_vectors(n, dim=32, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return normalize_rows((centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32))
+
+
+def test_appends_survive_reopening(tmp_path):
+    corpus = SentenceCorpus(str(tmp_path), "fake-model")
+    vectors = unit_vectors(5)
+
+    corpus.append(7, ["We keep data forever.", "Cookies are used."], vectors[:2])
+    corpus.append(9, ["Contact the grievance officer.", "Data is encrypted.", "Ünïcode text."], vectors[2:])
+
+    reopened = SentenceCorpus(str(tmp_path), "fake-model")
+
+    assert reopened.rows == 5
+    assert reopened.sentence(0) == "We keep data forever."
+    assert reopened.sentence(4) == "Ünïcode text."
+    assert reopened.result_ids(np.arange(5)).tolist() == [7, 7, 9, 9, 9]
+
+    rows, scores, searched = reopened.search(vectors[3], k=1)
+
+    assert rows.tolist() == [3]
+    assert scores[0] > 0.99
+    assert searched == 5
+
+    # A different model starts a fresh corpus instead of mixing vectors
+    assert SentenceCorpus(str(tmp_path), "other-model").rows == 0
+
+
+def test_ivf_index_finds_nearly_what_a_full_scan_finds(tmp_path):
+    vectors = clustered_vectors(4000)
+    corpus = SentenceCorpus(str(tmp_path), "fake-model")
+
+    for start in range(0, 4000, 500):
+        corpus.append(start, [f"s{i}" for i in range(start, start + 500)], vectors[start:start + 500])
+
+    corpus.rebuild_index(nlist=32)
+    corpus.append(4000, ["tail"], unit_vectors(1, seed=1))
+
+    queries = clustered_vectors(20, seed=2)
+    hits = 0
+
+    for query in queries:
+        exact = set(np.argsort(-(vectors @ query))[:10].tolist())
+        rows, _, searched = corpus.search(query, k=10, nprobe=8)
+        hits += len(exact & set(rows.tolist()))
+        assert searched < 4000
+
+    assert hits / 200 >= 0.9
+
+    # Rows appended after the build are still found
+    assert corpus.search(unit_vectors(1, seed=1)[0], k=1)[0].tolist() == [4000]
+    assert IVFIndex.load(str(tmp_path / "ivf.npz")).indexed_rows == 4000
+
+
+def test_search_returns_best_sentence_per_website(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'corpus.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    result = {"overall_score": 50.0, "risk_level": "Medium Risk", "missing_clauses": [], "section_analysis": {}}
+    ids = save_compliance_results(db, [("https://a.example", result), ("https://b.example", result)])
+
+    vectors = unit_vectors(4)
+    embeddings = {"a": (["keep forever", "keep a while"], vectors[:2]), "b": (["keep forever too"], vectors[2:3])}
+
+    corpus = SentenceCorpus(str(tmp_path / "corpus"), "fake-model")
+    indexer = CorpusIndexer(corpus, lambda url, text: embeddings[text])
+
+    pending = Future()
+    indexer.submit(pending, "https://a.example", "a")
+    indexer.submit(ids[1], "https://b.example", "b")
+    pending.set_result(ids[0])
+    indexer.shutdown()
+
+    query = normalize_rows([vectors[0] + vectors[2]])[0]
+    matches, _ = search_policies(db, corpus, query, limit=5)
+
+    assert sorted(m["website_url"] for m in matches) == ["https://a.example", "https://b.example"]
+    assert {m["sentence"] for m in matches} == {"keep forever", "keep forever too"}
+    assert {m["result_id"] for m in matches} == set(ids)
+
+
+def test_indexing_continues_during_rebuilds_and_after_failed_writes(tmp_path, monkeypatch):
+    import threading
+
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "CORPUS_IVF_MIN_ROWS", 1)
+    monkeypatch.setattr(settings, "CORPUS_IVF_REBUILD_FRACTION", 0.0)
+
+    vectors = unit_vectors(3)
+    corpus = SentenceCorpus(str(tmp_path), "fake-model")
+    indexer = CorpusIndexer(corpus, lambda url, text: ([text], vectors[int(text[-1]):int(text[-1]) + 1]))
+
+    release = threading.Event()
+    rebuilds = []
+
+    def rebuild_index():
+        rebuilds.append(corpus.rows)
+        release.wait(5)
+
+    monkeypatch.setattr(corpus, "rebuild_index", rebuild_index)
+
+    failed = Future()
+    failed.set_exception(RuntimeError("insert failed"))
+
+    first = indexer.submit(1, "https://a.example", "s0")
+    lost = indexer.submit(failed, "https://b.example", "s1")
+    last = indexer.submit(3, "https://c.example", "s2")
+
+    # The rebuild started by the first append is still running
+    assert last.result(5) == 1
+    assert isinstance(lost.exception(5), RuntimeError)
+    assert first.result(5) == 1 and rebuilds == [1]
+
+    release.set()
+    indexer.shutdown()
+
+    assert corpus.rows == 2
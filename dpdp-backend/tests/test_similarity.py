@@ -0,0 +1,55 @@
+import numpy as np
+
+from services.similarity import RunningTopK, normalize_rows, top_k_matches
+
+
+def _random_embeddings(rows, seed):
+    rng = np.random.default_rng(seed)
+    return normalize_rows(rng.standard_normal((rows, 32)))
+
+
+def test_top_1_matches_argmax():
+    clauses = _random_embeddings(5, 0)
+    sentences = _random_embeddings(40, 1)
+
+    indices, scores = top_k_matches(clauses, sentences, 1)
+
+    expected = clauses @ sentences.T
+    assert indices.shape == (5, 1)
+    assert list(indices[:, 0]) == list(np.argmax(expected, axis=1))
+    assert np.allclose(scores[:, 0], expected.max(axis=1))
+
+
+def test_top_k_sorted_best_first():
+    clauses = _random_embeddings(5, 2)
+    sentences = _random_embeddings(40, 3)
+
+    indices, scores = top_k_matches(clauses, sentences, 4)
+
+    expected = np.sort(clauses @ sentences.T, axis=1)[:, ::-1][:, :4]
+    assert indices.shape == (5, 4)
+    assert np.allclose(scores, expected)
+
+
+def test_top_k_capped_by_sentence_count():
+    clauses = _random_embeddings(3, 4)
+    sentences = _random_embeddings(2, 5)
+
+    indices, scores = top_k_matches(clauses, sentences, 10)
+
+    assert indices.shape == (3, 2)
+    assert np.all(scores[:, 0] >= scores[:, 1])
+
+
+def test_running_top_k_matches_batch_scoring():
+    clauses = _random_embeddings(5, 6)
+    sentences = _random_embeddings(97, 7)
+
+    running = RunningTopK(5, 3)
+    for offset in range(0, 97, 10):
+        running.update(clauses, sentences[offset:offset + 10], offset)
+
+    indices, scores = top_k_matches(clauses, sentences, 3)
+
+    assert np.array_equal(running.indices, indices)
+    assert np.allclose(running.scores, scores)
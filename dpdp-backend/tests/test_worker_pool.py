@@ -0,0 +1,51 @@
+import os
+import asyncio
+
+import pytest
+
+from core.config import settings
+from services import scoring_engine, worker_pool
+
+
+CLAUSES = [
+    {"title": "Consent", "section": "6", "category": "Consent", "description": "consent"},
+    {"title": "Retention", "section": "8", "category": "Storage", "description": "retention"}
+]
+
+POLICY = "We ask for consent before processing. Records are deleted after a year."
+
+
+@pytest.fixture
+def pool(monkeypatch):
+
+    def start(method):
+        monkeypatch.setattr(settings, "ANALYSIS_WORKERS", 1)
+        monkeypatch.setattr(settings, "TORCH_THREADS_PER_WORKER", 1)
+        monkeypatch.setattr(settings, "ANALYSIS_START_METHOD", method)
+
+        return worker_pool.start_worker_pool()
+
+    yield start
+
+    worker_pool.stop_worker_pool()
+
+
+def test_forked_workers_run_analyses(pool, fake_clauses):
+    fake_clauses(CLAUSES)
+
+    # Forked workers inherit the patched encoder and clause index
+    executor = pool("fork")
+
+    result = worker_pool.run_analysis(POLICY, top_k=1)
+    async_result = asyncio.run(worker_pool.run_analysis_async(POLICY, top_k=1))
+
+    assert executor.submit(os.getpid).result() != os.getpid()
+    assert result == async_result == scoring_engine.analyze_compliance(POLICY, top_k=1)
+
+
+def test_forkserver_workers_start_without_the_parents_model(pool, monkeypatch):
+    monkeypatch.setattr(scoring_engine, "load_clause_index", lambda: pytest.fail("model loaded in the parent"))
+
+    executor = pool("forkserver")
+
+    assert executor.submit(worker_pool._ping, 0).result(60) != os.getpid()
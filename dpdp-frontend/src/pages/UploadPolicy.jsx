@@ -72,7 +72,8 @@ function UploadPolicy() {
           recommendations: data.recommendations ?? [],
           graph_path: data.graph_path ?? "",
           section_analysis: data.section_analysis ?? {},
-          explanations: data.explanations ?? []
+          explanations: data.explanations ?? [],
+          report_download_endpoint: data.report_download_endpoint ?? "/download-report"
         });
       }
 
@@ -99,7 +100,7 @@ function UploadPolicy() {
 
   // Download Report
   const handleDownloadReport = () => {
-    window.open(`${API_BASE}/download-report`, "_blank");
+    window.open(`${API_BASE}${result?.report_download_endpoint ?? "/download-report"}`, "_blank");
   };
 
   return (